@@ -0,0 +1,20 @@
+import requests
+import time
+
+from monitoring.metrics import API_REQUEST_SECONDS, API_REQUEST_ERRORS_TOTAL
+
+
+def send_request(method: str, url: str, **kwargs) -> requests.Response:
+    """Make an outbound API request (same arguments as requests.request) and record its metrics"""
+    start = time.perf_counter()
+    try:
+        response = requests.request(method=method, url=url, **kwargs)
+    except requests.RequestException as e:
+        API_REQUEST_ERRORS_TOTAL.labels(method=method, error_type=type(e).__name__).inc()
+        raise
+    
+    API_REQUEST_SECONDS.labels(
+        method=method,
+        status_class=f'{response.status_code // 100}xx'
+    ).observe(time.perf_counter() - start)
+    return response
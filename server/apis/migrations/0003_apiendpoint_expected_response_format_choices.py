@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0002_apiendpoint_body_template_apiendpoint_content_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apiendpoint',
+            name='expected_response_format',
+            field=models.CharField(choices=[('json', 'JSON'), ('ndjson', 'NDJSON / JSON Lines'), ('csv', 'CSV'), ('json.gz', 'JSON (gzip)'), ('ndjson.gz', 'NDJSON (gzip)'), ('csv.gz', 'CSV (gzip)')], default='json', max_length=20),
+        ),
+    ]
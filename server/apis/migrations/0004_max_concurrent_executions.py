@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apis', '0003_apiendpoint_expected_response_format_choices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apiendpoint',
+            name='max_concurrent_executions',
+            field=models.PositiveIntegerField(blank=True, default=4, null=True),
+        ),
+    ]
@@ -26,6 +26,15 @@ class APIEndpoint(models.Model):
         ('application/xml', 'XML'),
     ]
     
+    RESPONSE_FORMATS = [
+        ('json', 'JSON'),
+        ('ndjson', 'NDJSON / JSON Lines'),
+        ('csv', 'CSV'),
+        ('json.gz', 'JSON (gzip)'),
+        ('ndjson.gz', 'NDJSON (gzip)'),
+        ('csv.gz', 'CSV (gzip)'),
+    ]
+    
     # Basic Information
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -49,7 +58,7 @@ class APIEndpoint(models.Model):
     )
     
     # Response Configuration
-    expected_response_format = models.CharField(max_length=20, default='json')
+    expected_response_format = models.CharField(max_length=20, choices=RESPONSE_FORMATS, default='json')
     response_schema = models.JSONField(default=dict, blank=True)
     
     # Metadata
@@ -58,6 +67,9 @@ class APIEndpoint(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    # Mapping executions allowed to call this endpoint at once (blank: no limit)
+    max_concurrent_executions = models.PositiveIntegerField(null=True, blank=True, default=4)
+    
     # Organization
     category = models.CharField(max_length=100, blank=True)
     tags = models.JSONField(default=list, blank=True)
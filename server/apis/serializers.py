@@ -13,7 +13,7 @@ class APIEndpointSerializer(serializers.ModelSerializer):
             'query_params', 'body_schema', 'body_template', 'content_type',
             'expected_response_format', 'response_schema', 'owner',
             'owner_username', 'created_at', 'updated_at', 'is_active',
-            'category', 'tags', 'version', 'full_url'
+            'category', 'tags', 'version', 'full_url', 'max_concurrent_executions'
         ]
         read_only_fields = ['owner', 'created_at', 'updated_at']
     
@@ -7,6 +7,7 @@ import requests
 import time
 from .models import APIEndpoint, APITestLog
 from .serializers import APIEndpointSerializer, APITestLogSerializer, APITestRequestSerializer
+from .http_client import send_request
 from activities.utils import log_activity
 
 class APIEndpointViewSet(viewsets.ModelViewSet):
@@ -103,7 +104,7 @@ class APIEndpointViewSet(viewsets.ModelViewSet):
                     headers['Content-Type'] = api_endpoint.content_type
                 
                 if api_endpoint.content_type == 'application/json':
-                    response = requests.request(
+                    response = send_request(
                         method=api_endpoint.http_method,
                         url=url,
                         headers=headers,
@@ -112,7 +113,7 @@ class APIEndpointViewSet(viewsets.ModelViewSet):
                         timeout=30
                     )
                 elif api_endpoint.content_type == 'application/x-www-form-urlencoded':
-                    response = requests.request(
+                    response = send_request(
                         method=api_endpoint.http_method,
                         url=url,
                         headers=headers,
@@ -123,7 +124,7 @@ class APIEndpointViewSet(viewsets.ModelViewSet):
                 elif api_endpoint.content_type == 'multipart/form-data':
                     # Remove Content-Type header for multipart (requests will set it with boundary)
                     headers.pop('Content-Type', None)
-                    response = requests.request(
+                    response = send_request(
                         method=api_endpoint.http_method,
                         url=url,
                         headers=headers,
@@ -132,7 +133,7 @@ class APIEndpointViewSet(viewsets.ModelViewSet):
                         timeout=30
                     )
                 elif api_endpoint.content_type == 'application/xml':
-                    response = requests.request(
+                    response = send_request(
                         method=api_endpoint.http_method,
                         url=url,
                         headers=headers,
@@ -142,7 +143,7 @@ class APIEndpointViewSet(viewsets.ModelViewSet):
                     )
                 else:
                     # Default to sending as data
-                    response = requests.request(
+                    response = send_request(
                         method=api_endpoint.http_method,
                         url=url,
                         headers=headers,
@@ -152,7 +153,7 @@ class APIEndpointViewSet(viewsets.ModelViewSet):
                     )
             else:
                 # GET, DELETE, etc. - no body
-                response = requests.request(
+                response = send_request(
                     method=api_endpoint.http_method,
                     url=url,
                     headers=headers,
@@ -37,9 +37,11 @@ INSTALLED_APPS = [
     'databases',
     'mappings',
     'activities',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
@@ -64,6 +66,14 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Bearer token required to scrape /api/metrics (open when unset).
+# Set PROMETHEUS_MULTIPROC_DIR as well when running several worker processes.
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN")
+
+# Directory for per-execution dead-letter files (every rejected record with its
+# error, gzipped NDJSON, named execution-<id>.ndjson.gz). Not written when unset.
+MAPPING_DEAD_LETTER_DIR = os.getenv("MAPPING_DEAD_LETTER_DIR")
+
 CSRF_COOKIE_HTTPONLY = False
 CSRF_COOKIE_SAMESITE = 'Lax'
 SESSION_COOKIE_HTTPONLY = True
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path
 from django.urls import include
+from monitoring.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -9,4 +10,5 @@ urlpatterns = [
     path("api/databases/", include("databases.urls")),
     path("api/mappings/", include("mappings.urls")),
     path("api/activities/", include("activities.urls")),
+    path("api/metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,243 @@
+"""
+End-to-end benchmark of MappingEngine.execute against local stand-ins.
+
+Run from the server/ directory:
+
+    python -m benchmarks.run                          # default scenarios on SQLite
+    python -m benchmarks.run --targets sqlite mongodb --records 50000
+    python -m benchmarks.run --compare benchmarks/baseline.json
+    python -m benchmarks.run --bulk-load                # batched writes instead of per-record
+    python -m benchmarks.run --update-baseline benchmarks/baseline.json
+
+The mongodb target needs mongomock: pip install -r requirements-bench.txt
+
+A scenario that doesn't write every record fails the run, however fast it was.
+Each scenario runs in its own process so peak RSS is measured per scenario,
+and the fastest of --repeat runs is reported to damp noise. Baselines are
+machine-specific: regenerate them on the machine you compare on.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from apis.models import APIEndpoint
+from databases.models import DatabaseConnection
+from mappings.models import DataMapping
+from mappings.services.mapping_engine import MappingEngine
+
+from .stand_ins import TARGETS, create_sql_table, count_rows
+from .stub_server import StubFeedServer
+from .synthetic import SyntheticFeed, SHAPES, FORMATS
+
+
+TARGET_TABLE = 'bench_records'
+
+DEFAULT_SCENARIOS = [
+    ('flat', 'json'),
+    ('flat', 'ndjson'),
+    ('flat', 'csv'),
+    ('flat', 'ndjson.gz'),
+    ('nested', 'json'),
+    ('fanout', 'json'),
+]
+
+
+def run_scenario(target: str, shape: str, response_format: str, feed_options: dict, batch_size: int,
+                 use_bulk_load: bool = False) -> dict:
+    """Execute one mapping end-to-end and return its measurements"""
+    feed = SyntheticFeed(shape=shape, **feed_options)
+
+    with StubFeedServer({**feed_options, 'shape': shape}, response_format) as server:
+        api = APIEndpoint(
+            name='benchmark-feed',
+            base_url=server.base_url,
+            endpoint_path='/feed',
+            http_method='GET',
+            expected_response_format=response_format
+        )
+        database = DatabaseConnection(name=f'benchmark-{target}', **TARGETS[target]())
+        mapping = DataMapping(
+            name='benchmark',
+            api_endpoint=api,
+            database=database,
+            target_table=TARGET_TABLE,
+            records_path=feed.records_path(),
+            field_mappings=feed.field_mappings(),
+            batch_size=batch_size,
+            use_bulk_load=use_bulk_load
+        )
+
+        engine = MappingEngine(mapping)
+        adapter = engine._get_db_adapter()
+        if database.db_type != 'mongodb':
+            create_sql_table(adapter, TARGET_TABLE, feed.columns())
+
+        start = time.perf_counter()
+        result = engine.execute()
+        elapsed = time.perf_counter() - start
+
+        if database.db_type != 'mongodb':
+            written = count_rows(adapter, TARGET_TABLE)
+            if database.db_type == 'sqlite':
+                os.unlink(database.database)
+        else:
+            written = result['processed_records']
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+    return {
+        'name': f'{target}-{shape}-{response_format}',
+        'records': result['total_records'],
+        'processed': result['processed_records'],
+        'failed': result['failed_records'],
+        'written': written,
+        'payload_bytes': server.body_bytes,
+        'seconds': round(elapsed, 3),
+        'records_per_sec': round(result['total_records'] / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'stages_ms': result['metrics']['stages_ms'],
+        'batch_latency_ms': result['metrics']['batches']['latency_ms'],
+    }
+
+
+def _scenario_process(args, sender) -> None:
+    try:
+        sender.send(run_scenario(*args))
+    except Exception as e:
+        sender.send({'name': '-'.join(args[:3]), 'error': f'{type(e).__name__}: {e}'})
+
+
+def run_isolated(*args) -> dict:
+    """Run a scenario in a forked child so RSS and metrics start fresh"""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.get_context('fork').Process(target=_scenario_process, args=(args, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def incomplete(results: list) -> list:
+    """Return human-readable failures for scenarios that didn't write every record"""
+    failures = []
+    for result in results:
+        if 'error' in result:
+            continue
+        if result['failed'] or result['written'] != result['records']:
+            failures.append(
+                f"{result['name']}: {result['failed']} failed, "
+                f"{result['written']} of {result['records']} records written"
+            )
+    return failures
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions against a baseline file"""
+    regressions = []
+    for result in results:
+        expected = baseline.get('scenarios', {}).get(result['name'])
+        if not expected or 'error' in result:
+            continue
+        if result['records_per_sec'] < expected['records_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}: {result['records_per_sec']} records/sec "
+                f"vs baseline {expected['records_per_sec']}"
+            )
+        if result['peak_rss_mb'] > expected['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: peak RSS {result['peak_rss_mb']} MB vs baseline {expected['peak_rss_mb']} MB"
+            )
+    return regressions
+
+
+def print_table(results: list) -> None:
+    header = f"{'scenario':32} {'records':>8} {'rec/s':>10} {'rss MB':>7} {'fetch':>8} {'parse':>8} {'xform':>8} {'write':>8}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        if 'error' in result:
+            print(f"{result['name']:32} ERROR {result['error']}")
+            continue
+        stages = result['stages_ms']
+        print(
+            f"{result['name']:32} {result['records']:>8} {result['records_per_sec']:>10} "
+            f"{result['peak_rss_mb']:>7} {stages['fetch']:>8.0f} {stages['parse']:>8.0f} "
+            f"{stages['transform']:>8.0f} {stages['write']:>8.0f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', nargs='+', default=['sqlite'], choices=sorted(TARGETS))
+    parser.add_argument('--shapes', nargs='+', choices=SHAPES, help='Override the default scenario matrix')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, help='Override the default scenario matrix')
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--fields', type=int, default=10)
+    parser.add_argument('--string-length', type=int, default=24)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--bulk-load', action='store_true', help='Write batches through the bulk path (use_bulk_load)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario; the fastest is reported')
+    parser.add_argument('--output', help='Write full results as JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='Fail if slower/larger than this baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression (default 0.25)')
+    parser.add_argument('--update-baseline', metavar='BASELINE', help='Write results as the new baseline')
+    args = parser.parse_args(argv)
+
+    if args.shapes or args.formats:
+        scenarios = [
+            (shape, fmt)
+            for shape in (args.shapes or ['flat'])
+            for fmt in (args.formats or ['json'])
+            if shape == 'flat' or not fmt.startswith('csv')
+        ]
+    else:
+        scenarios = DEFAULT_SCENARIOS
+
+    feed_options = {'records': args.records, 'fields': args.fields, 'string_length': args.string_length}
+    results = []
+    for target in args.targets:
+        for shape, fmt in scenarios:
+            runs = [run_isolated(target, shape, fmt, feed_options, args.batch_size, args.bulk_load) for _ in range(args.repeat)]
+            succeeded = [run for run in runs if 'error' not in run]
+            results.append(max(succeeded, key=lambda run: run['records_per_sec']) if succeeded else runs[0])
+    print_table(results)
+
+    failures = incomplete(results)
+    for failure in failures:
+        print(f"INCOMPLETE {failure}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.update_baseline, 'w') as f:
+            json.dump({
+                'options': {**feed_options, 'batch_size': args.batch_size},
+                'scenarios': {r['name']: r for r in results if 'error' not in r and not incomplete([r])},
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+
+    return 1 if failures or any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+from typing import Dict, List, Any, Tuple
+import os
+import sqlite3
+import tempfile
+
+from databases.db_adapters.base import DatabaseAdapter
+from databases.db_adapters.factory import DatabaseAdapterFactory
+
+
+class SQLiteAdapter(DatabaseAdapter):
+    """Local SQLite stand-in for SQL targets; translates %s placeholders to ?"""
+
+    db_type = 'sqlite'
+
+    def connect(self) -> None:
+        if self._checkout():
+            return
+        with self._observe_connect():
+            # Pooled connections are handed between threads
+            self.connection = sqlite3.connect(self.config['database'], check_same_thread=False)
+
+    def disconnect(self) -> None:
+        if not self._checkin() and self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def _begin(self) -> None:
+        # sqlite3 only opens a transaction before DML; a leading SAVEPOINT would become the outermost one
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+
+    def test_connection(self) -> Tuple[bool, str, Dict[str, Any]]:
+        try:
+            self.connect()
+            return True, "Connection successful", {"version": sqlite3.sqlite_version}
+        except Exception as e:
+            return False, str(e), {}
+        finally:
+            self.disconnect()
+
+    def get_schema(self, table_names: List[str] = None) -> Dict[str, Any]:
+        tables = self.execute_query("SELECT name FROM sqlite_master WHERE type = 'table'")
+        if table_names:
+            tables = [row for row in tables if row['name'] in table_names]
+        schema = {"tables": {}, "summary": {"total_tables": len(tables)}}
+        for row in tables:
+            columns = self.execute_query(f"PRAGMA table_info({row['name']})")
+            schema['tables'][row['name']] = {
+                "type": "TABLE",
+                "columns": [
+                    self._build_column_info(column['name'], column['type'], not column['notnull'], column['dflt_value'])
+                    for column in columns
+                ]
+            }
+        return schema
+
+    def execute_query(self, query: str, params: List[Any] = None) -> Any:
+        # Reuse a held connection so the engine's commit/rollback applies
+        owns_connection = self.connection is None
+        if owns_connection:
+            self.connect()
+        try:
+            cursor = self.connection.execute(query.replace('%s', '?'), params or [])
+            if cursor.description:
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            if owns_connection:
+                self.connection.commit()
+            return cursor.rowcount
+        finally:
+            if owns_connection:
+                self.disconnect()
+
+    def execute_many(self, query: str, params_seq) -> int:
+        params_list = [list(params) for params in params_seq]
+        with self.transaction():
+            self.connection.executemany(query.replace('%s', '?'), params_list)
+        return len(params_list)
+
+
+def create_sql_table(adapter: DatabaseAdapter, table: str, columns: List[Tuple[str, str]]) -> None:
+    """(Re)create the benchmark target table"""
+    column_sql = ', '.join(f'"{name}" {sql_type}' for name, sql_type in columns)
+    adapter.execute_query(f'DROP TABLE IF EXISTS {table}')
+    adapter.execute_query(f'CREATE TABLE {table} ({column_sql})')
+
+
+def count_rows(adapter: DatabaseAdapter, table: str) -> int:
+    return adapter.execute_query(f'SELECT COUNT(*) AS n FROM {table}')[0]['n']
+
+
+def sqlite_target() -> Dict[str, Any]:
+    """DatabaseConnection field values for a throwaway SQLite file"""
+    DatabaseAdapterFactory.register_adapter('sqlite', SQLiteAdapter)
+    handle, path = tempfile.mkstemp(prefix='mapping-bench-', suffix='.sqlite3')
+    os.close(handle)
+    return {'db_type': 'sqlite', 'host': '', 'port': 0, 'database': path}
+
+
+def postgres_target() -> Dict[str, Any]:
+    """DatabaseConnection field values for a local PostgreSQL, from BENCH_PG_* variables"""
+    return {
+        'db_type': 'postgresql',
+        'host': os.getenv('BENCH_PG_HOST', 'localhost'),
+        'port': int(os.getenv('BENCH_PG_PORT', '5432')),
+        'database': os.getenv('BENCH_PG_DB', 'mapping_bench'),
+        'username': os.getenv('BENCH_PG_USER', 'postgres'),
+        'password': os.getenv('BENCH_PG_PASSWORD', ''),
+        'schema': 'public',
+    }
+
+
+def mongomock_target() -> Dict[str, Any]:
+    """DatabaseConnection field values for an in-memory MongoDB via mongomock"""
+    try:
+        import mongomock
+    except ImportError:
+        raise RuntimeError("The mongodb target needs mongomock: pip install mongomock")
+
+    from databases.db_adapters import mongodb
+    # One shared in-memory client, so every connect() sees the same data
+    client = mongomock.MongoClient()
+    client.close = lambda: None
+    mongodb.MongoClient = lambda *args, **kwargs: client
+    return {'db_type': 'mongodb', 'host': 'localhost', 'port': 27017, 'database': 'mapping_bench',
+            'username': 'bench', 'password': 'bench'}
+
+
+TARGETS = {
+    'sqlite': sqlite_target,
+    'postgres': postgres_target,
+    'mongodb': mongomock_target,
+}
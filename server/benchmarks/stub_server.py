@@ -0,0 +1,66 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import multiprocessing
+
+from .synthetic import SyntheticFeed
+
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _serve(feed_options: dict, response_format: str, ready) -> None:
+    body = SyntheticFeed(**feed_options).render(response_format)
+    content_type = 'application/gzip' if response_format.endswith('.gz') else CONTENT_TYPES[response_format]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    ready.send((server.server_port, len(body)))
+    server.serve_forever()
+
+
+class StubFeedServer:
+    """
+    Serve a synthetic feed over local HTTP from a child process
+
+    The payload is generated and held in the child, so the peak RSS of the
+    benchmarking process reflects the mapping pipeline rather than the feed.
+    """
+
+    def __init__(self, feed_options: dict, response_format: str):
+        self.feed_options = feed_options
+        self.response_format = response_format
+        self.process = None
+        self.port = None
+        self.body_bytes = None
+
+    def __enter__(self) -> 'StubFeedServer':
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=_serve,
+            args=(self.feed_options, self.response_format, sender),
+            daemon=True
+        )
+        self.process.start()
+        self.port, self.body_bytes = receiver.recv()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.process.terminate()
+        self.process.join()
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
@@ -0,0 +1,136 @@
+from typing import Dict, List, Any, Tuple
+import csv
+import gzip
+import io
+import json
+import random
+
+
+SHAPES = ['flat', 'nested', 'fanout']
+FORMATS = ['json', 'ndjson', 'csv', 'json.gz', 'ndjson.gz', 'csv.gz']
+
+# Value types cycled through the generated fields, with their SQL column types
+FIELD_TYPES = [('str', 'TEXT'), ('int', 'INTEGER'), ('float', 'REAL'), ('bool', 'INTEGER')]
+
+
+class SyntheticFeed:
+    """
+    Deterministic synthetic API payloads for benchmarking the mapping pipeline
+
+    Shapes:
+        flat:   {"data": [record, ...]} with scalar fields
+        nested: {"payload": {"users": [{"id", "profile": {...fields}}]}}
+        fanout: {"orders": [{"id", "customer", "lines": [record, ...]}]}, where
+                `records` counts lines and each order has `lines_per_order` lines
+    """
+
+    def __init__(self, records: int = 10000, fields: int = 10, shape: str = 'flat',
+                 string_length: int = 24, lines_per_order: int = 5, seed: int = 42):
+        if shape not in SHAPES:
+            raise ValueError(f"Unsupported shape: {shape}")
+        self.records = records
+        self.fields = fields
+        self.shape = shape
+        self.string_length = string_length
+        self.lines_per_order = lines_per_order
+        self.seed = seed
+
+    def field_names(self) -> List[Tuple[str, str]]:
+        """(name, kind) of every generated value field"""
+        return [(f'f{i}', FIELD_TYPES[i % len(FIELD_TYPES)][0]) for i in range(self.fields)]
+
+    def records_path(self) -> str:
+        return {'flat': '', 'nested': 'payload.users', 'fanout': 'orders[*].lines[*]'}[self.shape]
+
+    def field_mappings(self) -> List[Dict[str, Any]]:
+        """Field mappings that load every generated field into its own column"""
+        prefix = 'profile.' if self.shape == 'nested' else ''
+        mappings = [{'source_path': 'id', 'target_column': 'id'}]
+        if self.shape == 'fanout':
+            mappings.append({'source_path': '_parent.id', 'target_column': 'order_id'})
+        for name, kind in self.field_names():
+            mappings.append({
+                'source_path': f'{prefix}{name}',
+                'target_column': name,
+                'transformations': ['trim'] if kind == 'str' else [],
+            })
+        return mappings
+
+    def columns(self) -> List[Tuple[str, str]]:
+        """(column, SQL type) of the target table"""
+        columns = [('id', 'INTEGER')]
+        if self.shape == 'fanout':
+            columns.append(('order_id', 'INTEGER'))
+        kinds = dict(FIELD_TYPES)
+        return columns + [(name, kinds[kind]) for name, kind in self.field_names()]
+
+    def render(self, response_format: str) -> bytes:
+        """Serialize the feed in one of the supported response formats"""
+        if response_format not in FORMATS:
+            raise ValueError(f"Unsupported format: {response_format}")
+        base_format = response_format.replace('.gz', '')
+        if base_format == 'csv' and self.shape != 'flat':
+            raise ValueError("CSV feeds only support the flat shape")
+
+        if base_format == 'json':
+            body = json.dumps(self._document()).encode()
+        elif base_format == 'ndjson':
+            body = b''.join(json.dumps(doc).encode() + b'\n' for doc in self._line_documents())
+        else:
+            body = self._csv()
+
+        return gzip.compress(body, compresslevel=1) if response_format.endswith('.gz') else body
+
+    def _document(self) -> Dict[str, Any]:
+        if self.shape == 'flat':
+            return {'data': list(self._records())}
+        if self.shape == 'nested':
+            return {'payload': {'users': list(self._records())}}
+        return {'orders': list(self._orders())}
+
+    def _line_documents(self):
+        # One document per line; nested/fanout lines keep their envelope so
+        # records_path is exercised per line
+        if self.shape == 'flat':
+            yield from self._records()
+        elif self.shape == 'nested':
+            for record in self._records():
+                yield {'payload': {'users': [record]}}
+        else:
+            for order in self._orders():
+                yield {'orders': [order]}
+
+    def _records(self):
+        rng = random.Random(self.seed)
+        for record_id in range(1, self.records + 1):
+            values = {name: self._value(rng, kind) for name, kind in self.field_names()}
+            if self.shape == 'nested':
+                yield {'id': record_id, 'profile': values}
+            else:
+                yield {'id': record_id, **values}
+
+    def _orders(self):
+        records = self._records()
+        order_id = 0
+        while True:
+            lines = [line for _, line in zip(range(self.lines_per_order), records)]
+            if not lines:
+                return
+            order_id += 1
+            yield {'id': order_id, 'customer': f'customer-{order_id % 97}', 'lines': lines}
+
+    def _csv(self) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=['id'] + [name for name, _ in self.field_names()])
+        writer.writeheader()
+        writer.writerows(self._records())
+        return buffer.getvalue().encode()
+
+    def _value(self, rng: random.Random, kind: str) -> Any:
+        if kind == 'str':
+            return ' ' + ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=self.string_length)) + ' '
+        if kind == 'int':
+            return rng.randint(0, 1_000_000)
+        if kind == 'float':
+            return round(rng.random() * 1000, 4)
+        return rng.random() < 0.5
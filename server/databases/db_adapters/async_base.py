@@ -0,0 +1,97 @@
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Iterable
+from .base import DatabaseAdapter
+
+
+class AsyncDatabaseAdapter(ABC):
+    """
+    Base class for asyncio database adapters
+    
+    Mirrors the write side of DatabaseAdapter (connect, execute_query,
+    execute_many, transaction) with coroutines, so writes to many databases can
+    overlap on one event loop. Queries use %s placeholders like the synchronous
+    adapters; implementations translate them for their driver.
+    """
+    
+    db_type = None
+    
+    def __init__(self, connection_config: Dict[str, Any]):
+        self.config = connection_config
+        self.connection = None
+        # Set while a transaction() block is open; nested blocks join it
+        self._in_transaction = False
+    
+    @abstractmethod
+    async def connect(self) -> None:
+        """Establish database connection"""
+        pass
+    
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """Close database connection"""
+        pass
+    
+    @abstractmethod
+    async def execute_query(self, query: str, params: List[Any] = None) -> Any:
+        """Execute a query and return rows (as dicts) or the affected row count"""
+        pass
+    
+    async def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """
+        Execute one write statement once per parameter set, in a single transaction
+        Returns the number of parameter sets executed.
+        """
+        executed = 0
+        async with self.transaction():
+            for params in params_seq:
+                await self.execute_query(query, params)
+                executed += 1
+        return executed
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run the enclosed statements as one transaction on one held connection
+        Same contract as DatabaseAdapter.transaction(): commit on exit, roll back
+        on error, and join an enclosing transaction when nested.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        
+        owns_connection = self.connection is None
+        if owns_connection:
+            await self.connect()
+        self._in_transaction = True
+        try:
+            await self._begin()
+            yield self
+            await self._commit()
+        except BaseException:
+            if self.connection is not None:
+                await self._rollback()
+            raise
+        finally:
+            self._in_transaction = False
+            if owns_connection:
+                await self.disconnect()
+    
+    async def _begin(self) -> None:
+        pass
+    
+    async def _commit(self) -> None:
+        await self.connection.commit()
+    
+    async def _rollback(self) -> None:
+        await self.connection.rollback()
+    
+    async def __aenter__(self):
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.disconnect()
+    
+    # Same connect latency/failure metrics as the synchronous adapters
+    _observe_connect = DatabaseAdapter._observe_connect
@@ -0,0 +1,51 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from typing import List, Any
+import json
+from .async_base import AsyncDatabaseAdapter
+from .mongodb import build_connection_string
+
+
+class AsyncMongoDBAdapter(AsyncDatabaseAdapter):
+    """MongoDB over motor; writes go through the collections on self.connection"""
+    
+    db_type = 'mongodb'
+    
+    async def connect(self) -> None:
+        """Establish MongoDB connection"""
+        with self._observe_connect():
+            try:
+                self.connection = AsyncIOMotorClient(
+                    build_connection_string(self.config),
+                    serverSelectionTimeoutMS=10000,
+                    connectTimeoutMS=10000
+                )
+                # Force connection to check if it's valid
+                await self.connection.server_info()
+            except Exception as e:
+                error_str = str(e)
+                if "Authentication failed" in error_str:
+                    raise Exception("Authentication failed: Invalid username or password")
+                raise Exception(f"Connection error: {error_str}")
+    
+    async def disconnect(self) -> None:
+        """Close MongoDB connection"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+    
+    async def execute_query(self, query: str, params: List[Any] = None) -> Any:
+        """Execute MongoDB command"""
+        owns_connection = self.connection is None
+        if owns_connection:
+            await self.connect()
+        try:
+            if isinstance(query, str):
+                query = json.loads(query)
+            return await self.connection[self.config['database']].command(query)
+        finally:
+            if owns_connection:
+                await self.disconnect()
+    
+    def transaction(self):
+        """Multi-document transactions need a replica set and a session on every write"""
+        raise NotImplementedError("MongoDB writes are not transactional; use bulk_write() on the collection")
@@ -0,0 +1,69 @@
+import aiomysql
+from typing import Dict, List, Any, Iterable
+from .async_base import AsyncDatabaseAdapter
+
+
+class AsyncMySQLAdapter(AsyncDatabaseAdapter):
+    
+    db_type = 'mysql'
+    
+    async def connect(self) -> None:
+        """Establish MySQL connection"""
+        with self._observe_connect():
+            try:
+                self.connection = await aiomysql.connect(
+                    host=self.config['host'],
+                    port=self.config['port'],
+                    db=self.config['database'],
+                    user=self.config['username'],
+                    password=self.config['password'],
+                    connect_timeout=10,
+                    cursorclass=aiomysql.DictCursor,
+                    autocommit=False
+                )
+            except aiomysql.OperationalError as e:
+                error_code = e.args[0]
+                if error_code == 1045:
+                    raise Exception("Authentication failed: Access denied (invalid username/password)")
+                elif error_code == 2003:
+                    raise Exception(f"Connection failed: Cannot connect to host '{self.config['host']}'")
+                elif error_code == 1049:
+                    raise Exception(f"Database '{self.config['database']}' does not exist")
+                else:
+                    raise Exception(f"Connection error: {str(e)}")
+            except Exception as e:
+                raise Exception(f"Unexpected error: {str(e)}")
+    
+    async def disconnect(self) -> None:
+        """Close MySQL connection"""
+        if self.connection:
+            await self.connection.ensure_closed()
+            self.connection = None
+    
+    async def execute_query(self, query: str, params: List[Any] = None) -> Any:
+        """Execute a query and return results"""
+        owns_connection = self.connection is None
+        if owns_connection:
+            await self.connect()
+        try:
+            async with self.connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                if query.strip().upper().startswith('SELECT'):
+                    return await cursor.fetchall()
+                if owns_connection:
+                    await self.connection.commit()
+                return cursor.rowcount
+        finally:
+            if owns_connection:
+                await self.disconnect()
+    
+    async def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """aiomysql's executemany rewrites INSERT ... VALUES into multi-row statements"""
+        params_list = [list(params) for params in params_seq]
+        async with self.transaction():
+            async with self.connection.cursor() as cursor:
+                await cursor.executemany(query, params_list)
+        return len(params_list)
+    
+    async def _begin(self) -> None:
+        await self.connection.begin()
@@ -0,0 +1,196 @@
+import asyncpg
+import json
+import re
+from datetime import date, datetime, time
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Callable, Dict, List, Any, Iterable, Optional
+from .async_base import AsyncDatabaseAdapter
+
+
+class AsyncPostgreSQLAdapter(AsyncDatabaseAdapter):
+    """
+    PostgreSQL over asyncpg
+    
+    asyncpg binds parameters with the column's binary type instead of text
+    literals, so it refuses e.g. '12' for an integer or an ISO string for a
+    date, which psycopg2 leaves to the server to parse. execute_many prepares
+    the statement, reads the parameter types PostgreSQL inferred and converts
+    each value to that type's Python type first.
+    """
+    
+    db_type = 'postgresql'
+    
+    def __init__(self, connection_config: Dict[str, Any]):
+        super().__init__(connection_config)
+        self._transaction = None
+    
+    async def connect(self) -> None:
+        """Establish PostgreSQL connection"""
+        with self._observe_connect():
+            try:
+                schema = self.config.get('schema')
+                self.connection = await asyncpg.connect(
+                    host=self.config['host'],
+                    port=self.config['port'],
+                    database=self.config['database'],
+                    user=self.config['username'],
+                    password=self.config['password'],
+                    timeout=10,
+                    server_settings={'search_path': schema} if schema else None
+                )
+            except asyncpg.InvalidPasswordError:
+                raise Exception("Authentication failed: Invalid username or password")
+            except asyncpg.InvalidCatalogNameError:
+                raise Exception(f"Database '{self.config['database']}' does not exist")
+            except OSError:
+                raise Exception("Connection failed: Host unreachable or incorrect host/port")
+            except Exception as e:
+                raise Exception(f"Connection error: {str(e)}")
+    
+    async def disconnect(self) -> None:
+        """Close PostgreSQL connection"""
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+    
+    async def execute_query(self, query: str, params: List[Any] = None) -> Any:
+        """Execute a query and return rows as dicts, or the affected row count"""
+        owns_connection = self.connection is None
+        if owns_connection:
+            await self.connect()
+        try:
+            query = self._numbered_placeholders(query)
+            if query.strip().upper().startswith(('SELECT', 'WITH')):
+                return [dict(row) for row in await self.connection.fetch(query, *(params or []))]
+            # asyncpg runs each statement in autocommit unless a transaction is open
+            status = await self.connection.execute(query, *(params or []))
+            # Command tags end in the row count, e.g. "INSERT 0 5" or "UPDATE 3"
+            count = status.rsplit(' ', 1)[-1]
+            return int(count) if count.isdigit() else -1
+        finally:
+            if owns_connection:
+                await self.disconnect()
+    
+    async def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """asyncpg pipelines every parameter set of executemany in one round trip"""
+        async with self.transaction():
+            statement = await self.connection.prepare(self._numbered_placeholders(query))
+            converters = [_CONVERTERS.get(param.name) for param in statement.get_parameters()]
+            params_list = [
+                tuple(_convert(convert, value) for convert, value in zip(converters, params))
+                for params in params_seq
+            ]
+            await statement.executemany(params_list)
+        return len(params_list)
+    
+    async def _begin(self) -> None:
+        self._transaction = self.connection.transaction()
+        await self._transaction.start()
+    
+    async def _commit(self) -> None:
+        transaction, self._transaction = self._transaction, None
+        await transaction.commit()
+    
+    async def _rollback(self) -> None:
+        transaction, self._transaction = self._transaction, None
+        if transaction is not None:
+            await transaction.rollback()
+    
+    @staticmethod
+    def _numbered_placeholders(query: str) -> str:
+        """Rewrite %s placeholders as asyncpg's $1, $2, ..."""
+        counter = iter(range(1, query.count('%s') + 1))
+        return re.sub(r'%s', lambda _: f'${next(counter)}', query)
+
+
+def _convert(convert: Optional[Callable[[Any], Any]], value: Any) -> Any:
+    """value in the parameter's Python type; left as is (for asyncpg to report) if it can't be converted"""
+    if convert is None or value is None:
+        return value
+    try:
+        return convert(value)
+    except (ArithmeticError, TypeError, ValueError):
+        return value
+
+
+def _to_int(value: Any) -> Any:
+    if isinstance(value, int):
+        return value
+    # PostgreSQL rounds fractions assigned to integer columns, half away from zero
+    return int(Decimal(str(value).strip()).to_integral_value(ROUND_HALF_UP))
+
+
+def _to_numeric(value: Any) -> Any:
+    return value if isinstance(value, Decimal) else Decimal(str(value).strip())
+
+
+def _to_float(value: Any) -> Any:
+    return value if isinstance(value, float) else float(value)
+
+
+def _to_bool(value: Any) -> Any:
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ('t', 'true', 'y', 'yes', 'on', '1'):
+            return True
+        if text in ('f', 'false', 'n', 'no', 'off', '0'):
+            return False
+        raise ValueError(value)
+    return bool(value)
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+
+
+def _to_date(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return _parse_datetime(value).date()
+    return value
+
+
+def _to_timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        value = _parse_datetime(value)
+    # Like PostgreSQL, timestamp without time zone ignores any offset given
+    return value.replace(tzinfo=None) if isinstance(value, datetime) else value
+
+
+def _to_timestamptz(value: Any) -> Any:
+    return _parse_datetime(value) if isinstance(value, str) else value
+
+
+def _to_time(value: Any) -> Any:
+    return time.fromisoformat(value.strip()) if isinstance(value, str) else value
+
+
+def _to_json(value: Any) -> Any:
+    # asyncpg's json codecs take the encoded text
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value.isoformat() if isinstance(value, (date, time)) else str(value)
+
+
+# Keyed by the parameter type names asyncpg reports
+_CONVERTERS = {
+    'int2': _to_int, 'int4': _to_int, 'int8': _to_int,
+    'numeric': _to_numeric,
+    'float4': _to_float, 'float8': _to_float,
+    'bool': _to_bool,
+    'date': _to_date,
+    'timestamp': _to_timestamp,
+    'timestamptz': _to_timestamptz,
+    'time': _to_time,
+    'json': _to_json, 'jsonb': _to_json,
+    'text': _to_text, 'varchar': _to_text, 'bpchar': _to_text, 'name': _to_text,
+}
@@ -1,13 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Tuple
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple, Optional, Iterator, Iterable
+import time
+
+from monitoring.metrics import DB_CONNECT_SECONDS, DB_CONNECT_ERRORS_TOTAL
 
 
 class DatabaseAdapter(ABC):
     """Base class for all database adapters"""
     
+    db_type = None
+    # Whether bulk_load() is implemented
+    supports_bulk_load = False
+    # Drivers that pool internally (MongoClient) share one pooled connection
+    shares_pooled_connection = False
+    # Savepoint statements used by savepoint(); RELEASE is skipped when None
+    SAVEPOINT_SQL = "SAVEPOINT {name}"
+    ROLLBACK_TO_SAVEPOINT_SQL = "ROLLBACK TO SAVEPOINT {name}"
+    RELEASE_SAVEPOINT_SQL = "RELEASE SAVEPOINT {name}"
+    
     def __init__(self, connection_config: Dict[str, Any]):
         self.config = connection_config
         self.connection = None
+        # Set while a transaction() block is open; nested blocks join it
+        self._in_transaction = False
+        # Set by DatabaseConnection.get_adapter(); connect()/disconnect() then
+        # borrow from and return to this pool instead of dialing each time
+        self.pool = None
     
     @abstractmethod
     def connect(self) -> None:
@@ -28,18 +47,210 @@ class DatabaseAdapter(ABC):
         pass
     
     @abstractmethod
-    def get_schema(self) -> Dict[str, Any]:
+    def get_schema(self, table_names: List[str] = None) -> Dict[str, Any]:
         """
         Get database schema information
+        Args: table_names - optional list restricting which tables/collections are introspected
         Returns: Dictionary with tables/collections and their structure
         """
         pass
     
+    def get_table_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the structure of a single table/collection without introspecting the rest
+        Returns: The table's entry from get_schema(), or None if it does not exist
+        """
+        schema = self.get_schema(table_names=[table_name])
+        return schema.get('tables', schema.get('collections', {})).get(table_name)
+    
+    def get_schema_versions(self, table_names: List[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Cheap DDL fingerprint per table/collection, used to revalidate cached schemas
+        Returns: {table_name: version} that changes when the table's structure does,
+                 or None if the database offers no such signal (callers fall back to a TTL)
+        """
+        return None
+    
     @abstractmethod
     def execute_query(self, query: str, params: List[Any] = None) -> Any:
         """Execute a query and return results"""
         pass
     
+    def execute_statement(self, query: str, params: List[Any] = None) -> Any:
+        """
+        Execute a write statement that is likely to be repeated with new params
+        Adapters whose drivers support it prepare the statement once per connection
+        """
+        return self.execute_query(query, params)
+    
+    def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """
+        Execute one write statement once per parameter set, in a single transaction
+        Adapters override this with their driver's batched executemany.
+        Returns the number of parameter sets executed.
+        """
+        executed = 0
+        with self.transaction():
+            for params in params_seq:
+                self.execute_statement(query, params)
+                executed += 1
+        return executed
+    
+    def execute_batch(self, statements: Iterable[Tuple[str, List[Any]]]) -> int:
+        """
+        Execute several (query, params) write statements in a single transaction
+        Returns the number of statements executed.
+        """
+        executed = 0
+        with self.transaction():
+            for query, params in statements:
+                self.execute_statement(query, params)
+                executed += 1
+        return executed
+    
+    @contextmanager
+    def transaction(self, rollback: bool = False):
+        """
+        Run the enclosed statements as one transaction on one held connection
+        
+        Commits when the block exits normally and rolls back when it raises, or
+        always rolls back with rollback=True (dry runs). A connection is opened
+        (and closed afterwards) only if none is held, and a block nested inside
+        another joins the outer transaction.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        
+        owns_connection = self.connection is None
+        if owns_connection:
+            self.connect()
+        self._in_transaction = True
+        try:
+            self._begin()
+            yield self
+            if rollback:
+                self.connection.rollback()
+            else:
+                self.connection.commit()
+        except BaseException:
+            if self.connection is not None:
+                self.connection.rollback()
+            raise
+        finally:
+            self._in_transaction = False
+            if owns_connection:
+                self.disconnect()
+    
+    def _begin(self) -> None:
+        """Start a transaction on the held connection; DB-API drivers do this implicitly"""
+        pass
+    
+    @contextmanager
+    def savepoint(self, name: str = 'engine_savepoint'):
+        """
+        Undo only the enclosed statements if they raise, keeping the open transaction usable
+        Must be used inside transaction().
+        """
+        if not self._in_transaction:
+            raise Exception("savepoint() needs an open transaction()")
+        
+        self.execute_query(self.SAVEPOINT_SQL.format(name=name))
+        try:
+            yield self
+        except BaseException:
+            self.execute_query(self.ROLLBACK_TO_SAVEPOINT_SQL.format(name=name))
+            raise
+        if self.RELEASE_SAVEPOINT_SQL:
+            self.execute_query(self.RELEASE_SAVEPOINT_SQL.format(name=name))
+    
+    def bulk_load(self, table: str, columns: List[str], rows: Iterable[Iterable[Any]],
+                  conflict_columns: List[str] = None) -> int:
+        """
+        Load many rows through the database's bulk path on the held connection
+        Rows are value sequences in `columns` order; with conflict_columns existing
+        rows are updated instead of duplicated. Returns the number of rows loaded.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no bulk load path")
+    
+    def iter_query(self, query: str, params: List[Any] = None, chunk_size: int = 1000,
+                   as_dict: bool = True) -> Iterator[Any]:
+        """
+        Stream the rows of a read query instead of materialising them all
+        Yields dicts, or tuples when as_dict is False. SQL adapters override this
+        with server-side cursors that fetch chunk_size rows per round trip.
+        """
+        for row in self.execute_query(query, params):
+            yield row if as_dict else tuple(row.values())
+    
+    def _checkout(self) -> bool:
+        """Borrow a pooled connection into self.connection; False if this adapter is not pooled"""
+        if self.pool is None:
+            return False
+        if self.connection is not None:
+            # connect() while already connected; don't strand the held checkout
+            self.pool.release(self.connection)
+            self.connection = None
+        self.connection = self.pool.acquire()
+        return True
+    
+    def _checkin(self) -> bool:
+        """Return the held connection to the pool; False if this adapter is not pooled"""
+        if self.pool is None:
+            return False
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            self.pool.release(connection)
+        return True
+    
+    def __del__(self):
+        # Safety net for adapters dropped without disconnect(): give the slot back
+        if getattr(self, 'pool', None) is not None and self.connection is not None:
+            self._checkin()
+    
+    @staticmethod
+    def _reset_pooled_connection(connection) -> None:
+        """Clear transaction state before a connection goes back to the pool"""
+        connection.rollback()
+    
+    @staticmethod
+    def _pooled_connection_usable(connection) -> bool:
+        """Cheap local check that an idle pooled connection has not been closed"""
+        return True
+    
+    @contextmanager
+    def _observe_connect(self):
+        """Record connect latency and failures for this adapter's database type"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            DB_CONNECT_ERRORS_TOTAL.labels(db_type=self.db_type).inc()
+            raise
+        DB_CONNECT_SECONDS.labels(db_type=self.db_type).observe(time.perf_counter() - start)
+    
+    @staticmethod
+    def _build_column_info(name: str, data_type: str, nullable: bool, default: Any = None,
+                           length: int = None, precision: int = None, scale: int = None) -> Dict[str, Any]:
+        """Column entry in the shape shared by all SQL adapters' schemas"""
+        column_info = {
+            "name": name,
+            "type": data_type,
+            "nullable": nullable,
+            "default": default,
+            "constraints": []
+        }
+        
+        # Add length/precision info
+        if length:
+            column_info['length'] = length
+        elif precision:
+            column_info['precision'] = precision
+            if scale:
+                column_info['scale'] = scale
+        
+        return column_info
+    
     def get_test_query(self) -> str:
         """Get database-specific test query"""
         return "SELECT 1"
\ No newline at end of file
@@ -1,21 +1,49 @@
-from typing import Dict, Any, List
-from .postgres import PostgreSQLAdapter
-from .mysql import MySQLAdapter
-from .mongodb import MongoDBAdapter
-from .mssql import MSSQLAdapter
+from typing import Dict, Any, List, Union
+from importlib import import_module
+from importlib.metadata import entry_points
+import logging
 from .base import DatabaseAdapter
+from .async_base import AsyncDatabaseAdapter
+
+logger = logging.getLogger(__name__)
 
 
 class DatabaseAdapterFactory:
-    """Factory to create database adapters based on type"""
+    """
+    Factory to create database adapters based on type
+    
+    Adapters are registered as "module:Class" paths and imported the first time
+    their type is requested, so a process only loads the drivers it uses.
+    Third-party packages can add adapters through the ENTRY_POINT_GROUP entry
+    point group, e.g. in pyproject.toml:
+    
+        [project.entry-points."api_hackathon.db_adapters"]
+        clickhouse = "my_package.adapters:ClickHouseAdapter"
+    """
+    
+    ENTRY_POINT_GROUP = 'api_hackathon.db_adapters'
+    
+    _adapter_paths = {
+        'postgresql': 'databases.db_adapters.postgres:PostgreSQLAdapter',
+        'mysql': 'databases.db_adapters.mysql:MySQLAdapter',
+        'mongodb': 'databases.db_adapters.mongodb:MongoDBAdapter',
+        'mssql': 'databases.db_adapters.mssql:MSSQLAdapter',
+    }
+    
+    # Adapter classes already imported, by db_type
+    _adapters: Dict[str, type] = {}
     
-    _adapters = {
-        'postgresql': PostgreSQLAdapter,
-        'mysql': MySQLAdapter,
-        'mongodb': MongoDBAdapter,
-        'mssql': MSSQLAdapter,
+    # asyncio adapters used by AsyncMappingEngine; same lazy loading
+    _async_adapter_paths = {
+        'postgresql': 'databases.db_adapters.async_postgres:AsyncPostgreSQLAdapter',
+        'mysql': 'databases.db_adapters.async_mysql:AsyncMySQLAdapter',
+        'mongodb': 'databases.db_adapters.async_mongodb:AsyncMongoDBAdapter',
     }
     
+    _async_adapters: Dict[str, type] = {}
+    
+    _entry_points_loaded = False
+    
     @classmethod
     def create_adapter(cls, db_type: str, config: Dict[str, Any]) -> DatabaseAdapter:
         """
@@ -24,20 +52,120 @@ class DatabaseAdapterFactory:
         Args:
             db_type: Type of database (postgresql, mysql, mongodb, etc.)
             config: Connection configuration dictionary
-            
+        
         Returns:
             DatabaseAdapter instance
-            
+        
         Raises:
             ValueError: If database type is not supported
+            ImportError: If the adapter's driver is not installed
         """
-        if db_type not in cls._adapters:
+        adapter_class = cls.get_adapter_class(db_type)
+        return adapter_class(config)
+    
+    @classmethod
+    def get_adapter_class(cls, db_type: str) -> type:
+        """Return the adapter class for a database type, importing it on first use"""
+        if db_type in cls._adapters:
+            return cls._adapters[db_type]
+        
+        if db_type not in cls._adapter_paths:
+            cls._load_entry_points()
+        if db_type not in cls._adapter_paths:
             raise ValueError(f"Unsupported database type: {db_type}")
         
-        adapter_class = cls._adapters[db_type]
-        return adapter_class(config)
+        adapter_class = cls._import_adapter(db_type, cls._adapter_paths[db_type])
+        cls._validate(adapter_class)
+        cls._adapters[db_type] = adapter_class
+        return adapter_class
+    
+    @classmethod
+    def create_async_adapter(cls, db_type: str, config: Dict[str, Any]) -> AsyncDatabaseAdapter:
+        """
+        Create an asyncio database adapter instance
+        
+        Raises:
+            ValueError: If database type has no async adapter
+            ImportError: If the adapter's async driver is not installed
+        """
+        return cls.get_async_adapter_class(db_type)(config)
+    
+    @classmethod
+    def get_async_adapter_class(cls, db_type: str) -> type:
+        """Return the asyncio adapter class for a database type, importing it on first use"""
+        if db_type in cls._async_adapters:
+            return cls._async_adapters[db_type]
+        if db_type not in cls._async_adapter_paths:
+            raise ValueError(f"No async adapter for database type: {db_type}")
+        
+        adapter_class = cls._import_adapter(db_type, cls._async_adapter_paths[db_type])
+        cls._validate(adapter_class, AsyncDatabaseAdapter)
+        cls._async_adapters[db_type] = adapter_class
+        return adapter_class
+    
+    @classmethod
+    def register_async_adapter(cls, db_type: str, adapter: type) -> None:
+        """Register an asyncio adapter class for a database type"""
+        cls._validate(adapter, AsyncDatabaseAdapter)
+        cls._async_adapter_paths[db_type] = f"{adapter.__module__}:{adapter.__qualname__}"
+        cls._async_adapters[db_type] = adapter
+    
+    @classmethod
+    def supports_async(cls, db_type: str) -> bool:
+        """Whether an async adapter exists for db_type and its driver (asyncpg, aiomysql, motor) is installed"""
+        try:
+            cls.get_async_adapter_class(db_type)
+        except (ValueError, ImportError):
+            return False
+        return True
+    
+    @classmethod
+    def register_adapter(cls, db_type: str, adapter: Union[type, str]) -> None:
+        """Register an adapter class, or a lazily imported "module:Class" path, for a database type"""
+        if isinstance(adapter, str):
+            if ':' not in adapter:
+                raise ValueError(f"Adapter path must look like 'module:Class', got {adapter}")
+            cls._adapter_paths[db_type] = adapter
+            cls._adapters.pop(db_type, None)
+            return
+        
+        cls._validate(adapter)
+        cls._adapter_paths[db_type] = f"{adapter.__module__}:{adapter.__qualname__}"
+        cls._adapters[db_type] = adapter
     
     @classmethod
     def get_supported_types(cls) -> List[str]:
-        """Get list of supported database types"""
-        return list(cls._adapters.keys())
\ No newline at end of file
+        """Get list of supported database types, without importing their drivers"""
+        cls._load_entry_points()
+        return list(cls._adapter_paths.keys())
+    
+    @classmethod
+    def _load_entry_points(cls) -> None:
+        """Register adapter paths advertised by installed packages (once per process)"""
+        if cls._entry_points_loaded:
+            return
+        cls._entry_points_loaded = True
+        
+        for entry_point in entry_points(group=cls.ENTRY_POINT_GROUP):
+            if entry_point.name in cls._adapter_paths:
+                logger.warning(
+                    f"Ignoring adapter entry point {entry_point.value}: "
+                    f"'{entry_point.name}' is already registered"
+                )
+                continue
+            cls._adapter_paths[entry_point.name] = entry_point.value
+    
+    @staticmethod
+    def _import_adapter(db_type: str, path: str) -> type:
+        module_name, _, class_name = path.partition(':')
+        try:
+            return getattr(import_module(module_name), class_name)
+        except ImportError as e:
+            raise ImportError(f"Adapter for database type '{db_type}' could not be loaded: {str(e)}") from e
+        except AttributeError:
+            raise ValueError(f"Adapter path {path} does not name a class")
+    
+    @staticmethod
+    def _validate(adapter_class: type, base_class: type = DatabaseAdapter) -> None:
+        if not (isinstance(adapter_class, type) and issubclass(adapter_class, base_class)):
+            raise ValueError(f"{adapter_class!r} must subclass {base_class.__name__}")
@@ -1,46 +1,64 @@
 from pymongo import MongoClient
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Iterator
 from .base import DatabaseAdapter
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 
+# Documents sampled per collection when inferring fields
+SCHEMA_SAMPLE_SIZE = 100
+# Collections described in parallel by get_schema
+SCHEMA_WORKERS = 8
+
+
+def build_connection_string(config: Dict[str, Any]) -> str:
+    """MongoDB URI for a connection config; shared with the asyncio adapter"""
+    # Check if it's Atlas connection
+    if config.get('mongodb_connection_type') == 'atlas':
+        # MongoDB Atlas format - Atlas hosts typically contain 'mongodb.net'
+        return f"mongodb+srv://{config['username']}:{config['password']}@{config['host']}/{config['database']}?retryWrites=true&w=majority"
+    # Standard MongoDB format
+    return f"mongodb://{config['username']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
+
+
 class MongoDBAdapter(DatabaseAdapter):
     
+    db_type = 'mongodb'
+    # MongoClient is itself a thread-safe pool
+    shares_pooled_connection = True
+    
     def connect(self) -> None:
         """Establish MongoDB connection"""
-        try:
-            # Check if it's Atlas connection
-            if self.config.get('mongodb_connection_type') == 'atlas':
-                # MongoDB Atlas format - Atlas hosts typically contain 'mongodb.net'
-                connection_string = f"mongodb+srv://{self.config['username']}:{self.config['password']}@{self.config['host']}/{self.config['database']}?retryWrites=true&w=majority"
-            else:
-                # Standard MongoDB format
-                connection_string = f"mongodb://{self.config['username']}:{self.config['password']}@{self.config['host']}:{self.config['port']}/{self.config['database']}"
+        if self._checkout():
+            return
+        with self._observe_connect():
+            try:
+                connection_string = build_connection_string(self.config)
             
-            print(f"Connection string being used: {connection_string[:20]}...")  # Debug - shows protocol
+                print(f"Connection string being used: {connection_string[:20]}...")  # Debug - shows protocol
             
-            self.connection = MongoClient(
-                connection_string,
-                serverSelectionTimeoutMS=10000,
-                connectTimeoutMS=10000
-            )
-            # Force connection to check if it's valid
-            self.connection.server_info()
-        except Exception as e:
-            error_str = str(e)
-            if "Authentication failed" in error_str:
-                raise Exception("Authentication failed: Invalid username or password")
-            elif "ServerSelectionTimeoutError" in error_str or "getaddrinfo failed" in error_str:
-                if self.config.get('mongodb_connection_type') == 'atlas':
-                    raise Exception(f"Connection failed: Cannot connect to MongoDB Atlas. Please check: 1) Your cluster address is correct, 2) Your IP is whitelisted in Atlas, 3) Your network allows outbound connections to Atlas")
+                self.connection = MongoClient(
+                    connection_string,
+                    serverSelectionTimeoutMS=10000,
+                    connectTimeoutMS=10000
+                )
+                # Force connection to check if it's valid
+                self.connection.server_info()
+            except Exception as e:
+                error_str = str(e)
+                if "Authentication failed" in error_str:
+                    raise Exception("Authentication failed: Invalid username or password")
+                elif "ServerSelectionTimeoutError" in error_str or "getaddrinfo failed" in error_str:
+                    if self.config.get('mongodb_connection_type') == 'atlas':
+                        raise Exception(f"Connection failed: Cannot connect to MongoDB Atlas. Please check: 1) Your cluster address is correct, 2) Your IP is whitelisted in Atlas, 3) Your network allows outbound connections to Atlas")
+                    else:
+                        raise Exception(f"Connection failed: Cannot connect to MongoDB at {self.config['host']}:{self.config['port']}")
                 else:
-                    raise Exception(f"Connection failed: Cannot connect to MongoDB at {self.config['host']}:{self.config['port']}")
-            else:
-                raise Exception(f"Connection error: {error_str}")
+                    raise Exception(f"Connection error: {error_str}")
     
     def disconnect(self) -> None:
         """Close MongoDB connection"""
-        if self.connection:
+        if not self._checkin() and self.connection:
             self.connection.close()
             self.connection = None
     
@@ -69,7 +87,7 @@ class MongoDBAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
-    def get_schema(self) -> Dict[str, Any]:
+    def get_schema(self, table_names: List[str] = None) -> Dict[str, Any]:
         """Get MongoDB schema information (collections and sample docs)"""
         schema_info = {"collections": {}}
         
@@ -78,29 +96,16 @@ class MongoDBAdapter(DatabaseAdapter):
             db = self.connection[self.config['database']]
             
             # Get all collections
-            collections = db.list_collection_names()
+            if table_names:
+                collections = db.list_collection_names(filter={'name': {'$in': list(table_names)}})
+            else:
+                collections = db.list_collection_names()
             
-            for collection_name in collections:
-                collection = db[collection_name]
-                
-                # Get collection stats
-                stats = db.command("collStats", collection_name)
-                
-                # Get a sample document to infer schema
-                sample_doc = collection.find_one()
-                
-                schema_info['collections'][collection_name] = {
-                    "type": "COLLECTION",
-                    "count": stats.get('count', 0),
-                    "size": stats.get('size', 0),
-                    "avgObjSize": stats.get('avgObjSize', 0),
-                    "fields": []
-                }
-                
-                # Infer fields from sample document
-                if sample_doc:
-                    fields = self._extract_fields(sample_doc)
-                    schema_info['collections'][collection_name]['fields'] = fields
+            # Collections are sampled concurrently; MongoClient is thread-safe
+            if collections:
+                with ThreadPoolExecutor(max_workers=min(SCHEMA_WORKERS, len(collections))) as executor:
+                    described = executor.map(lambda name: self._describe_collection(db, name), collections)
+                    schema_info['collections'] = dict(zip(collections, described))
             
             schema_info['summary'] = {
                 'total_collections': len(collections),
@@ -111,6 +116,72 @@ class MongoDBAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
+    def get_table_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Describe one collection without listing the whole database"""
+        try:
+            self.connect()
+            db = self.connection[self.config['database']]
+            if not db.list_collection_names(filter={'name': table_name}):
+                return None
+            return self._describe_collection(db, table_name)
+        finally:
+            self.disconnect()
+    
+    def _describe_collection(self, db, collection_name: str) -> Dict[str, Any]:
+        """Collection stats plus fields merged from a random sample of documents"""
+        collection = db[collection_name]
+        
+        # Get collection stats
+        stats = db.command("collStats", collection_name)
+        
+        # Sample documents to infer schema; $sample picks them at random
+        sample_size = int(self.config.get('options', {}).get('schema_sample_size', SCHEMA_SAMPLE_SIZE))
+        sample_docs = list(collection.aggregate([{'$sample': {'size': sample_size}}]))
+        
+        return {
+            "type": "COLLECTION",
+            "count": stats.get('count', 0),
+            "size": stats.get('size', 0),
+            "avgObjSize": stats.get('avgObjSize', 0),
+            "sampled": len(sample_docs),
+            "fields": self._merge_fields(sample_docs)
+        }
+    
+    def _merge_fields(self, docs: List[Dict]) -> List[Dict]:
+        """
+        Combine per-document fields into one entry per path
+        
+        Each entry reports the most common type, every type seen with its
+        count, and the fraction of sampled documents containing the path.
+        """
+        merged = {}
+        for doc in docs:
+            seen = set()
+            for field in self._extract_fields(doc):
+                entry = merged.setdefault(field['name'], {
+                    "name": field['name'],
+                    "type": None,
+                    "types": {},
+                    "sample_value": None,
+                    "occurrences": 0
+                })
+                entry['types'][field['type']] = entry['types'].get(field['type'], 0) + 1
+                if entry['sample_value'] is None and field['type'] != 'NoneType':
+                    entry['sample_value'] = field['sample_value']
+                if field['name'] not in seen:
+                    entry['occurrences'] += 1
+                    seen.add(field['name'])
+        
+        fields = []
+        for entry in merged.values():
+            # Prefer a concrete type over null when picking the dominant one
+            ranked = sorted(entry['types'].items(), key=lambda item: (item[0] != 'NoneType', item[1]), reverse=True)
+            entry['type'] = ranked[0][0]
+            entry['frequency'] = round(entry.pop('occurrences') / len(docs), 3)
+            entry['nullable'] = 'NoneType' in entry['types'] or entry['frequency'] < 1
+            fields.append(entry)
+        return fields
+    
     def _extract_fields(self, doc: Dict, prefix: str = "") -> List[Dict]:
         """Extract field information from a document"""
         fields = []
@@ -135,8 +206,10 @@ class MongoDBAdapter(DatabaseAdapter):
     
     def execute_query(self, query: str, params: List[Any] = None) -> Any:
         """Execute MongoDB command"""
-        try:
+        owns_connection = self.connection is None
+        if owns_connection:
             self.connect()
+        try:
             db = self.connection[self.config['database']]
             # For MongoDB, we expect query to be a dict command
             if isinstance(query, str):
@@ -144,7 +217,17 @@ class MongoDBAdapter(DatabaseAdapter):
                 query = json.loads(query)
             return db.command(query)
         finally:
-            self.disconnect()
+            if owns_connection:
+                self.disconnect()
+    
+    def transaction(self):
+        """Multi-document transactions need a replica set and a session on every write"""
+        raise NotImplementedError("MongoDB writes are not transactional; use bulk_write() on the collection")
+    
+    def iter_query(self, query: str, params: List[Any] = None, chunk_size: int = 1000,
+                   as_dict: bool = True) -> Iterator[Any]:
+        """MongoDB reads stream through collection cursors; there is no query text to run"""
+        raise NotImplementedError("Use find()/aggregate() cursors on the collection to stream MongoDB reads")
     
     def get_test_query(self) -> str:
         """MongoDB test command"""
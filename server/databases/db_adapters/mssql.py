@@ -1,54 +1,66 @@
 import pymssql
-from typing import Dict, List, Any, Tuple
+import uuid
+from typing import Dict, List, Any, Tuple, Optional, Iterator, Iterable
 from .base import DatabaseAdapter
 
 
 class MSSQLAdapter(DatabaseAdapter):
     
+    db_type = 'mssql'
+    
+    supports_bulk_load = True
+    # T-SQL names savepoints with SAVE TRANSACTION and has no RELEASE
+    SAVEPOINT_SQL = "SAVE TRANSACTION {name}"
+    ROLLBACK_TO_SAVEPOINT_SQL = "ROLLBACK TRANSACTION {name}"
+    RELEASE_SAVEPOINT_SQL = None
+    
     def connect(self) -> None:
         """Establish SQL Server connection"""
-        try:
-            # Handle potential instance names in host (e.g., server\instance)
-            server = self.config['host']
-            
-            # Basic connection parameters
-            conn_params = {
-                'server': server,
-                'port': self.config['port'],
-                'database': self.config['database'],
-                'user': self.config['username'],
-                'password': self.config['password'],
-                'timeout': 10,
-                'login_timeout': 10,
-                'charset': 'UTF-8'
-            }
+        if self._checkout():
+            return
+        with self._observe_connect():
+            try:
+                # Handle potential instance names in host (e.g., server\instance)
+                server = self.config['host']
             
-            # Handle TLS/SSL
-            if self.config.get('ssl_enabled'):
-                conn_params['tds_version'] = '7.4'  # Use newer TDS version for better security
+                # Basic connection parameters
+                conn_params = {
+                    'server': server,
+                    'port': self.config['port'],
+                    'database': self.config['database'],
+                    'user': self.config['username'],
+                    'password': self.config['password'],
+                    'timeout': 10,
+                    'login_timeout': 10,
+                    'charset': 'UTF-8'
+                }
             
-            self.connection = pymssql.connect(**conn_params)
+                # Handle TLS/SSL
+                if self.config.get('ssl_enabled'):
+                    conn_params['tds_version'] = '7.4'  # Use newer TDS version for better security
             
-        except pymssql.InterfaceError as e:
-            error_str = str(e)
-            if "Cannot connect to server" in error_str:
-                raise Exception(f"Connection failed: Cannot connect to SQL Server at {self.config['host']}:{self.config['port']}")
-            else:
-                raise Exception(f"Interface error: {error_str}")
-        except pymssql.DatabaseError as e:
-            error_str = str(e)
-            if "Login failed" in error_str:
-                raise Exception("Authentication failed: Invalid username or password")
-            elif "Cannot open database" in error_str:
-                raise Exception(f"Database '{self.config['database']}' does not exist or access denied")
-            else:
-                raise Exception(f"Database error: {error_str}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+                self.connection = pymssql.connect(**conn_params)
+            
+            except pymssql.InterfaceError as e:
+                error_str = str(e)
+                if "Cannot connect to server" in error_str:
+                    raise Exception(f"Connection failed: Cannot connect to SQL Server at {self.config['host']}:{self.config['port']}")
+                else:
+                    raise Exception(f"Interface error: {error_str}")
+            except pymssql.DatabaseError as e:
+                error_str = str(e)
+                if "Login failed" in error_str:
+                    raise Exception("Authentication failed: Invalid username or password")
+                elif "Cannot open database" in error_str:
+                    raise Exception(f"Database '{self.config['database']}' does not exist or access denied")
+                else:
+                    raise Exception(f"Database error: {error_str}")
+            except Exception as e:
+                raise Exception(f"Unexpected error: {str(e)}")
     
     def disconnect(self) -> None:
         """Close SQL Server connection"""
-        if self.connection:
+        if not self._checkin() and self.connection:
             self.connection.close()
             self.connection = None
     
@@ -95,120 +107,55 @@ class MSSQLAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
-    def get_schema(self) -> Dict[str, Any]:
+    def get_schema(self, table_names: List[str] = None) -> Dict[str, Any]:
         """Get SQL Server schema information"""
         schema_info = {"tables": {}}
         
         try:
             self.connect()
-            cursor = self.connection.cursor()
+            cursor = self.connection.cursor(as_dict=True)
             
             # Get schema name or use default
-            schema_name = self.config.get('schema', 'dbo')
-            
-            # Get all tables and views
-            cursor.execute("""
-                SELECT 
-                    TABLE_SCHEMA,
-                    TABLE_NAME,
-                    TABLE_TYPE
-                FROM INFORMATION_SCHEMA.TABLES
-                WHERE TABLE_SCHEMA = %s
-                ORDER BY TABLE_NAME
-            """, (schema_name,))
-            
-            tables = cursor.fetchall()
-            
-            for schema, table_name, table_type in tables:
-                schema_info['tables'][table_name] = {
-                    "type": table_type,
+            schema_name = self.config.get('schema') or 'dbo'
+            
+            # One query for every column in the schema, grouped client-side
+            if self.config.get('options', {}).get('fast_introspection'):
+                rows = self._fetch_catalog_columns(cursor, schema_name, table_names)
+            else:
+                rows = self._fetch_information_schema_columns(cursor, schema_name, table_names)
+            
+            for row in rows:
+                table = schema_info['tables'].setdefault(row['TABLE_NAME'], {
+                    "type": row['TABLE_TYPE'],
                     "columns": []
-                }
+                })
                 
-                # Get columns for each table
-                cursor.execute("""
-                    SELECT 
-                        c.COLUMN_NAME,
-                        c.DATA_TYPE,
-                        c.CHARACTER_MAXIMUM_LENGTH,
-                        c.NUMERIC_PRECISION,
-                        c.NUMERIC_SCALE,
-                        c.IS_NULLABLE,
-                        c.COLUMN_DEFAULT,
-                        CASE 
-                            WHEN pk.COLUMN_NAME IS NOT NULL THEN 'PRIMARY KEY'
-                            WHEN fk.COLUMN_NAME IS NOT NULL THEN 'FOREIGN KEY'
-                            ELSE NULL
-                        END as CONSTRAINT_TYPE
-                    FROM INFORMATION_SCHEMA.COLUMNS c
-                    LEFT JOIN (
-                        SELECT ku.TABLE_SCHEMA, ku.TABLE_NAME, ku.COLUMN_NAME
-                        FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
-                        JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE ku
-                            ON tc.CONSTRAINT_NAME = ku.CONSTRAINT_NAME
-                        WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
-                    ) pk ON c.TABLE_SCHEMA = pk.TABLE_SCHEMA 
-                        AND c.TABLE_NAME = pk.TABLE_NAME 
-                        AND c.COLUMN_NAME = pk.COLUMN_NAME
-                    LEFT JOIN (
-                        SELECT ku.TABLE_SCHEMA, ku.TABLE_NAME, ku.COLUMN_NAME
-                        FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
-                        JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE ku
-                            ON tc.CONSTRAINT_NAME = ku.CONSTRAINT_NAME
-                        WHERE tc.CONSTRAINT_TYPE = 'FOREIGN KEY'
-                    ) fk ON c.TABLE_SCHEMA = fk.TABLE_SCHEMA 
-                        AND c.TABLE_NAME = fk.TABLE_NAME 
-                        AND c.COLUMN_NAME = fk.COLUMN_NAME
-                    WHERE c.TABLE_SCHEMA = %s AND c.TABLE_NAME = %s
-                    ORDER BY c.ORDINAL_POSITION
-                """, (schema_name, table_name))
+                if row['COLUMN_NAME'] is None:
+                    continue
                 
-                columns = cursor.fetchall()
+                column_info = self._build_column_info(
+                    name=row['COLUMN_NAME'],
+                    data_type=row['DATA_TYPE'],
+                    nullable=row['IS_NULLABLE'] == 'YES',
+                    default=row['COLUMN_DEFAULT'],
+                    length=row['CHARACTER_MAXIMUM_LENGTH'],
+                    precision=row['NUMERIC_PRECISION'],
+                    scale=row['NUMERIC_SCALE']
+                )
                 
-                for col in columns:
-                    column_info = {
-                        "name": col[0],
-                        "type": col[1],
-                        "nullable": col[5] == 'YES',
-                        "default": col[6],
-                        "constraints": []
-                    }
-                    
-                    # Add length/precision info
-                    if col[2]:  # CHARACTER_MAXIMUM_LENGTH
-                        column_info['length'] = col[2]
-                    elif col[3]:  # NUMERIC_PRECISION
-                        column_info['precision'] = col[3]
-                        if col[4]:  # NUMERIC_SCALE
-                            column_info['scale'] = col[4]
-                    
-                    # Add constraint info
-                    if col[7]:  # CONSTRAINT_TYPE
-                        column_info['constraints'].append(col[7])
-                    
-                    schema_info['tables'][table_name]['columns'].append(column_info)
-            
-            # Add identity columns info
-            cursor.execute("""
-                SELECT 
-                    OBJECT_SCHEMA_NAME(object_id) AS schema_name,
-                    OBJECT_NAME(object_id) AS table_name,
-                    name AS column_name
-                FROM sys.identity_columns
-                WHERE OBJECT_SCHEMA_NAME(object_id) = %s
-            """, (schema_name,))
-            
-            identity_columns = cursor.fetchall()
-            for schema, table, column in identity_columns:
-                if table in schema_info['tables']:
-                    for col_info in schema_info['tables'][table]['columns']:
-                        if col_info['name'] == column:
-                            if 'IDENTITY' not in col_info['constraints']:
-                                col_info['constraints'].append('IDENTITY')
+                # Add constraint info
+                if row['IS_PRIMARY_KEY']:
+                    column_info['constraints'].append('PRIMARY KEY')
+                if row['IS_FOREIGN_KEY']:
+                    column_info['constraints'].append('FOREIGN KEY')
+                if row['IS_IDENTITY']:
+                    column_info['constraints'].append('IDENTITY')
+                
+                table['columns'].append(column_info)
             
             # Get summary
             schema_info['summary'] = {
-                'total_tables': len(tables),
+                'total_tables': len(schema_info['tables']),
                 'schema_name': schema_name,
                 'database_name': self.config['database']
             }
@@ -218,11 +165,139 @@ class MSSQLAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
+    def _table_filter(self, column: str, table_names: List[str] = None) -> Tuple[str, tuple]:
+        """SQL fragment and params restricting a query to the given table names"""
+        if not table_names:
+            return "", ()
+        placeholders = ', '.join(['%s'] * len(table_names))
+        return f"AND {column} IN ({placeholders})", tuple(table_names)
+    
+    def _fetch_information_schema_columns(self, cursor, schema_name: str, table_names: List[str] = None) -> List[Dict]:
+        """Columns of every table and view in the schema via INFORMATION_SCHEMA"""
+        table_filter, filter_params = self._table_filter('t.TABLE_NAME', table_names)
+        
+        cursor.execute(f"""
+            SELECT 
+                t.TABLE_NAME,
+                t.TABLE_TYPE,
+                c.COLUMN_NAME,
+                c.DATA_TYPE,
+                c.CHARACTER_MAXIMUM_LENGTH,
+                c.NUMERIC_PRECISION,
+                c.NUMERIC_SCALE,
+                c.IS_NULLABLE,
+                c.COLUMN_DEFAULT,
+                CASE WHEN pk.COLUMN_NAME IS NOT NULL THEN 1 ELSE 0 END AS IS_PRIMARY_KEY,
+                CASE WHEN fk.COLUMN_NAME IS NOT NULL THEN 1 ELSE 0 END AS IS_FOREIGN_KEY,
+                COLUMNPROPERTY(
+                    OBJECT_ID(QUOTENAME(c.TABLE_SCHEMA) + '.' + QUOTENAME(c.TABLE_NAME)),
+                    c.COLUMN_NAME, 'IsIdentity'
+                ) AS IS_IDENTITY
+            FROM INFORMATION_SCHEMA.TABLES t
+            LEFT JOIN INFORMATION_SCHEMA.COLUMNS c
+                ON c.TABLE_SCHEMA = t.TABLE_SCHEMA
+                AND c.TABLE_NAME = t.TABLE_NAME
+            LEFT JOIN (
+                SELECT DISTINCT ku.TABLE_SCHEMA, ku.TABLE_NAME, ku.COLUMN_NAME
+                FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+                JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE ku
+                    ON tc.CONSTRAINT_NAME = ku.CONSTRAINT_NAME
+                    AND tc.CONSTRAINT_SCHEMA = ku.CONSTRAINT_SCHEMA
+                WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+            ) pk ON c.TABLE_SCHEMA = pk.TABLE_SCHEMA 
+                AND c.TABLE_NAME = pk.TABLE_NAME 
+                AND c.COLUMN_NAME = pk.COLUMN_NAME
+            LEFT JOIN (
+                SELECT DISTINCT ku.TABLE_SCHEMA, ku.TABLE_NAME, ku.COLUMN_NAME
+                FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+                JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE ku
+                    ON tc.CONSTRAINT_NAME = ku.CONSTRAINT_NAME
+                    AND tc.CONSTRAINT_SCHEMA = ku.CONSTRAINT_SCHEMA
+                WHERE tc.CONSTRAINT_TYPE = 'FOREIGN KEY'
+            ) fk ON c.TABLE_SCHEMA = fk.TABLE_SCHEMA 
+                AND c.TABLE_NAME = fk.TABLE_NAME 
+                AND c.COLUMN_NAME = fk.COLUMN_NAME
+            WHERE t.TABLE_SCHEMA = %s
+            {table_filter}
+            ORDER BY t.TABLE_NAME, c.ORDINAL_POSITION
+        """, (schema_name,) + filter_params)
+        return cursor.fetchall()
+    
+    def _fetch_catalog_columns(self, cursor, schema_name: str, table_names: List[str] = None) -> List[Dict]:
+        """
+        Same rows as _fetch_information_schema_columns, read from sys.columns
+        
+        Lengths are converted from bytes to characters for n(var)char so both
+        paths report the same values.
+        """
+        table_filter, filter_params = self._table_filter('o.name', table_names)
+        
+        cursor.execute(f"""
+            SELECT 
+                o.name AS TABLE_NAME,
+                CASE o.type WHEN 'V' THEN 'VIEW' ELSE 'BASE TABLE' END AS TABLE_TYPE,
+                c.name AS COLUMN_NAME,
+                ty.name AS DATA_TYPE,
+                CASE
+                    WHEN ty.name IN ('char', 'varchar', 'binary', 'varbinary') THEN c.max_length
+                    WHEN ty.name IN ('nchar', 'nvarchar') AND c.max_length = -1 THEN -1
+                    WHEN ty.name IN ('nchar', 'nvarchar') THEN c.max_length / 2
+                END AS CHARACTER_MAXIMUM_LENGTH,
+                CASE
+                    WHEN ty.name IN ('tinyint', 'smallint', 'int', 'bigint', 'decimal', 'numeric',
+                                     'float', 'real', 'money', 'smallmoney') THEN c.precision
+                END AS NUMERIC_PRECISION,
+                CASE WHEN ty.name IN ('decimal', 'numeric') THEN c.scale END AS NUMERIC_SCALE,
+                CASE WHEN c.is_nullable = 1 THEN 'YES' ELSE 'NO' END AS IS_NULLABLE,
+                dc.definition AS COLUMN_DEFAULT,
+                CASE WHEN EXISTS (
+                    SELECT 1 FROM sys.index_columns ic
+                    JOIN sys.indexes i ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+                    WHERE i.is_primary_key = 1 AND ic.object_id = c.object_id AND ic.column_id = c.column_id
+                ) THEN 1 ELSE 0 END AS IS_PRIMARY_KEY,
+                CASE WHEN EXISTS (
+                    SELECT 1 FROM sys.foreign_key_columns fkc
+                    WHERE fkc.parent_object_id = c.object_id AND fkc.parent_column_id = c.column_id
+                ) THEN 1 ELSE 0 END AS IS_FOREIGN_KEY,
+                c.is_identity AS IS_IDENTITY
+            FROM sys.objects o
+            JOIN sys.schemas s ON s.schema_id = o.schema_id
+            LEFT JOIN sys.columns c ON c.object_id = o.object_id
+            LEFT JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+            LEFT JOIN sys.default_constraints dc ON dc.object_id = c.default_object_id
+            WHERE s.name = %s
+            AND o.type IN ('U', 'V')
+            {table_filter}
+            ORDER BY o.name, c.column_id
+        """, (schema_name,) + filter_params)
+        return cursor.fetchall()
+    
+    def get_schema_versions(self, table_names: List[str] = None) -> Optional[Dict[str, str]]:
+        """Fingerprint tables by sys.objects.modify_date, which ALTER TABLE bumps"""
+        schema_name = self.config.get('schema') or 'dbo'
+        table_filter, filter_params = self._table_filter('o.name', table_names)
+        
+        rows = self.execute_query(f"""
+            SELECT 
+                o.name AS table_name,
+                CONVERT(varchar(33), o.modify_date, 126) AS version
+            FROM sys.objects o
+            JOIN sys.schemas s ON s.schema_id = o.schema_id
+            WHERE s.name = %s
+            AND o.type IN ('U', 'V')
+            {table_filter}
+        """, (schema_name,) + filter_params)
+        return {row['table_name']: row['version'] for row in rows}
+    
     def execute_query(self, query: str, params: List[Any] = None) -> Any:
         """Execute a query and return results"""
-        try:
+        # Reuse a held connection so the statement joins the caller's transaction
+        owns_connection = self.connection is None
+        if owns_connection:
             self.connect()
-            cursor = self.connection.cursor()
+        cursor = None
+        try:
+            cursor = self.connection.cursor(as_dict=True)
             
             if params:
                 cursor.execute(query, params)
@@ -231,19 +306,151 @@ class MSSQLAdapter(DatabaseAdapter):
             
             # Check if it's a SELECT query
             if query.strip().upper().startswith('SELECT'):
-                columns = [column[0] for column in cursor.description]
-                rows = cursor.fetchall()
-                # Return as list of dicts for consistency
-                return [dict(zip(columns, row)) for row in rows]
+                # Rows come back as dicts straight from the driver
+                return cursor.fetchall()
             else:
-                self.connection.commit()
+                if owns_connection:
+                    self.connection.commit()
                 return cursor.rowcount
                 
         finally:
             if cursor:
                 cursor.close()
-            self.disconnect()
+            if owns_connection:
+                self.disconnect()
+    
+    def execute_statement(self, query: str, params: List[Any] = None) -> Any:
+        """Execute a write on the held connection, leaving commit to the caller's transaction"""
+        if self.connection is None:
+            return self.execute_query(query, params)
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, tuple(params or ()))
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    
+    def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """Run every parameter set through one cursor with executemany"""
+        params_list = [tuple(params) for params in params_seq]
+        with self.transaction():
+            cursor = self.connection.cursor()
+            try:
+                cursor.executemany(query, params_list)
+            finally:
+                cursor.close()
+        return len(params_list)
+    
+    def bulk_load(self, table: str, columns: List[str], rows: Iterable[Iterable[Any]],
+                  conflict_columns: List[str] = None) -> int:
+        """
+        Bulk copy rows into a #temp table, then move them with one set-based statement
+        
+        The staging table copies the target's column types, so values are
+        converted by the server exactly as a normal INSERT would. Without
+        conflict_columns rows are appended with INSERT ... SELECT; with them one
+        MERGE updates matches and inserts the rest. When a key repeats within the
+        batch the last row wins, as with per-record upserts.
+        """
+        column_list = ', '.join(f'[{col}]' for col in columns)
+        stage = f"#bulk_stage_{uuid.uuid4().hex[:12]}"
+        
+        # UNION ALL strips IDENTITY from the copied columns, so supplied values
+        # are kept; _bulk_seq records arrival order for de-duplication
+        self._execute_held(f"""
+            SELECT TOP 0 {column_list} INTO {stage} FROM {table}
+            UNION ALL
+            SELECT TOP 0 {column_list} FROM {table}
+        """)
+        self._execute_held(f"ALTER TABLE {stage} ADD _bulk_seq BIGINT IDENTITY(1, 1)")
+        
+        try:
+            counted = _CountingRows(rows)
+            self.connection.bulk_copy(stage, counted, column_ids=list(range(1, len(columns) + 1)))
+            
+            if conflict_columns:
+                self._execute_held(self._merge_from_stage(table, stage, columns, conflict_columns))
+            else:
+                self._execute_held(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {stage} ORDER BY _bulk_seq")
+            return counted.count
+        finally:
+            try:
+                self._execute_held(f"IF OBJECT_ID('tempdb..{stage}') IS NOT NULL DROP TABLE {stage}")
+            except pymssql.Error:
+                # A failed batch is rolled back and the session closed, which drops it anyway
+                pass
+    
+    @staticmethod
+    def _merge_from_stage(table: str, stage: str, columns: List[str], conflict_columns: List[str]) -> str:
+        """MERGE the newest staged row per key into the target table"""
+        column_list = ', '.join(f'[{col}]' for col in columns)
+        key_list = ', '.join(f'[{col}]' for col in conflict_columns)
+        match = ' AND '.join(f'target.[{col}] = source.[{col}]' for col in conflict_columns)
+        update_columns = [col for col in columns if col not in conflict_columns]
+        
+        statement = f"""
+            MERGE INTO {table} WITH (HOLDLOCK) AS target
+            USING (
+                SELECT {column_list} FROM (
+                    SELECT {column_list},
+                        ROW_NUMBER() OVER (PARTITION BY {key_list} ORDER BY _bulk_seq DESC) AS _bulk_rank
+                    FROM {stage}
+                ) ranked
+                WHERE _bulk_rank = 1
+            ) AS source
+            ON {match}
+        """
+        if update_columns:
+            update_str = ', '.join(f'target.[{col}] = source.[{col}]' for col in update_columns)
+            statement += f"WHEN MATCHED THEN UPDATE SET {update_str}\n"
+        source_list = ', '.join(f'source.[{col}]' for col in columns)
+        return statement + f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({source_list});"
+    
+    def _execute_held(self, query: str, params: tuple = None) -> int:
+        """Run a statement on the held connection without committing"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    
+    def iter_query(self, query: str, params: List[Any] = None, chunk_size: int = 1000,
+                   as_dict: bool = True) -> Iterator[Any]:
+        """Stream rows with fetchmany; pymssql reads them off the wire as they are fetched"""
+        owns_connection = self.connection is None
+        if owns_connection:
+            self.connect()
+        cursor = self.connection.cursor(as_dict=as_dict)
+        try:
+            if params:
+                cursor.execute(query, tuple(params))
+            else:
+                cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+            if owns_connection:
+                self.disconnect()
     
     def get_test_query(self) -> str:
         """SQL Server test query"""
-        return "SELECT 1"
\ No newline at end of file
+        return "SELECT 1"
+
+
+class _CountingRows:
+    """Iterate rows as tuples for bulk_copy while counting how many were sent"""
+    
+    def __init__(self, rows: Iterable[Iterable[Any]]):
+        self.rows = rows
+        self.count = 0
+    
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield tuple(row)
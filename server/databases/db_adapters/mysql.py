@@ -1,41 +1,61 @@
 import pymysql
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Iterator, Iterable
 from .base import DatabaseAdapter
+from datetime import date, datetime, time
+from decimal import Decimal
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
 
 
 class MySQLAdapter(DatabaseAdapter):
     
+    db_type = 'mysql'
+    supports_bulk_load = True
+    
     def connect(self) -> None:
         """Establish MySQL connection"""
-        try:
-            self.connection = pymysql.connect(
-                host=self.config['host'],
-                port=self.config['port'],
-                database=self.config['database'],
-                user=self.config['username'],
-                password=self.config['password'],
-                connect_timeout=10,
-                cursorclass=pymysql.cursors.DictCursor
-            )
-        except pymysql.err.OperationalError as e:
-            error_code = e.args[0]
-            if error_code == 1045:
-                raise Exception("Authentication failed: Access denied (invalid username/password)")
-            elif error_code == 2003:
-                raise Exception(f"Connection failed: Cannot connect to host '{self.config['host']}'")
-            elif error_code == 1049:
-                raise Exception(f"Database '{self.config['database']}' does not exist")
-            else:
-                raise Exception(f"Connection error: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+        if self._checkout():
+            return
+        with self._observe_connect():
+            try:
+                self.connection = pymysql.connect(
+                    host=self.config['host'],
+                    port=self.config['port'],
+                    database=self.config['database'],
+                    user=self.config['username'],
+                    password=self.config['password'],
+                    connect_timeout=10,
+                    cursorclass=pymysql.cursors.DictCursor,
+                    # Only bulk-load mappings ask for LOAD DATA LOCAL; it lets the server request client files
+                    local_infile=bool(self.config.get('local_infile'))
+                )
+            except pymysql.err.OperationalError as e:
+                error_code = e.args[0]
+                if error_code == 1045:
+                    raise Exception("Authentication failed: Access denied (invalid username/password)")
+                elif error_code == 2003:
+                    raise Exception(f"Connection failed: Cannot connect to host '{self.config['host']}'")
+                elif error_code == 1049:
+                    raise Exception(f"Database '{self.config['database']}' does not exist")
+                else:
+                    raise Exception(f"Connection error: {str(e)}")
+            except Exception as e:
+                raise Exception(f"Unexpected error: {str(e)}")
     
     def disconnect(self) -> None:
         """Close MySQL connection"""
-        if self.connection:
+        if not self._checkin() and self.connection:
             self.connection.close()
             self.connection = None
     
+    @staticmethod
+    def _pooled_connection_usable(connection) -> bool:
+        return connection.open
+    
     def test_connection(self) -> Tuple[bool, str, Dict[str, Any]]:
         """Test MySQL connection"""
         try:
@@ -67,66 +87,77 @@ class MySQLAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
-    def get_schema(self) -> Dict[str, Any]:
+    def get_schema(self, table_names: List[str] = None) -> Dict[str, Any]:
         """Get MySQL schema information"""
         schema_info = {"tables": {}}
         
         try:
             self.connect()
             with self.connection.cursor() as cursor:
-                # Get all tables
-                cursor.execute("SHOW TABLES")
-                tables = cursor.fetchall()
-                table_key = f"Tables_in_{self.config['database']}"
+                # One query for every column in the database, grouped client-side
+                table_filter = ""
+                params = []
+                if table_names:
+                    table_filter = f"AND t.TABLE_NAME IN ({', '.join(['%s'] * len(table_names))})"
+                    params = list(table_names)
                 
-                for table_row in tables:
-                    table_name = table_row[table_key]
-                    schema_info['tables'][table_name] = {
-                        "type": "TABLE",
+                cursor.execute(f"""
+                    SELECT 
+                        t.TABLE_NAME,
+                        t.TABLE_TYPE,
+                        c.COLUMN_NAME,
+                        c.DATA_TYPE,
+                        c.CHARACTER_MAXIMUM_LENGTH,
+                        c.NUMERIC_PRECISION,
+                        c.NUMERIC_SCALE,
+                        c.IS_NULLABLE,
+                        c.COLUMN_DEFAULT,
+                        c.COLUMN_KEY,
+                        c.EXTRA
+                    FROM information_schema.TABLES t
+                    LEFT JOIN information_schema.COLUMNS c
+                        ON c.TABLE_SCHEMA = t.TABLE_SCHEMA
+                        AND c.TABLE_NAME = t.TABLE_NAME
+                    WHERE t.TABLE_SCHEMA = DATABASE()
+                    {table_filter}
+                    ORDER BY t.TABLE_NAME, c.ORDINAL_POSITION
+                """, params)
+                
+                for row in cursor.fetchall():
+                    table = schema_info['tables'].setdefault(row['TABLE_NAME'], {
+                        "type": "VIEW" if row['TABLE_TYPE'] == 'VIEW' else "TABLE",
                         "columns": []
-                    }
+                    })
+                    
+                    if row['COLUMN_NAME'] is None:
+                        continue
+                    
+                    column_info = self._build_column_info(
+                        name=row['COLUMN_NAME'],
+                        data_type=row['DATA_TYPE'],
+                        nullable=row['IS_NULLABLE'] == 'YES',
+                        default=row['COLUMN_DEFAULT'],
+                        length=row['CHARACTER_MAXIMUM_LENGTH'],
+                        precision=row['NUMERIC_PRECISION'],
+                        scale=row['NUMERIC_SCALE']
+                    )
                     
-                    # Get columns for each table
-                    cursor.execute(f"DESCRIBE `{table_name}`")
-                    columns = cursor.fetchall()
+                    # Add constraint info
+                    if row['COLUMN_KEY'] == 'PRI':
+                        column_info['constraints'].append('PRIMARY KEY')
+                    elif row['COLUMN_KEY'] == 'MUL':
+                        column_info['constraints'].append('FOREIGN KEY')
+                    elif row['COLUMN_KEY'] == 'UNI':
+                        column_info['constraints'].append('UNIQUE')
                     
-                    for col in columns:
-                        column_info = {
-                            "name": col['Field'],
-                            "type": col['Type'],
-                            "nullable": col['Null'] == 'YES',
-                            "default": col['Default'],
-                            "constraints": []
-                        }
-                        
-                        # Parse type for length/precision
-                        if '(' in col['Type'] and ')' in col['Type']:
-                            base_type = col['Type'][:col['Type'].index('(')]
-                            params = col['Type'][col['Type'].index('(')+1:col['Type'].index(')')]
-                            column_info['type'] = base_type
-                            if ',' in params:
-                                precision, scale = params.split(',')
-                                column_info['precision'] = int(precision)
-                                column_info['scale'] = int(scale)
-                            else:
-                                column_info['length'] = int(params)
-                        
-                        # Add constraint info
-                        if col['Key'] == 'PRI':
-                            column_info['constraints'].append('PRIMARY KEY')
-                        elif col['Key'] == 'MUL':
-                            column_info['constraints'].append('FOREIGN KEY')
-                        elif col['Key'] == 'UNI':
-                            column_info['constraints'].append('UNIQUE')
-                        
-                        if col['Extra']:
-                            column_info['extra'] = col['Extra']
-                        
-                        schema_info['tables'][table_name]['columns'].append(column_info)
+                    if row['EXTRA']:
+                        column_info['extra'] = row['EXTRA']
+                    
+                    table['columns'].append(column_info)
                 
                 # Get summary
                 schema_info['summary'] = {
-                    'total_tables': len(tables),
+                    'total_tables': len(schema_info['tables']),
                     'database_name': self.config['database']
                 }
                 
@@ -134,19 +165,234 @@ class MySQLAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
+    def get_schema_versions(self, table_names: List[str] = None) -> Optional[Dict[str, str]]:
+        """Fingerprint tables by their information_schema CREATE_TIME/UPDATE_TIME"""
+        table_filter = ""
+        params = []
+        if table_names:
+            table_filter = f"AND TABLE_NAME IN ({', '.join(['%s'] * len(table_names))})"
+            params = list(table_names)
+        
+        try:
+            self.connect()
+            with self.connection.cursor() as cursor:
+                # MySQL 8 caches these columns for a day by default; read them fresh
+                try:
+                    cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+                except pymysql.err.MySQLError:
+                    pass
+                
+                cursor.execute(f"""
+                    SELECT 
+                        TABLE_NAME,
+                        CONCAT_WS('/', TABLE_TYPE, CREATE_TIME, UPDATE_TIME) AS VERSION
+                    FROM information_schema.TABLES
+                    WHERE TABLE_SCHEMA = DATABASE()
+                    {table_filter}
+                """, params)
+                return {row['TABLE_NAME']: row['VERSION'] for row in cursor.fetchall()}
+        finally:
+            self.disconnect()
+    
     def execute_query(self, query: str, params: List[Any] = None) -> Any:
         """Execute a query and return results"""
-        try:
+        # Reuse a held connection so the statement joins the caller's transaction
+        owns_connection = self.connection is None
+        if owns_connection:
             self.connect()
+        try:
             with self.connection.cursor() as cursor:
                 cursor.execute(query, params)
                 if query.strip().upper().startswith('SELECT'):
                     return cursor.fetchall()
-                self.connection.commit()
+                if owns_connection:
+                    self.connection.commit()
                 return cursor.rowcount
         finally:
-            self.disconnect()
+            if owns_connection:
+                self.disconnect()
+    
+    def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """PyMySQL's executemany rewrites INSERT ... VALUES into multi-row statements"""
+        params_list = [list(params) for params in params_seq]
+        with self.transaction(), self.connection.cursor() as cursor:
+            cursor.executemany(query, params_list)
+        return len(params_list)
+    
+    def _begin(self) -> None:
+        self.connection.begin()
+    
+    def bulk_load(self, table: str, columns: List[str], rows: Iterable[Iterable[Any]],
+                  conflict_columns: List[str] = None) -> int:
+        """
+        Stream rows as TSV into LOAD DATA LOCAL INFILE on the held connection
+        
+        Rows are written through a named pipe by a background thread, so the
+        batch is never serialised to disk or held as one buffer. Upserts load
+        into a temporary staging table and merge with INSERT ... SELECT ...
+        ON DUPLICATE KEY UPDATE. Requires config['local_infile'] at connect time.
+        """
+        if not self.config.get('local_infile'):
+            raise Exception("Bulk load requires a connection opened with local_infile enabled")
+        
+        column_list = ', '.join(f'`{col}`' for col in columns)
+        target = table
+        if conflict_columns:
+            target = f"_bulk_stage_{uuid.uuid4().hex[:12]}"
+            self._execute_held(f"CREATE TEMPORARY TABLE `{target}` AS SELECT {column_list} FROM {table} WHERE 1 = 0")
+        
+        try:
+            with _TSVStream(rows) as stream:
+                loaded = self._execute_held(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {target} CHARACTER SET utf8mb4 ({column_list})",
+                    [stream.path]
+                )
+            
+            # LOCAL loads downgrade bad rows to warnings and skip duplicates; refuse partial loads
+            if loaded != stream.rows_written:
+                raise Exception(
+                    f"LOAD DATA loaded {loaded} of {stream.rows_written} rows: {self._first_warning()}"
+                )
+            
+            if conflict_columns:
+                update_columns = [col for col in columns if col not in conflict_columns] or columns[:1]
+                update_str = ', '.join(f'`{col}` = VALUES(`{col}`)' for col in update_columns)
+                self._execute_held(f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM `{target}`
+                    ON DUPLICATE KEY UPDATE {update_str}
+                """)
+            return loaded
+        finally:
+            if conflict_columns:
+                self._execute_held(f"DROP TEMPORARY TABLE IF EXISTS `{target}`")
+    
+    def _execute_held(self, query: str, params: List[Any] = None) -> int:
+        """Run a statement on the held connection without committing"""
+        with self.connection.cursor() as cursor:
+            return cursor.execute(query, params)
+    
+    def _first_warning(self) -> str:
+        with self.connection.cursor() as cursor:
+            cursor.execute("SHOW WARNINGS LIMIT 1")
+            warning = cursor.fetchone()
+        return warning['Message'] if warning else 'rows were skipped'
+    
+    def iter_query(self, query: str, params: List[Any] = None, chunk_size: int = 1000,
+                   as_dict: bool = True) -> Iterator[Any]:
+        """Stream rows through an unbuffered cursor instead of loading the result client-side"""
+        owns_connection = self.connection is None
+        if owns_connection:
+            self.connect()
+        try:
+            cursor_class = pymysql.cursors.SSDictCursor if as_dict else pymysql.cursors.SSCursor
+            with self.connection.cursor(cursor_class) as cursor:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield from rows
+        finally:
+            if owns_connection:
+                self.disconnect()
     
     def get_test_query(self) -> str:
         """MySQL test query"""
-        return "SELECT 1"                
\ No newline at end of file
+        return "SELECT 1"                
+
+
+class _TSVStream:
+    """
+    Rows encoded in LOAD DATA's default TSV format, exposed as a file path
+    
+    Uses a FIFO fed by a writer thread where the OS supports it, and falls
+    back to a temporary file elsewhere.
+    """
+    
+    def __init__(self, rows: Iterable[Iterable[Any]]):
+        self.rows = rows
+        self.rows_written = 0
+        self.path = None
+        self._directory = None
+        self._writer = None
+        self._error = None
+        self._cancelled = False
+    
+    def __enter__(self) -> '_TSVStream':
+        self._directory = tempfile.mkdtemp(prefix='mysql-bulk-')
+        self.path = os.path.join(self._directory, 'rows.tsv')
+        if hasattr(os, 'mkfifo'):
+            os.mkfifo(self.path, 0o600)
+            self._writer = threading.Thread(target=self._write_pipe, daemon=True)
+            self._writer.start()
+        else:
+            with open(self.path, 'wb') as f:
+                self._write_rows(f)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if self._writer is not None:
+                if self._writer.is_alive():
+                    self._stop_writer()
+                self._writer.join()
+            if self._error is not None and exc_type is None:
+                raise self._error
+        finally:
+            shutil.rmtree(self._directory, ignore_errors=True)
+    
+    def _stop_writer(self) -> None:
+        """The load ended without reading the whole pipe; drain it so the writer can exit"""
+        self._cancelled = True
+        fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            while self._writer.is_alive():
+                try:
+                    os.read(fd, 65536)
+                except BlockingIOError:
+                    pass
+                self._writer.join(0.01)
+        finally:
+            os.close(fd)
+    
+    def _write_pipe(self) -> None:
+        try:
+            with open(self.path, 'wb') as pipe:
+                self._write_rows(pipe)
+        except BrokenPipeError:
+            pass
+        except Exception as e:
+            self._error = e
+    
+    def _write_rows(self, f) -> None:
+        for row in self.rows:
+            if self._cancelled:
+                break
+            f.write(('\t'.join(_tsv_value(value) for value in row) + '\n').encode('utf-8'))
+            self.rows_written += 1
+
+
+def _tsv_value(value: Any) -> str:
+    """One field in LOAD DATA's default format (ESCAPED BY '\\', \\N for NULL)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, datetime):
+        value = value.isoformat(sep=' ')
+    elif isinstance(value, (date, time)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    else:
+        value = str(value)
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+        .replace('\0', '\\0')
+    )
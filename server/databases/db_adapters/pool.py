@@ -0,0 +1,242 @@
+from collections import deque
+from typing import Dict, Any, Tuple
+import logging
+import threading
+import time
+
+from monitoring.metrics import DB_POOL_CONNECTIONS, DB_POOL_WAIT_SECONDS, DB_POOL_TIMEOUTS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Every pooled connection stayed checked out for pool_timeout seconds"""
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of driver connections for one DatabaseConnection
+    
+    Up to pool_size connections stay open between checkouts; under load up to
+    max_overflow more are opened and closed again when returned. With all of
+    them in use, a checkout waits up to `timeout` seconds. Connections idle for
+    IDLE_SECONDS or open for RECYCLE_SECONDS are closed instead of reused, so a
+    server-side idle timeout never hands out a dead connection.
+    
+    Connections are opened by a throwaway unpooled adapter, so the adapter's own
+    connect() (and its connect metrics) stays the single place that dials out.
+    """
+    
+    IDLE_SECONDS = 300
+    RECYCLE_SECONDS = 1800
+    
+    def __init__(self, adapter_class: type, config: Dict[str, Any], pool_size: int = 5,
+                 max_overflow: int = 10, timeout: float = 30, version: Any = None):
+        self.adapter_class = adapter_class
+        self.config = config
+        self.db_type = adapter_class.db_type
+        self.pool_size = max(pool_size, 0)
+        self.capacity = max(self.pool_size + max(max_overflow, 0), 1)
+        self.timeout = timeout
+        # Sizing as given, to tell whether an edited DatabaseConnection changed it
+        self.sizing = (pool_size, max_overflow, timeout)
+        # What the pool was built from (DatabaseConnection.updated_at)
+        self.version = version
+        
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, opened_at, returned_at); most recently returned on the right
+        self._opened_at: Dict[int, float] = {}  # id(connection) -> opened_at, while checked out
+        self._in_use = 0
+        self._shared = None
+        self._closed = False
+        self._published = (0, 0)
+    
+    def acquire(self) -> Any:
+        """Check out a connection, opening one if the pool has room"""
+        if self.adapter_class.shares_pooled_connection:
+            return self._acquire_shared()
+        
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+        stale = []
+        connection = None
+        try:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise Exception("Connection pool is closed")
+                    
+                    # Most recently returned first: the one most likely still alive
+                    while self._idle and connection is None:
+                        candidate, opened_at, returned_at = self._idle.pop()
+                        if self._expired(opened_at, returned_at) or not self.adapter_class._pooled_connection_usable(candidate):
+                            stale.append(candidate)
+                            continue
+                        connection = candidate
+                        self._opened_at[id(connection)] = opened_at
+                    
+                    if connection is not None or self._in_use + len(self._idle) < self.capacity:
+                        # Reserve the slot now; a new connection is opened outside the lock
+                        self._in_use += 1
+                        self._publish()
+                        break
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        DB_POOL_TIMEOUTS_TOTAL.labels(db_type=self.db_type).inc()
+                        raise PoolTimeout(
+                            f"No {self.db_type} connection became free within {self.timeout}s "
+                            f"({self.capacity} in use)"
+                        )
+                    self._lock.wait(remaining)
+        finally:
+            self._close_all(stale)
+        
+        if connection is None:
+            try:
+                connection = self._open()
+            except Exception:
+                with self._lock:
+                    self._in_use -= 1
+                    self._publish()
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._opened_at[id(connection)] = time.monotonic()
+        
+        DB_POOL_WAIT_SECONDS.labels(db_type=self.db_type).observe(time.perf_counter() - start)
+        return connection
+    
+    def release(self, connection: Any, discard: bool = False) -> None:
+        """Return a checked-out connection; it is reset, or closed if it can't be kept"""
+        if self.adapter_class.shares_pooled_connection:
+            return
+        
+        if not discard:
+            try:
+                # Never hand the next borrower an open or aborted transaction
+                self.adapter_class._reset_pooled_connection(connection)
+            except Exception as e:
+                logger.info(f"Discarding {self.db_type} connection that failed to reset: {str(e)}")
+                discard = True
+        
+        now = time.monotonic()
+        to_close = []
+        with self._lock:
+            opened_at = self._opened_at.pop(id(connection), now)
+            self._in_use -= 1
+            if discard or self._closed or len(self._idle) >= self.pool_size or self._expired(opened_at, now):
+                to_close.append(connection)
+            else:
+                self._idle.append((connection, opened_at, now))
+            
+            # Oldest returns are on the left
+            while self._idle and now - self._idle[0][2] >= self.IDLE_SECONDS:
+                to_close.append(self._idle.popleft()[0])
+            
+            self._publish()
+            self._lock.notify()
+        self._close_all(to_close)
+    
+    def dispose(self) -> None:
+        """Close idle connections now and checked-out ones as they are returned"""
+        with self._lock:
+            self._closed = True
+            to_close = [entry[0] for entry in self._idle]
+            self._idle.clear()
+            if self._shared is not None:
+                to_close.append(self._shared)
+                self._shared = None
+            self._publish()
+            self._lock.notify_all()
+        self._close_all(to_close)
+    
+    def _acquire_shared(self) -> Any:
+        """One connection for every borrower, for drivers that pool internally (MongoClient)"""
+        with self._lock:
+            if self._closed:
+                raise Exception("Connection pool is closed")
+            if self._shared is None:
+                self._shared = self._open()
+            return self._shared
+    
+    def _open(self) -> Any:
+        adapter = self.adapter_class(self.config)
+        adapter.connect()
+        return adapter.connection
+    
+    def _expired(self, opened_at: float, returned_at: float) -> bool:
+        now = time.monotonic()
+        return now - opened_at >= self.RECYCLE_SECONDS or now - returned_at >= self.IDLE_SECONDS
+    
+    def _close_all(self, connections) -> None:
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+    
+    def _publish(self) -> None:
+        """Move the pool gauges by this pool's change since the last publish (call under the lock)"""
+        idle, in_use = len(self._idle), self._in_use
+        DB_POOL_CONNECTIONS.labels(db_type=self.db_type, state='idle').inc(idle - self._published[0])
+        DB_POOL_CONNECTIONS.labels(db_type=self.db_type, state='in_use').inc(in_use - self._published[1])
+        self._published = (idle, in_use)
+
+
+# Process-wide pools by (DatabaseConnection id, config overrides)
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database, adapter_class: type, overrides: Dict[str, Any] = None) -> ConnectionPool:
+    """
+    Shared pool for a saved DatabaseConnection, rebuilt when it has been edited
+    
+    Pools are looked up by id and matched on updated_at, so the hot path does
+    no decryption. A changed updated_at whose connection settings and pool
+    sizing are the same (e.g. after last_tested was saved) keeps the existing
+    pool.
+    """
+    overrides = overrides or {}
+    key = (database.pk, tuple(sorted(overrides.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+    if pool is not None and pool.version == database.updated_at:
+        return pool
+    
+    config = {**database.get_adapter_config(), **overrides}
+    sizing = (database.pool_size, database.max_overflow, database.pool_timeout)
+    stale = None
+    with _pools_lock:
+        current = _pools.get(key)
+        if current is not None and (
+            current.version == database.updated_at
+            or (current.config == config and current.sizing == sizing)
+        ):
+            current.version = database.updated_at
+            return current
+        
+        pool = ConnectionPool(
+            adapter_class,
+            config,
+            pool_size=database.pool_size,
+            max_overflow=database.max_overflow,
+            timeout=database.pool_timeout,
+            version=database.updated_at
+        )
+        stale, _pools[key] = current, pool
+    
+    if stale is not None:
+        stale.dispose()
+    return pool
+
+
+def dispose_pools(database_id: int) -> None:
+    """Close every pool of a DatabaseConnection, e.g. after it is deleted"""
+    with _pools_lock:
+        keys = [key for key in _pools if key[0] == database_id]
+        pools = [_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.dispose()
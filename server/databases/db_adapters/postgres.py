@@ -1,40 +1,67 @@
 import psycopg2
 import psycopg2.extras
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Iterator, Iterable
+import re
+import uuid
+import weakref
 from .base import DatabaseAdapter
 
+# PREPAREd statements outlive a pool checkout, so their names follow the connection
+_prepared_by_connection = weakref.WeakKeyDictionary()
+
 
 class PostgreSQLAdapter(DatabaseAdapter):
     
+    db_type = 'postgresql'
+    
+    # Statements sent per round trip by execute_many/execute_batch
+    BATCH_PAGE_SIZE = 100
+    
+    def __init__(self, connection_config: Dict[str, Any]):
+        super().__init__(connection_config)
+        # Statement text -> name of the statement PREPAREd on the current connection
+        self._prepared_statements: Dict[str, str] = {}
+    
     def connect(self) -> None:
         """Establish PostgreSQL connection"""
-        try:
-            self.connection = psycopg2.connect(
-                host=self.config['host'],
-                port=self.config['port'],
-                database=self.config['database'],
-                user=self.config['username'],
-                password=self.config['password'],
-                connect_timeout=10,
-                options=f"-c search_path={self.config.get('schema', 'public')}" if self.config.get('schema') else ""
-            )
-        except psycopg2.OperationalError as e:
-            if "password authentication failed" in str(e):
-                raise Exception("Authentication failed: Invalid username or password")
-            elif "could not connect to server" in str(e):
-                raise Exception("Connection failed: Host unreachable or incorrect host/port")
-            elif "database" in str(e) and "does not exist" in str(e):
-                raise Exception(f"Database '{self.config['database']}' does not exist")
-            else:
-                raise Exception(f"Connection error: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+        if self._checkout():
+            self._prepared_statements = _prepared_by_connection.setdefault(self.connection, {})
+            return
+        self._prepared_statements = {}
+        with self._observe_connect():
+            try:
+                self.connection = psycopg2.connect(
+                    host=self.config['host'],
+                    port=self.config['port'],
+                    database=self.config['database'],
+                    user=self.config['username'],
+                    password=self.config['password'],
+                    connect_timeout=10,
+                    options=f"-c search_path={self.config.get('schema', 'public')}" if self.config.get('schema') else ""
+                )
+            except psycopg2.OperationalError as e:
+                if "password authentication failed" in str(e):
+                    raise Exception("Authentication failed: Invalid username or password")
+                elif "could not connect to server" in str(e):
+                    raise Exception("Connection failed: Host unreachable or incorrect host/port")
+                elif "database" in str(e) and "does not exist" in str(e):
+                    raise Exception(f"Database '{self.config['database']}' does not exist")
+                else:
+                    raise Exception(f"Connection error: {str(e)}")
+            except Exception as e:
+                raise Exception(f"Unexpected error: {str(e)}")
     
     def disconnect(self) -> None:
         """Close PostgreSQL connection"""
-        if self.connection:
+        if not self._checkin() and self.connection:
             self.connection.close()
             self.connection = None
+        # Prepared statements live and die with the server session
+        self._prepared_statements = {}
+    
+    @staticmethod
+    def _pooled_connection_usable(connection) -> bool:
+        return connection.closed == 0
     
     def test_connection(self) -> Tuple[bool, str, Dict[str, Any]]:
         """Test PostgreSQL connection"""
@@ -64,89 +91,52 @@ class PostgreSQLAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
-    def get_schema(self) -> Dict[str, Any]:
+    def get_schema(self, table_names: List[str] = None) -> Dict[str, Any]:
         """Get PostgreSQL schema information"""
         schema_info = {"tables": {}}
         
         try:
             self.connect()
             with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                # Get all tables in the schema
-                schema_name = self.config.get('schema', 'public')
+                schema_name = self.config.get('schema') or 'public'
                 
-                cursor.execute("""
-                    SELECT 
-                        table_name,
-                        table_type
-                    FROM information_schema.tables
-                    WHERE table_schema = %s
-                    AND table_type IN ('BASE TABLE', 'VIEW')
-                    ORDER BY table_name
-                """, (schema_name,))
+                # One query for every column in the schema, grouped client-side
+                if self.config.get('options', {}).get('fast_introspection'):
+                    rows = self._fetch_catalog_columns(cursor, schema_name, table_names)
+                else:
+                    rows = self._fetch_information_schema_columns(cursor, schema_name, table_names)
                 
-                tables = cursor.fetchall()
-                
-                for table in tables:
-                    table_name = table['table_name']
-                    schema_info['tables'][table_name] = {
-                        "type": table['table_type'],
+                for row in rows:
+                    table = schema_info['tables'].setdefault(row['table_name'], {
+                        "type": row['table_type'],
                         "columns": []
-                    }
+                    })
                     
-                    # Get columns for each table
-                    cursor.execute("""
-                        SELECT 
-                            c.column_name,
-                            c.data_type,
-                            c.character_maximum_length,
-                            c.numeric_precision,
-                            c.numeric_scale,
-                            c.is_nullable,
-                            c.column_default,
-                            tc.constraint_type
-                        FROM information_schema.columns c
-                        LEFT JOIN information_schema.key_column_usage kcu
-                            ON c.table_schema = kcu.table_schema 
-                            AND c.table_name = kcu.table_name 
-                            AND c.column_name = kcu.column_name
-                        LEFT JOIN information_schema.table_constraints tc
-                            ON kcu.constraint_name = tc.constraint_name
-                            AND kcu.table_schema = tc.table_schema
-                            AND tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY')
-                        WHERE c.table_schema = %s AND c.table_name = %s
-                        ORDER BY c.ordinal_position
-                    """, (schema_name, table_name))
+                    if row['column_name'] is None:
+                        continue
                     
-                    columns = cursor.fetchall()
+                    # A column in several constraints comes back once per constraint
+                    columns = table['columns']
+                    if columns and columns[-1]['name'] == row['column_name']:
+                        column_info = columns[-1]
+                    else:
+                        column_info = self._build_column_info(
+                            name=row['column_name'],
+                            data_type=row['data_type'],
+                            nullable=row['is_nullable'] == 'YES',
+                            default=row['column_default'],
+                            length=row['character_maximum_length'],
+                            precision=row['numeric_precision'],
+                            scale=row['numeric_scale']
+                        )
+                        columns.append(column_info)
                     
-                    for col in columns:
-                        column_info = {
-                            "name": col['column_name'],
-                            "type": col['data_type'],
-                            "nullable": col['is_nullable'] == 'YES',
-                            "default": col['column_default'],
-                            "constraints": []
-                        }
-                        
-                        # Add length/precision info
-                        if col['character_maximum_length']:
-                            column_info['length'] = col['character_maximum_length']
-                        elif col['numeric_precision']:
-                            column_info['precision'] = col['numeric_precision']
-                            if col['numeric_scale']:
-                                column_info['scale'] = col['numeric_scale']
-                        
-                        # Add constraint info
-                        if col['constraint_type'] == 'PRIMARY KEY':
-                            column_info['constraints'].append('PRIMARY KEY')
-                        elif col['constraint_type'] == 'FOREIGN KEY':
-                            column_info['constraints'].append('FOREIGN KEY')
-                        
-                        schema_info['tables'][table_name]['columns'].append(column_info)
+                    if row['constraint_type'] and row['constraint_type'] not in column_info['constraints']:
+                        column_info['constraints'].append(row['constraint_type'])
                 
                 # Get total counts
                 schema_info['summary'] = {
-                    'total_tables': len(tables),
+                    'total_tables': len(schema_info['tables']),
                     'schema_name': schema_name
                 }
                 
@@ -154,17 +144,191 @@ class PostgreSQLAdapter(DatabaseAdapter):
         finally:
             self.disconnect()
     
+    def _fetch_information_schema_columns(self, cursor, schema_name: str, table_names: List[str] = None) -> List[Dict]:
+        """Columns of every table and view in the schema via information_schema"""
+        table_filter = "AND t.table_name = ANY(%s)" if table_names else ""
+        params = [schema_name, list(table_names)] if table_names else [schema_name]
+        
+        cursor.execute(f"""
+            SELECT 
+                t.table_name,
+                t.table_type,
+                c.column_name,
+                c.data_type,
+                c.character_maximum_length,
+                c.numeric_precision,
+                c.numeric_scale,
+                c.is_nullable,
+                c.column_default,
+                tc.constraint_type
+            FROM information_schema.tables t
+            LEFT JOIN information_schema.columns c
+                ON c.table_schema = t.table_schema
+                AND c.table_name = t.table_name
+            LEFT JOIN information_schema.key_column_usage kcu
+                ON c.table_schema = kcu.table_schema 
+                AND c.table_name = kcu.table_name 
+                AND c.column_name = kcu.column_name
+            LEFT JOIN information_schema.table_constraints tc
+                ON kcu.constraint_name = tc.constraint_name
+                AND kcu.table_schema = tc.table_schema
+                AND kcu.table_name = tc.table_name
+                AND tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY')
+            WHERE t.table_schema = %s
+            AND t.table_type IN ('BASE TABLE', 'VIEW')
+            {table_filter}
+            ORDER BY t.table_name, c.ordinal_position, tc.constraint_type DESC
+        """, params)
+        return cursor.fetchall()
+    
+    def _fetch_catalog_columns(self, cursor, schema_name: str, table_names: List[str] = None) -> List[Dict]:
+        """
+        Same rows as _fetch_information_schema_columns, read from pg_catalog
+        
+        Skips the privilege checks and view layers of information_schema, which
+        is noticeably faster on databases with thousands of tables.
+        """
+        table_filter = "AND cls.relname = ANY(%s)" if table_names else ""
+        params = [schema_name, list(table_names)] if table_names else [schema_name]
+        
+        cursor.execute(f"""
+            SELECT 
+                cls.relname AS table_name,
+                CASE cls.relkind WHEN 'v' THEN 'VIEW' ELSE 'BASE TABLE' END AS table_type,
+                a.attname AS column_name,
+                format_type(a.atttypid, NULL) AS data_type,
+                information_schema._pg_char_max_length(a.atttypid, a.atttypmod) AS character_maximum_length,
+                information_schema._pg_numeric_precision(a.atttypid, a.atttypmod) AS numeric_precision,
+                information_schema._pg_numeric_scale(a.atttypid, a.atttypmod) AS numeric_scale,
+                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+                pg_get_expr(d.adbin, d.adrelid) AS column_default,
+                CASE con.contype WHEN 'p' THEN 'PRIMARY KEY' WHEN 'f' THEN 'FOREIGN KEY' END AS constraint_type
+            FROM pg_catalog.pg_class cls
+            JOIN pg_catalog.pg_namespace n ON n.oid = cls.relnamespace
+            LEFT JOIN pg_catalog.pg_attribute a
+                ON a.attrelid = cls.oid
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+            LEFT JOIN pg_catalog.pg_attrdef d
+                ON d.adrelid = a.attrelid
+                AND d.adnum = a.attnum
+            LEFT JOIN pg_catalog.pg_constraint con
+                ON con.conrelid = cls.oid
+                AND con.contype IN ('p', 'f')
+                AND a.attnum = ANY(con.conkey)
+            WHERE n.nspname = %s
+            AND cls.relkind IN ('r', 'p', 'v')
+            {table_filter}
+            ORDER BY cls.relname, a.attnum, con.contype DESC
+        """, params)
+        return cursor.fetchall()
+    
+    def get_schema_versions(self, table_names: List[str] = None) -> Optional[Dict[str, str]]:
+        """Fingerprint tables by the xmin of their pg_class and pg_attribute rows"""
+        # Catalog rows are rewritten (new xmin) by CREATE/ALTER on the table or its columns
+        table_filter = "AND cls.relname = ANY(%s)" if table_names else ""
+        schema_name = self.config.get('schema') or 'public'
+        params = [schema_name, list(table_names)] if table_names else [schema_name]
+        
+        rows = self.execute_query(f"""
+            SELECT 
+                cls.relname AS table_name,
+                cls.xmin::text || '.' || COALESCE(MAX(a.xmin::text::bigint), 0)::text
+                    || '.' || COUNT(a.attnum)::text AS version
+            FROM pg_catalog.pg_class cls
+            JOIN pg_catalog.pg_namespace n ON n.oid = cls.relnamespace
+            LEFT JOIN pg_catalog.pg_attribute a
+                ON a.attrelid = cls.oid
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+            WHERE n.nspname = %s
+            AND cls.relkind IN ('r', 'p', 'v')
+            {table_filter}
+            GROUP BY cls.relname, cls.xmin
+        """, params)
+        return {row['table_name']: row['version'] for row in rows}
+    
     def execute_query(self, query: str, params: List[Any] = None) -> Any:
         """Execute a query and return results"""
-        try:
+        # Reuse a held connection so the statement joins the caller's transaction
+        owns_connection = self.connection is None
+        if owns_connection:
             self.connect()
+        try:
             with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                 cursor.execute(query, params)
-                if cursor.description:
-                    return cursor.fetchall()
-                return cursor.rowcount
+                result = cursor.fetchall() if cursor.description else cursor.rowcount
+            if owns_connection:
+                self.connection.commit()
+            return result
         finally:
-            self.disconnect()
+            if owns_connection:
+                self.disconnect()
+    
+    def execute_statement(self, query: str, params: List[Any] = None) -> Any:
+        """Execute a write through a server-side prepared statement on the held connection"""
+        if self.connection is None:
+            # A one-off connection would be closed before the plan could be reused
+            return self.execute_query(query, params)
+        
+        params = list(params or [])
+        name = self._prepared_statements.get(query)
+        with self.connection.cursor() as cursor:
+            if name is None:
+                name = f"stmt_{len(self._prepared_statements) + 1}"
+                cursor.execute(f"PREPARE {name} AS {self._numbered_placeholders(query)}")
+                self._prepared_statements[query] = name
+            
+            if params:
+                cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+            return cursor.rowcount
+    
+    def execute_many(self, query: str, params_seq: Iterable[List[Any]]) -> int:
+        """Send parameter sets BATCH_PAGE_SIZE statements per round trip with psycopg2's execute_batch"""
+        params_list = [list(params) for params in params_seq]
+        with self.transaction(), self.connection.cursor() as cursor:
+            psycopg2.extras.execute_batch(cursor, query, params_list, page_size=self.BATCH_PAGE_SIZE)
+        return len(params_list)
+    
+    def execute_batch(self, statements: Iterable[Tuple[str, List[Any]]]) -> int:
+        """Join mixed statements into multi-statement strings of BATCH_PAGE_SIZE each"""
+        executed = 0
+        with self.transaction(), self.connection.cursor() as cursor:
+            page = []
+            for query, params in statements:
+                page.append(cursor.mogrify(query, params))
+                if len(page) == self.BATCH_PAGE_SIZE:
+                    cursor.execute(b'; '.join(page))
+                    executed += len(page)
+                    page = []
+            if page:
+                cursor.execute(b'; '.join(page))
+                executed += len(page)
+        return executed
+    
+    @staticmethod
+    def _numbered_placeholders(query: str) -> str:
+        """Rewrite psycopg2's %s placeholders as PREPARE's $1, $2, ..."""
+        counter = iter(range(1, query.count('%s') + 1))
+        return re.sub(r'%s', lambda _: f'${next(counter)}', query)
+    
+    def iter_query(self, query: str, params: List[Any] = None, chunk_size: int = 1000,
+                   as_dict: bool = True) -> Iterator[Any]:
+        """Stream rows through a named (server-side) cursor"""
+        owns_connection = self.connection is None
+        if owns_connection:
+            self.connect()
+        try:
+            cursor_factory = psycopg2.extras.RealDictCursor if as_dict else None
+            with self.connection.cursor(name=f"iter_{uuid.uuid4().hex}", cursor_factory=cursor_factory) as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(query, params)
+                yield from cursor
+        finally:
+            if owns_connection:
+                self.disconnect()
     
     def get_test_query(self) -> str:
         """PostgreSQL test query"""
@@ -0,0 +1,59 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from databases.models import DatabaseConnection
+from databases.services.monitor import ConnectionMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Probe every database connection on an interval through its connection pool, "
+        "keeping ConnectionHealth (latency percentiles, failure streak) and "
+        "connection_status current. Schedulers skip targets that are failing."
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('database_ids', nargs='*', type=int, help='Connections to probe (default: all)')
+        parser.add_argument('--interval', type=float, default=60, help='Seconds between probe rounds (default 60)')
+        parser.add_argument('--once', action='store_true', help='Probe once and exit')
+        parser.add_argument('--timeout', type=float, default=10, help='Per-probe timeout in seconds (default 10)')
+        parser.add_argument('--concurrency', type=int, default=16, help='Probes in flight at once (default 16)')
+    
+    def handle(self, *args, **options):
+        if options['interval'] <= 0:
+            raise CommandError("--interval must be positive")
+        
+        monitor = ConnectionMonitor(timeout=options['timeout'], concurrency=options['concurrency'])
+        
+        try:
+            while True:
+                started = time.monotonic()
+                # The worker outlives any single DB connection's lifetime
+                close_old_connections()
+                
+                databases = DatabaseConnection.objects.all()
+                if options['database_ids']:
+                    databases = databases.filter(pk__in=options['database_ids'])
+                
+                try:
+                    summary = monitor.run_once(databases)
+                except Exception:
+                    # e.g. the app database is briefly unreachable; try again next round
+                    logger.exception("Probe round failed")
+                else:
+                    self.stdout.write(
+                        f"Probed {summary['total']} connection(s): {summary['successful']} ok, "
+                        f"{summary['failed']} failed ({summary['timed_out']} timed out), "
+                        f"{summary['failing']} failing; p95 {summary['latency_ms']['p95']} ms"
+                    )
+                
+                if options['once']:
+                    return
+                time.sleep(max(options['interval'] - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped")
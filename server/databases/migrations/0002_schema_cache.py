@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('databases', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='databaseconnection',
+            name='schema_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='databaseconnection',
+            name='schema_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='SchemaCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table_name', models.CharField(max_length=255)),
+                ('schema', models.JSONField(blank=True, default=dict)),
+                ('version', models.CharField(blank=True, default='', max_length=64)),
+                ('fetched_at', models.DateTimeField()),
+                ('checked_at', models.DateTimeField()),
+                ('database', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schema_entries', to='databases.databaseconnection')),
+            ],
+            options={
+                'ordering': ['table_name'],
+                'unique_together': {('database', 'table_name')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('databases', '0002_schema_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConnectionHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_at', models.DateTimeField(blank=True, null=True)),
+                ('is_healthy', models.BooleanField(null=True)),
+                ('failure_streak', models.IntegerField(default=0)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_failure_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('recent_latencies_ms', models.JSONField(blank=True, default=list)),
+                ('latency_p50_ms', models.FloatField(blank=True, null=True)),
+                ('latency_p95_ms', models.FloatField(blank=True, null=True)),
+                ('latency_p99_ms', models.FloatField(blank=True, null=True)),
+                ('probes_total', models.IntegerField(default=0)),
+                ('failures_total', models.IntegerField(default=0)),
+                ('database', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='health', to='databases.databaseconnection')),
+            ],
+            options={
+                'verbose_name_plural': 'connection health',
+            },
+        ),
+    ]
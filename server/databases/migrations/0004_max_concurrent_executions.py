@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('databases', '0003_connection_health'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='databaseconnection',
+            name='max_concurrent_executions',
+            field=models.PositiveIntegerField(blank=True, default=4, null=True),
+        ),
+    ]
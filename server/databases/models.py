@@ -1,9 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
 from cryptography.fernet import Fernet
+from collections import OrderedDict
+from datetime import timedelta
 import os
 import json
+import threading
+import time
 from django.conf import settings
+from django.utils import timezone
 
 # Use a fixed key from environment or generate one ONCE and save it
 ENCRYPTION_KEY = os.environ.get('DB_ENCRYPTION_KEY')
@@ -16,6 +21,32 @@ else:
 
 cipher = Fernet(ENCRYPTION_KEY)
 
+# Decrypted credentials by ciphertext, so adapters built repeatedly for the same
+# connection skip Fernet (HMAC + AES) after the first read. Plaintext stays in
+# process memory for at most CREDENTIAL_CACHE_SECONDS.
+CREDENTIAL_CACHE_SECONDS = 300
+CREDENTIAL_CACHE_SIZE = 1024
+_credential_cache = OrderedDict()
+_credential_cache_lock = threading.Lock()
+
+
+def decrypt_credential(ciphertext: str) -> str:
+    """Decrypt a stored credential, memoised per ciphertext for a short TTL"""
+    now = time.monotonic()
+    with _credential_cache_lock:
+        cached = _credential_cache.get(ciphertext)
+        if cached and cached[1] > now:
+            _credential_cache.move_to_end(ciphertext)
+            return cached[0]
+    
+    plaintext = cipher.decrypt(ciphertext.encode()).decode()
+    with _credential_cache_lock:
+        _credential_cache[ciphertext] = (plaintext, now + CREDENTIAL_CACHE_SECONDS)
+        _credential_cache.move_to_end(ciphertext)
+        while len(_credential_cache) > CREDENTIAL_CACHE_SIZE:
+            _credential_cache.popitem(last=False)
+    return plaintext
+
 
 class DatabaseConnection(models.Model):
     DB_TYPES = [
@@ -59,11 +90,14 @@ class DatabaseConnection(models.Model):
     ssl_enabled = models.BooleanField(default=False)
     connection_options = models.JSONField(default=dict, blank=True)
     
-    # Pooling Settings (placeholders for future)
+    # Pooling Settings
     pool_size = models.IntegerField(default=5)
     max_overflow = models.IntegerField(default=10)
     pool_timeout = models.IntegerField(default=30)
     
+    # Mapping executions allowed to write to this database at once (blank: no limit)
+    max_concurrent_executions = models.PositiveIntegerField(null=True, blank=True, default=4)
+    
     # Metadata
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='database_connections')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -75,6 +109,8 @@ class DatabaseConnection(models.Model):
     # Schema cache
     cached_schema = models.JSONField(default=dict, blank=True)
     schema_updated_at = models.DateTimeField(null=True, blank=True)
+    schema_version = models.CharField(max_length=64, blank=True, default='')  # DDL fingerprint of cached_schema
+    schema_checked_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
@@ -84,29 +120,88 @@ class DatabaseConnection(models.Model):
     
     @property
     def username(self):
-        if self._username:
-            return cipher.decrypt(self._username.encode()).decode()
-        return ''
+        return self._decrypted('_username')
     
     @username.setter
     def username(self, value):
-        if value:
-            self._username = cipher.encrypt(value.encode()).decode()
-        else:
-            self._username = ''
+        self._encrypt('_username', value)
     
     @property
     def password(self):
-        if self._password:
-            return cipher.decrypt(self._password.encode()).decode()
-        return ''
+        return self._decrypted('_password')
     
     @password.setter
     def password(self, value):
-        if value:
-            self._password = cipher.encrypt(value.encode()).decode()
-        else:
-            self._password = ''
+        self._encrypt('_password', value)
+    
+    def _decrypted(self, field):
+        """Plaintext of an encrypted field, memoised on the instance until the ciphertext changes"""
+        ciphertext = getattr(self, field)
+        if not ciphertext:
+            return ''
+        memo = self.__dict__.setdefault('_credential_memo', {})
+        cached = memo.get(field)
+        if cached and cached[0] == ciphertext:
+            return cached[1]
+        plaintext = decrypt_credential(ciphertext)
+        memo[field] = (ciphertext, plaintext)
+        return plaintext
+    
+    def _encrypt(self, field, value):
+        if not value:
+            setattr(self, field, '')
+            return
+        ciphertext = cipher.encrypt(value.encode()).decode()
+        setattr(self, field, ciphertext)
+        self.__dict__.setdefault('_credential_memo', {})[field] = (ciphertext, value)
+    
+    def __getstate__(self):
+        # Keep decrypted credentials out of pickles (e.g. Django's cache)
+        state = super().__getstate__()
+        state.pop('_credential_memo', None)
+        return state
+    
+    def get_adapter_config(self):
+        """Connection config dict shared by every database adapter"""
+        config = {
+            'host': self.host,
+            'port': self.port,
+            'database': self.database,
+            'schema': self.schema,
+            'username': self.username,
+            'password': self.password,
+            'ssl_enabled': self.ssl_enabled,
+            'options': self.connection_options
+        }
+        
+        if self.db_type == 'mongodb':
+            config['mongodb_connection_type'] = self.mongodb_connection_type
+        
+        return config
+    
+    def get_adapter(self, pooled=True, **config_overrides):
+        """
+        Database adapter for this connection
+        
+        Saved connections share a process-wide pool (sized by pool_size,
+        max_overflow and pool_timeout) per id and updated_at, so connect() and
+        disconnect() borrow pooled connections and the config is only decrypted
+        when the connection changes. Adapters hold per-caller state, so each call
+        returns a new instance bound to that pool. Set connection_options.pooling
+        to false, or pass pooled=False, to dial a fresh connection instead.
+        config_overrides (e.g. local_infile) get a pool of their own.
+        """
+        from .db_adapters.factory import DatabaseAdapterFactory
+        from .db_adapters.pool import get_pool
+        
+        adapter_class = DatabaseAdapterFactory.get_adapter_class(self.db_type)
+        if not pooled or self.pk is None or self.connection_options.get('pooling') is False:
+            return adapter_class({**self.get_adapter_config(), **config_overrides})
+        
+        pool = get_pool(self, adapter_class, config_overrides)
+        adapter = adapter_class(pool.config)
+        adapter.pool = pool
+        return adapter
     
     def get_connection_string(self):
         """Get database-specific connection string"""
@@ -136,4 +231,74 @@ class DatabaseTestLog(models.Model):
     server_info = models.JSONField(default=dict, blank=True)
     
     class Meta:
-        ordering = ['-tested_at']
\ No newline at end of file
+        ordering = ['-tested_at']
+
+class SchemaCacheEntry(models.Model):
+    """Cached structure of one table/collection, revalidated against its DDL fingerprint"""
+    database = models.ForeignKey(DatabaseConnection, on_delete=models.CASCADE, related_name='schema_entries')
+    table_name = models.CharField(max_length=255)
+    schema = models.JSONField(default=dict, blank=True)
+    version = models.CharField(max_length=64, blank=True, default='')
+    fetched_at = models.DateTimeField()
+    checked_at = models.DateTimeField()
+    
+    class Meta:
+        unique_together = ['database', 'table_name']
+        ordering = ['table_name']
+    
+    def __str__(self):
+        return f"{self.database.name}.{self.table_name}"
+
+
+class ConnectionHealth(models.Model):
+    """
+    Rolling health of a DatabaseConnection, kept up to date by the monitor_connections command
+    
+    One row per connection, overwritten on every probe: the last HISTORY_SIZE
+    latencies (a ring buffer) with their percentiles, plus the current failure
+    streak. Manual tests still write DatabaseTestLog rows; probes don't.
+    """
+    
+    HISTORY_SIZE = 120
+    # Consecutive failed probes before a target counts as failing
+    FAILING_AFTER = 3
+    # A health row older than this says nothing about the target any more
+    STALE_AFTER_SECONDS = 900
+    
+    database = models.OneToOneField(DatabaseConnection, on_delete=models.CASCADE, related_name='health')
+    checked_at = models.DateTimeField(null=True, blank=True)
+    is_healthy = models.BooleanField(null=True)
+    failure_streak = models.IntegerField(default=0)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_failure_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    # Latencies (ms) of the most recent successful probes, oldest first
+    recent_latencies_ms = models.JSONField(default=list, blank=True)
+    latency_p50_ms = models.FloatField(null=True, blank=True)
+    latency_p95_ms = models.FloatField(null=True, blank=True)
+    latency_p99_ms = models.FloatField(null=True, blank=True)
+    
+    probes_total = models.IntegerField(default=0)
+    failures_total = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = 'connection health'
+    
+    def __str__(self):
+        return f"{self.database.name}: {'failing' if self.is_failing else 'ok'}"
+    
+    @property
+    def is_failing(self) -> bool:
+        """Failed FAILING_AFTER probes in a row, the latest one recently"""
+        if self.failure_streak < self.FAILING_AFTER or self.checked_at is None:
+            return False
+        return (timezone.now() - self.checked_at).total_seconds() < self.STALE_AFTER_SECONDS
+    
+    @classmethod
+    def failing_database_ids(cls) -> set:
+        """IDs of connections that currently count as failing, for schedulers to skip"""
+        return set(cls.objects.filter(
+            failure_streak__gte=cls.FAILING_AFTER,
+            checked_at__gte=timezone.now() - timedelta(seconds=cls.STALE_AFTER_SECONDS)
+        ).values_list('database_id', flat=True))
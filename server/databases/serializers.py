@@ -1,9 +1,24 @@
 from rest_framework import serializers
-from .models import DatabaseConnection, DatabaseTestLog
+from .models import DatabaseConnection, DatabaseTestLog, ConnectionHealth
+from .db_adapters.factory import DatabaseAdapterFactory
+
+
+class ConnectionHealthSerializer(serializers.ModelSerializer):
+    is_failing = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = ConnectionHealth
+        fields = [
+            'checked_at', 'is_healthy', 'is_failing', 'failure_streak',
+            'last_success_at', 'last_failure_at', 'last_error',
+            'latency_p50_ms', 'latency_p95_ms', 'latency_p99_ms',
+            'probes_total', 'failures_total'
+        ]
 
 
 class DatabaseConnectionSerializer(serializers.ModelSerializer):
     owner_username = serializers.ReadOnlyField(source='owner.username')
+    health = ConnectionHealthSerializer(read_only=True)
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
     username = serializers.CharField(required=True)
     
@@ -13,15 +28,25 @@ class DatabaseConnectionSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'db_type', 'host', 'port', 
             'database', 'schema', 'username', 'password', 'ssl_enabled',
             'connection_options', 'pool_size', 'max_overflow', 'pool_timeout',
+            'max_concurrent_executions',
             'owner', 'owner_username', 'created_at', 'updated_at', 
             'last_tested', 'connection_status', 'last_error', 
             'cached_schema', 'schema_updated_at', 'mongodb_connection_type',
-            'atlas_connection_string'
+            'atlas_connection_string', 'health'
         ]
         read_only_fields = ['owner', 'created_at', 'updated_at', 'last_tested', 
                           'connection_status', 'last_error', 'cached_schema', 
                           'schema_updated_at']
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Accept database types contributed by adapter plugins as well as the built-in ones
+        labels = dict(DatabaseConnection.DB_TYPES)
+        self.fields['db_type'].choices = [
+            (db_type, labels.get(db_type, db_type))
+            for db_type in DatabaseAdapterFactory.get_supported_types()
+        ]
+    
     def create(self, validated_data):
         validated_data['owner'] = self.context['request'].user
         return super().create(validated_data)
@@ -42,6 +67,13 @@ class DatabaseTestRequestSerializer(serializers.Serializer):
     test_query = serializers.CharField(required=False, allow_blank=True)
 
 
+class DatabaseTestAllRequestSerializer(serializers.Serializer):
+    """Serializer for bulk test requests; without ids every listed connection is tested"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    timeout = serializers.FloatField(required=False, default=10, min_value=0.5, max_value=60)
+    concurrency = serializers.IntegerField(required=False, default=16, min_value=1, max_value=32)
+
+
 class DatabaseTestLogSerializer(serializers.ModelSerializer):
     tested_by_username = serializers.ReadOnlyField(source='tested_by.username')
     database_name = serializers.ReadOnlyField(source='database.name')
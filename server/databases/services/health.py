@@ -0,0 +1,189 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Iterable, Optional
+import logging
+import time
+
+from django.utils import timezone
+
+from databases.models import DatabaseConnection, DatabaseTestLog
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(sorted_values: List[float], rank: int) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list, or None if it is empty"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(rank / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 2)
+
+
+def latency_summary(latencies_ms: Iterable[float]) -> Dict[str, Optional[float]]:
+    """min/max/mean/p50/p95/p99 of a set of latencies, all None when there are none"""
+    latencies = sorted(latencies_ms)
+    return {
+        'min': round(latencies[0], 2) if latencies else None,
+        'max': round(latencies[-1], 2) if latencies else None,
+        'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+    }
+
+
+class HealthCheck:
+    """
+    Test many DatabaseConnections concurrently, as the single-connection test action does
+
+    Every connection is probed with adapter.test_connection() from a thread pool,
+    on a fresh connection by default or a pooled one with pooled=True. A probe
+    still running `timeout` seconds after it started is reported as timed out and
+    its thread is left to finish in the background (drivers give up on their own
+    connect timeout). run() writes results back with one bulk_create of
+    DatabaseTestLog rows and one bulk_update of the connections' status fields.
+    """
+
+    DEFAULT_TIMEOUT_SECONDS = 10
+    DEFAULT_CONCURRENCY = 16
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_SECONDS, concurrency: int = DEFAULT_CONCURRENCY,
+                 pooled: bool = False):
+        self.timeout = timeout
+        self.concurrency = max(concurrency, 1)
+        self.pooled = pooled
+
+    def run(self, databases: Iterable[DatabaseConnection], tested_by) -> Dict[str, Any]:
+        """Probe, record and summarize; returns {'results': [...], 'summary': {...}}"""
+        databases = list(databases)
+        start = time.perf_counter()
+        probes = self.probe(databases)
+        wall_time_ms = int((time.perf_counter() - start) * 1000)
+
+        test_logs = self._record(databases, probes, tested_by)
+
+        return {
+            'results': [
+                {
+                    'database_id': database.id,
+                    'name': database.name,
+                    'db_type': database.db_type,
+                    'success': probe['success'],
+                    'timed_out': probe['timed_out'],
+                    'message': probe['message'],
+                    'server_info': probe['server_info'],
+                    'response_time_ms': probe['response_time_ms'],
+                    'test_log_id': test_log.id
+                }
+                for database, probe, test_log in zip(databases, probes, test_logs)
+            ],
+            'summary': self.summarize(probes, wall_time_ms)
+        }
+
+    def probe(self, databases: List[DatabaseConnection]) -> List[Dict[str, Any]]:
+        """Run test_connection() for each database concurrently; results in input order"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(databases)
+        test_queries: List[str] = [''] * len(databases)
+        started: Dict[int, float] = {}
+        futures = {}
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(min(self.concurrency, len(databases)), 1),
+            thread_name_prefix='db-health'
+        )
+        try:
+            for index, database in enumerate(databases):
+                # Credentials are decrypted here, so worker threads never touch the ORM
+                try:
+                    adapter = database.get_adapter(pooled=self.pooled)
+                except Exception as e:
+                    results[index] = self._result(False, str(e))
+                    continue
+                test_queries[index] = adapter.get_test_query()
+                futures[executor.submit(self._probe, adapter, index, started)] = index
+
+            pending = set(futures)
+            while pending:
+                now = time.monotonic()
+                expired = {
+                    future for future in pending
+                    if futures[future] in started and now - started[futures[future]] >= self.timeout
+                }
+                for future in expired:
+                    results[futures[future]] = self._result(
+                        False,
+                        f"Timed out after {self.timeout:g}s",
+                        response_time_ms=int(self.timeout * 1000),
+                        timed_out=True
+                    )
+                pending -= expired
+                if not pending:
+                    break
+
+                # Wake up for the next completion or the next probe to run out of time
+                deadlines = [started[futures[future]] + self.timeout for future in pending if futures[future] in started]
+                next_check = min(deadlines) - now if deadlines else self.timeout
+                done, pending = wait(pending, timeout=max(next_check, 0.01), return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+        finally:
+            # Don't wait for probes that timed out
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for result, test_query in zip(results, test_queries):
+            result['test_query'] = test_query
+        return results
+
+    def _probe(self, adapter, index: int, started: Dict[int, float]) -> Dict[str, Any]:
+        """Worker: one test_connection()"""
+        started[index] = time.monotonic()
+        start_time = time.perf_counter()
+        try:
+            success, message, server_info = adapter.test_connection()
+        except Exception as e:
+            success, message, server_info = False, str(e), {}
+        response_time_ms = int((time.perf_counter() - start_time) * 1000)
+        return self._result(success, message, server_info, response_time_ms)
+
+    def _result(self, success: bool, message: str, server_info: Dict = None, response_time_ms: int = 0,
+                timed_out: bool = False) -> Dict[str, Any]:
+        return {
+            'success': success,
+            'message': message,
+            'server_info': server_info or {},
+            'response_time_ms': response_time_ms,
+            'timed_out': timed_out
+        }
+
+    def _record(self, databases: List[DatabaseConnection], probes: List[Dict[str, Any]], tested_by) -> List[DatabaseTestLog]:
+        """Update each connection's status and write its DatabaseTestLog, in two queries"""
+        tested_at = timezone.now()
+        for database, probe in zip(databases, probes):
+            database.last_tested = tested_at
+            database.connection_status = 'active' if probe['success'] else 'failed'
+            database.last_error = probe['message'] if not probe['success'] else ''
+        DatabaseConnection.objects.bulk_update(databases, ['last_tested', 'connection_status', 'last_error'])
+
+        return DatabaseTestLog.objects.bulk_create([
+            DatabaseTestLog(
+                database=database,
+                tested_by=tested_by,
+                is_successful=probe['success'],
+                error_message=probe['message'] if not probe['success'] else '',
+                response_time_ms=probe['response_time_ms'],
+                test_query=probe['test_query'],
+                server_info=probe['server_info']
+            )
+            for database, probe in zip(databases, probes)
+        ])
+
+    def summarize(self, probes: List[Dict[str, Any]], wall_time_ms: int = None) -> Dict[str, Any]:
+        """Counts plus latency stats of the successful probes"""
+        successful = [probe for probe in probes if probe['success']]
+        return {
+            'total': len(probes),
+            'successful': len(successful),
+            'failed': len(probes) - len(successful),
+            'timed_out': sum(1 for probe in probes if probe['timed_out']),
+            'latency_ms': latency_summary(probe['response_time_ms'] for probe in successful),
+            'wall_time_ms': wall_time_ms
+        }
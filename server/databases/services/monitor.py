@@ -0,0 +1,107 @@
+from typing import Dict, List, Any, Iterable
+import logging
+
+from django.utils import timezone
+
+from databases.models import DatabaseConnection, ConnectionHealth
+from monitoring.metrics import DB_HEALTH_PROBE_SECONDS, DB_FAILING_CONNECTIONS
+from .health import HealthCheck, percentile
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionMonitor:
+    """
+    Probe DatabaseConnections through their pools and keep their ConnectionHealth current
+
+    Each probe overwrites the connection's single ConnectionHealth row (latency
+    ring buffer, percentiles, failure streak) instead of adding a DatabaseTestLog.
+    connection_status flips to 'failed' only once a target counts as failing, so
+    one dropped probe doesn't mark a connection broken, and back to 'active' on
+    the first successful probe.
+    """
+
+    HEALTH_FIELDS = [
+        'checked_at', 'is_healthy', 'failure_streak', 'last_success_at', 'last_failure_at', 'last_error',
+        'recent_latencies_ms', 'latency_p50_ms', 'latency_p95_ms', 'latency_p99_ms',
+        'probes_total', 'failures_total'
+    ]
+
+    def __init__(self, timeout: float = HealthCheck.DEFAULT_TIMEOUT_SECONDS,
+                 concurrency: int = HealthCheck.DEFAULT_CONCURRENCY):
+        self.health_check = HealthCheck(timeout=timeout, concurrency=concurrency, pooled=True)
+
+    def run_once(self, databases: Iterable[DatabaseConnection] = None) -> Dict[str, Any]:
+        """Probe every connection (or the given ones) once; returns HealthCheck.summarize() plus failing count"""
+        databases = list(DatabaseConnection.objects.all() if databases is None else databases)
+        probes = self.health_check.probe(databases)
+        checked_at = timezone.now()
+
+        existing = {
+            health.database_id: health
+            for health in ConnectionHealth.objects.filter(database__in=databases)
+        }
+        created, updated, status_changed = [], [], []
+        failing_by_type: Dict[str, int] = {}
+
+        for database, probe in zip(databases, probes):
+            health = existing.get(database.id)
+            if health is None:
+                health = ConnectionHealth(database=database)
+                created.append(health)
+            else:
+                updated.append(health)
+            self.record(health, probe, checked_at)
+            self._observe(database, probe)
+
+            failing = health.is_failing
+            failing_by_type[database.db_type] = failing_by_type.get(database.db_type, 0) + int(failing)
+            if probe['success'] and database.connection_status != 'active':
+                database.connection_status, database.last_error = 'active', ''
+                status_changed.append(database)
+            elif failing and database.connection_status != 'failed':
+                database.connection_status, database.last_error = 'failed', probe['message']
+                status_changed.append(database)
+
+        ConnectionHealth.objects.bulk_create(created)
+        ConnectionHealth.objects.bulk_update(updated, self.HEALTH_FIELDS)
+        # bulk_update leaves updated_at alone, so pools built from these connections are kept
+        DatabaseConnection.objects.bulk_update(status_changed, ['connection_status', 'last_error'])
+
+        for db_type, failing in failing_by_type.items():
+            DB_FAILING_CONNECTIONS.labels(db_type=db_type).set(failing)
+
+        return {
+            **self.health_check.summarize(probes),
+            'failing': sum(failing_by_type.values())
+        }
+
+    def record(self, health: ConnectionHealth, probe: Dict[str, Any], checked_at) -> None:
+        """Fold one probe result into a ConnectionHealth (not saved)"""
+        health.checked_at = checked_at
+        health.is_healthy = probe['success']
+        health.probes_total += 1
+
+        if probe['success']:
+            health.failure_streak = 0
+            health.last_success_at = checked_at
+            health.last_error = ''
+            latencies = (health.recent_latencies_ms + [probe['response_time_ms']])[-ConnectionHealth.HISTORY_SIZE:]
+            health.recent_latencies_ms = latencies
+            ordered = sorted(latencies)
+            health.latency_p50_ms = percentile(ordered, 50)
+            health.latency_p95_ms = percentile(ordered, 95)
+            health.latency_p99_ms = percentile(ordered, 99)
+        else:
+            health.failure_streak += 1
+            health.failures_total += 1
+            health.last_failure_at = checked_at
+            health.last_error = probe['message']
+
+    def _observe(self, database: DatabaseConnection, probe: Dict[str, Any]) -> None:
+        outcome = 'ok' if probe['success'] else 'timeout' if probe['timed_out'] else 'failed'
+        DB_HEALTH_PROBE_SECONDS.labels(db_type=database.db_type, outcome=outcome).observe(
+            probe['response_time_ms'] / 1000
+        )
+        if not probe['success']:
+            logger.info(f"Health probe of {database.name} ({database.db_type}) failed: {probe['message']}")
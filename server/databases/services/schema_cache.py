@@ -0,0 +1,166 @@
+from typing import Dict, List, Any, Tuple, Optional
+from datetime import timedelta
+import hashlib
+import json
+import logging
+
+from django.utils import timezone
+
+from databases.models import SchemaCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaCache:
+    """
+    Schema lookups for a DatabaseConnection, served from cache while the DDL is unchanged
+
+    The full schema lives on DatabaseConnection.cached_schema and single tables in
+    SchemaCacheEntry rows. A cached value is revalidated at most once per
+    CHECK_INTERVAL_SECONDS by comparing the adapter's schema versions (a cheap
+    catalog query) with the ones stored at introspection time. Adapters without
+    versions (MongoDB) fall back to expiring entries after MAX_AGE_SECONDS.
+    Unsaved connections are never cached.
+    """
+
+    CHECK_INTERVAL_SECONDS = 30
+    MAX_AGE_SECONDS = 3600
+
+    def __init__(self, database, adapter=None):
+        self.database = database
+        self._adapter = adapter
+
+    @property
+    def adapter(self):
+        if self._adapter is None:
+            self._adapter = self.database.get_adapter()
+        return self._adapter
+
+    def get_schema(self, refresh: bool = False) -> Tuple[Dict[str, Any], bool]:
+        """Full schema of the connection; returns (schema, from_cache)"""
+        database = self.database
+        if database.pk is None:
+            return self.adapter.get_schema(), False
+
+        if not refresh and database.cached_schema and database.schema_updated_at:
+            if self._is_fresh(database.schema_checked_at or database.schema_updated_at,
+                              database.schema_updated_at, database.schema_version,
+                              self._current_fingerprint):
+                self._touch_database()
+                return database.cached_schema, True
+
+        # Read versions before introspecting, so a concurrent DDL change is
+        # seen as stale on the next check rather than cached as current
+        versions = self.adapter.get_schema_versions()
+        schema = self.adapter.get_schema()
+        now = timezone.now()
+
+        database.cached_schema = schema
+        database.schema_version = self._fingerprint(versions)
+        database.schema_updated_at = now
+        database.schema_checked_at = now
+        database.save(update_fields=['cached_schema', 'schema_version', 'schema_updated_at', 'schema_checked_at'])
+
+        self._store_tables(schema, versions, now)
+        return schema, False
+
+    def get_table_schema(self, table_name: str, refresh: bool = False) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """One table/collection, or None if it does not exist; returns (schema, from_cache)"""
+        database = self.database
+        if database.pk is None:
+            return self.adapter.get_table_schema(table_name), False
+
+        entry = SchemaCacheEntry.objects.filter(database=database, table_name=table_name).first()
+        if entry and not refresh:
+            def current_version():
+                versions = self.adapter.get_schema_versions([table_name])
+                return None if versions is None else versions.get(table_name, '')
+
+            if self._is_fresh(entry.checked_at, entry.fetched_at, entry.version, current_version):
+                SchemaCacheEntry.objects.filter(pk=entry.pk).update(checked_at=timezone.now())
+                return entry.schema, True
+
+        versions = self.adapter.get_schema_versions([table_name])
+        table_schema = self.adapter.get_table_schema(table_name)
+        if table_schema is None:
+            SchemaCacheEntry.objects.filter(database=database, table_name=table_name).delete()
+            return None, False
+
+        now = timezone.now()
+        SchemaCacheEntry.objects.update_or_create(
+            database=database,
+            table_name=table_name,
+            defaults={
+                'schema': table_schema,
+                'version': (versions or {}).get(table_name, ''),
+                'fetched_at': now,
+                'checked_at': now,
+            }
+        )
+        return table_schema, False
+
+    def invalidate(self, table_name: str = None) -> None:
+        """Drop cached schema for one table, or for the whole connection"""
+        entries = SchemaCacheEntry.objects.filter(database=self.database)
+        if table_name:
+            entries.filter(table_name=table_name).delete()
+            return
+        entries.delete()
+        type(self.database).objects.filter(pk=self.database.pk).update(
+            cached_schema={}, schema_version='', schema_updated_at=None, schema_checked_at=None
+        )
+
+    def _is_fresh(self, checked_at, fetched_at, cached_version: str, current_version) -> bool:
+        """Whether a cached value can be served, querying the current version only when due"""
+        now = timezone.now()
+        if now - checked_at < timedelta(seconds=self.CHECK_INTERVAL_SECONDS):
+            return True
+
+        try:
+            version = current_version()
+        except Exception as e:
+            # Can't reach the catalog; keep serving within the TTL
+            logger.warning(f"Schema version check failed for {self.database.name}: {str(e)}")
+            version = None
+
+        if version is None or not cached_version:
+            return now - fetched_at < timedelta(seconds=self.MAX_AGE_SECONDS)
+        return version == cached_version
+
+    def _current_fingerprint(self) -> Optional[str]:
+        versions = self.adapter.get_schema_versions()
+        return None if versions is None else self._fingerprint(versions)
+
+    def _touch_database(self) -> None:
+        now = timezone.now()
+        self.database.schema_checked_at = now
+        type(self.database).objects.filter(pk=self.database.pk).update(schema_checked_at=now)
+
+    def _store_tables(self, schema: Dict[str, Any], versions: Optional[Dict[str, str]], now) -> None:
+        """Refresh per-table entries from a full introspection"""
+        tables = schema.get('tables', schema.get('collections', {}))
+        SchemaCacheEntry.objects.filter(database=self.database).exclude(table_name__in=list(tables)).delete()
+        SchemaCacheEntry.objects.bulk_create(
+            [
+                SchemaCacheEntry(
+                    database=self.database,
+                    table_name=table_name,
+                    schema=table_schema,
+                    version=(versions or {}).get(table_name, ''),
+                    fetched_at=now,
+                    checked_at=now
+                )
+                for table_name, table_schema in tables.items()
+            ],
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['database', 'table_name'],
+            update_fields=['schema', 'version', 'fetched_at', 'checked_at']
+        )
+
+    @staticmethod
+    def _fingerprint(versions: Optional[Dict[str, str]]) -> str:
+        """Single version for the whole schema; also changes when tables are added or dropped"""
+        if versions is None:
+            return ''
+        return hashlib.sha256(json.dumps(versions, sort_keys=True).encode()).hexdigest()
@@ -1,3 +1,78 @@
-from django.test import TestCase
+import asyncio
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from databases.db_adapters.factory import DatabaseAdapterFactory
+
+# (column type, value as an API would send it, value expected back)
+ASYNCPG_CASES = [
+    ('integer', '12', 12),
+    ('integer', 1.5, 2),
+    ('bigint', '9007199254740993', 9007199254740993),
+    ('numeric(8, 2)', '3.456', Decimal('3.46')),
+    ('double precision', '1.5', 1.5),
+    ('boolean', 'true', True),
+    ('boolean', 0, False),
+    ('date', '2024-01-02', date(2024, 1, 2)),
+    ('timestamp', '2024-01-02T03:04:05', datetime(2024, 1, 2, 3, 4, 5)),
+    ('timestamptz', '2024-01-02T03:04:05Z', datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)),
+    ('jsonb', {'a': 1}, '{"a": 1}'),
+    ('text', 5, '5'),
+]
+
+
+@skipUnless(DatabaseAdapterFactory.supports_async('postgresql'), "asyncpg is not installed")
+@skipUnless(settings.DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql', "needs PostgreSQL")
+class AsyncPostgreSQLAdapterTests(SimpleTestCase):
+    """The asyncpg adapter loads values the way psycopg2 does, against the project's PostgreSQL"""
+
+    def setUp(self):
+        database = settings.DATABASES['default']
+        self.adapter = DatabaseAdapterFactory.create_async_adapter('postgresql', {
+            'host': database['HOST'],
+            'port': int(database['PORT']),
+            'database': database['NAME'],
+            'username': database['USER'],
+            'password': database['PASSWORD'],
+        })
+        try:
+            asyncio.run(self._probe())
+        except Exception as e:
+            self.skipTest(f"PostgreSQL is unavailable: {e}")
+
+    def test_execute_many_converts_values_to_the_column_types(self):
+        rows = asyncio.run(self._load([sent for _, sent, _ in ASYNCPG_CASES]))
+        for position, (column_type, sent, expected) in enumerate(ASYNCPG_CASES):
+            with self.subTest(column_type=column_type, sent=sent):
+                self.assertEqual(rows[0][f"c{position}"], expected)
+
+    def test_execute_many_passes_nulls(self):
+        rows = asyncio.run(self._load([None] * len(ASYNCPG_CASES)))
+        self.assertEqual(set(rows[0].values()), {None})
+
+    async def _probe(self):
+        await self.adapter.connect()
+        await self.adapter.disconnect()
+
+    async def _load(self, row):
+        """row written to a temporary table with one column per case, read back"""
+        columns = [f"c{position}" for position in range(len(ASYNCPG_CASES))]
+        await self.adapter.connect()
+        try:
+            async with self.adapter.transaction():
+                await self.adapter.execute_query(
+                    "CREATE TEMPORARY TABLE async_adapter_check ("
+                    + ', '.join(f"{column} {column_type}" for column, (column_type, _, _) in zip(columns, ASYNCPG_CASES))
+                    + ") ON COMMIT DROP"
+                )
+                await self.adapter.execute_many(
+                    f"INSERT INTO async_adapter_check ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                    [row]
+                )
+                return await self.adapter.execute_query("SELECT * FROM async_adapter_check")
+        finally:
+            await self.adapter.disconnect()
@@ -10,9 +10,13 @@ from .serializers import (
     DatabaseConnectionSerializer, 
     DatabaseTestLogSerializer, 
     DatabaseTestRequestSerializer,
+    DatabaseTestAllRequestSerializer,
     DatabaseSchemaSerializer
 )
 from .db_adapters.factory import DatabaseAdapterFactory
+from .db_adapters.pool import dispose_pools
+from .services.schema_cache import SchemaCache
+from .services.health import HealthCheck
 from activities.utils import log_activity
 
 
@@ -22,7 +26,7 @@ class DatabaseConnectionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter databases by owner"""
-        queryset = DatabaseConnection.objects.filter(owner=self.request.user)
+        queryset = DatabaseConnection.objects.filter(owner=self.request.user).select_related('health')
         
         # Search functionality
         search = self.request.query_params.get('search', None)
@@ -52,23 +56,8 @@ class DatabaseConnectionViewSet(viewsets.ModelViewSet):
         serializer = DatabaseTestRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Create adapter
-        config = {
-            'host': database.host,
-            'port': database.port,
-            'database': database.database,
-            'schema': database.schema,
-            'username': database.username,
-            'password': database.password,
-            'ssl_enabled': database.ssl_enabled,
-            'options': database.connection_options
-        }
-        
-        # Add MongoDB-specific config
-        if database.db_type == 'mongodb':
-            config['mongodb_connection_type'] = database.mongodb_connection_type
-        
-        adapter = DatabaseAdapterFactory.create_adapter(database.db_type, config)
+        # Dial a fresh connection; a pooled one would hide connect/auth problems
+        adapter = database.get_adapter(pooled=False)
         
         # Test connection
         start_time = time.time()
@@ -100,55 +89,43 @@ class DatabaseConnectionViewSet(viewsets.ModelViewSet):
             'test_log_id': test_log.id
         })
     
+    @action(detail=False, methods=['post'])
+    def test_all(self, request):
+        """Test all listed connections concurrently (honours the list filters)"""
+        serializer = DatabaseTestAllRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        databases = self.filter_queryset(self.get_queryset())
+        ids = serializer.validated_data.get('ids')
+        if ids:
+            databases = databases.filter(id__in=ids)
+        
+        health_check = HealthCheck(
+            timeout=serializer.validated_data['timeout'],
+            concurrency=serializer.validated_data['concurrency']
+        )
+        return Response(health_check.run(databases, request.user))
+    
     @action(detail=True, methods=['get', 'post'])
     def schema(self, request, pk=None):
-        """Get or refresh database schema"""
+        """Get or refresh database schema; ?table=<name> fetches just that table"""
         database = self.get_object()
         
         # Check if we should refresh schema
         refresh = request.method == 'POST' or request.query_params.get('refresh', False)
         
-        # Use cached schema if available and not refreshing
-        if not refresh and database.cached_schema and database.schema_updated_at:
-            # Check if cache is recent (within last hour)
-            cache_age = timezone.now() - database.schema_updated_at
-            if cache_age.total_seconds() < 3600:  # 1 hour
-                return Response({
-                    **database.cached_schema,
-                    'updated_at': database.schema_updated_at,
-                    'from_cache': True
-                })
-        
-        # Fetch fresh schema
+        table_name = request.query_params.get('table', None)
+        if table_name:
+            return self._table_schema(database, table_name, refresh=bool(refresh))
+        
+        # Cached schema is served until the database reports a DDL change
         try:
-            config = {
-                'host': database.host,
-                'port': database.port,
-                'database': database.database,
-                'schema': database.schema,
-                'username': database.username,
-                'password': database.password,
-                'ssl_enabled': database.ssl_enabled,
-                'options': database.connection_options
-            }
-            
-            # Add MongoDB-specific config
-            if database.db_type == 'mongodb':
-                config['mongodb_connection_type'] = database.mongodb_connection_type
-            
-            adapter = DatabaseAdapterFactory.create_adapter(database.db_type, config)
-            
-            schema_data = adapter.get_schema()
-            
-            # Update cache
-            database.cached_schema = schema_data
-            database.schema_updated_at = timezone.now()
-            database.save()
+            schema_data, from_cache = SchemaCache(database).get_schema(refresh=bool(refresh))
             
             return Response({
                 **schema_data,
                 'updated_at': database.schema_updated_at,
-                'from_cache': False
+                'from_cache': from_cache
             })
         except Exception as e:
             return Response(
@@ -156,6 +133,28 @@ class DatabaseConnectionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    def _table_schema(self, database, table_name, refresh=False):
+        """Look up a single table/collection without introspecting the whole database"""
+        try:
+            table_schema, from_cache = SchemaCache(database).get_table_schema(table_name, refresh=refresh)
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        if table_schema is None:
+            return Response(
+                {'error': f"Table '{table_name}' not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response({
+            'table': table_name,
+            'schema': table_schema,
+            'from_cache': from_cache
+        })
+    
     @action(detail=True, methods=['get'])
     def test_history(self, request, pk=None):
         """Get test history for a database"""
@@ -166,12 +165,11 @@ class DatabaseConnectionViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def types(self, request):
-        """Get supported database types"""
+        """Get supported database types, including adapters registered by plugins"""
+        labels = dict(DatabaseConnection.DB_TYPES)
         return Response([
-            {'value': 'postgresql', 'label': 'PostgreSQL'},
-            {'value': 'mysql', 'label': 'MySQL'},
-            {'value': 'mongodb', 'label': 'MongoDB'},
-            {'value': 'mssql', 'label': 'SQL Server'},
+            {'value': db_type, 'label': labels.get(db_type, db_type)}
+            for db_type in DatabaseAdapterFactory.get_supported_types()
         ])
     
     def perform_create(self, serializer):
@@ -196,7 +194,9 @@ class DatabaseConnectionViewSet(viewsets.ModelViewSet):
         name = instance.name
         db_type = instance.db_type
         host = instance.host
+        database_id = instance.id
         instance.delete()
+        dispose_pools(database_id)
         log_activity(
             activity_type='database_test',
             status='success',
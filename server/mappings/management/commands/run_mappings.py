@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from databases.db_adapters.factory import DatabaseAdapterFactory
+from databases.models import ConnectionHealth
+from mappings.models import DataMapping
+from mappings.services.async_mapping_engine import AsyncMappingEngine
+from mappings.services.execution_queue import ExecutionQueue, ExecutionLimitReached
+from mappings.services.mapping_engine import MappingEngine
+
+
+class Command(BaseCommand):
+    help = (
+        "Execute mappings concurrently on one event loop. PostgreSQL, MySQL and "
+        "MongoDB targets use AsyncMappingEngine when asyncpg, aiomysql or motor is "
+        "installed (optional: pip install -r requirements-async.txt); other targets, "
+        "those without their driver and mappings with use_bulk_load run the "
+        "synchronous engine in a worker thread."
+    )
+    
+    # How often an execution waiting for a concurrency slot checks again
+    ADMIT_POLL_SECONDS = 2
+    
+    def add_arguments(self, parser):
+        parser.add_argument('mapping_ids', nargs='*', type=int, help='Mappings to run')
+        parser.add_argument('--active', action='store_true', help="Run every mapping with status 'active'")
+        parser.add_argument('--concurrency', type=int, default=10, help='Executions in flight at once (default 10)')
+        parser.add_argument(
+            '--include-failing', action='store_true',
+            help='Also run mappings whose database the health monitor reports as failing'
+        )
+    
+    def handle(self, *args, **options):
+        mappings = DataMapping.objects.select_related('api_endpoint', 'database', 'owner')
+        if options['active']:
+            mappings = mappings.filter(status='active')
+        elif options['mapping_ids']:
+            mappings = mappings.filter(pk__in=options['mapping_ids'])
+        else:
+            raise CommandError("Pass mapping IDs or --active")
+        
+        mappings = list(mappings)
+        if not options['include_failing']:
+            failing = ConnectionHealth.failing_database_ids()
+            for mapping in mappings:
+                if mapping.database_id in failing:
+                    self.stderr.write(f"{mapping.name}: skipped - database {mapping.database.name} is failing health checks")
+            mappings = [mapping for mapping in mappings if mapping.database_id not in failing]
+        if not mappings:
+            raise CommandError("No mappings to run")
+        
+        start = time.perf_counter()
+        results = asyncio.run(self._run_all(mappings, max(options['concurrency'], 1)))
+        
+        for mapping, result in zip(mappings, results):
+            if isinstance(result, Exception):
+                self.stderr.write(f"{mapping.name}: failed - {result}")
+            else:
+                self.stdout.write(
+                    f"{mapping.name}: {result['status']} - {result['processed_records']}/"
+                    f"{result['total_records']} records in {result['execution_time_ms']} ms"
+                )
+        self.stdout.write(f"Ran {len(mappings)} mapping(s) in {time.perf_counter() - start:.1f}s")
+    
+    async def _run_all(self, mappings, concurrency: int):
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(mapping):
+            async with semaphore:
+                return await self._run_one(mapping)
+        
+        return await asyncio.gather(*(run(mapping) for mapping in mappings), return_exceptions=True)
+    
+    async def _run_one(self, mapping) -> dict:
+        execution = await self._admit(mapping)
+        
+        # The async engine has no bulk-load path
+        if DatabaseAdapterFactory.supports_async(mapping.database.db_type) and not mapping.use_bulk_load:
+            result = await AsyncMappingEngine(mapping, execution).execute()
+        else:
+            result = await sync_to_async(self._run_sync, thread_sensitive=False)(mapping, execution)
+        
+        mapping.last_run = timezone.now()
+        await mapping.asave(update_fields=['last_run'])
+        return result
+    
+    async def _admit(self, mapping):
+        """Wait for a free slot on the mapping's database and API endpoint"""
+        queue = ExecutionQueue()
+        while True:
+            try:
+                return await sync_to_async(queue.admit)(mapping, mapping.owner)
+            except ExecutionLimitReached:
+                await asyncio.sleep(self.ADMIT_POLL_SECONDS)
+    
+    @staticmethod
+    def _run_sync(mapping, execution) -> dict:
+        try:
+            return MappingEngine(mapping, execution).execute()
+        finally:
+            # Worker threads are reused; don't leave this thread's connection open
+            connection.close()
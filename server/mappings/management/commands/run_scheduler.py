@@ -0,0 +1,63 @@
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from mappings.services.scheduler import MappingScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run active mappings on their cron/interval schedules. Several processes may "
+        "run this command; on PostgreSQL an advisory lock elects one to schedule and "
+        "the others take over if it dies."
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tick', type=float, default=15, help='Seconds between checks for due mappings (default 15)')
+        parser.add_argument('--concurrency', type=int, default=4, help='Executions running at once (default 4)')
+        parser.add_argument('--once', action='store_true', help='Check once, wait for the started executions and exit')
+    
+    def handle(self, *args, **options):
+        if options['tick'] <= 0:
+            raise CommandError("--tick must be positive")
+        
+        scheduler = MappingScheduler(concurrency=options['concurrency'])
+        leading = None
+        try:
+            # Stagger processes started together (e.g. by a deploy) so they don't race for the lock
+            if not options['once']:
+                time.sleep(random.uniform(0, min(options['tick'], 5)))
+            
+            while True:
+                started = time.monotonic()
+                close_old_connections()
+                
+                try:
+                    is_leader = scheduler.acquire_leadership()
+                    if is_leader != leading:
+                        self.stdout.write("Scheduling" if is_leader else "Standing by: another scheduler holds the lock")
+                        leading = is_leader
+                    
+                    if is_leader:
+                        counts = scheduler.tick()
+                        if any(counts.values()):
+                            self.stdout.write(
+                                f"Started {counts['started']}, skipped {counts['skipped']} still running, "
+                                f"delayed {counts['delayed']} with failing targets"
+                            )
+                except Exception:
+                    # e.g. the database is briefly unreachable; try again next tick
+                    logger.exception("Scheduler tick failed")
+                
+                if options['once']:
+                    return
+                time.sleep(max(options['tick'] - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping; waiting for running executions")
+        finally:
+            scheduler.shutdown(wait=True)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datamapping',
+            name='records_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
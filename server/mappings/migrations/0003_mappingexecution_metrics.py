@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0002_datamapping_records_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mappingexecution',
+            name='metrics',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
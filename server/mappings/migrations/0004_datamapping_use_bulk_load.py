@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0003_mappingexecution_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datamapping',
+            name='use_bulk_load',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0004_datamapping_use_bulk_load'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datamapping',
+            name='next_run_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='datamapping',
+            name='schedule_cron',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='datamapping',
+            name='schedule_interval_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='datamapping',
+            name='schedule_jitter_seconds',
+            field=models.PositiveIntegerField(default=30),
+        ),
+    ]
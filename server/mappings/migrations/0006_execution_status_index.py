@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0005_mapping_schedule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mappingexecution',
+            index=models.Index(fields=['status', 'started_at'], name='mappings_ma_status_fd844d_idx'),
+        ),
+    ]
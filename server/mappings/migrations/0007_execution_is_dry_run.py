@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0006_execution_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mappingexecution',
+            name='is_dry_run',
+            field=models.BooleanField(default=False),
+        ),
+    ]
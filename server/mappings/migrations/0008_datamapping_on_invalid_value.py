@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0007_execution_is_dry_run'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datamapping',
+            name='on_invalid_value',
+            field=models.CharField(choices=[('reject', 'Reject the record'), ('coerce', 'Coerce to fit the column')], default='reject', max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0008_datamapping_on_invalid_value'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mappingexecution',
+            name='error_summary',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
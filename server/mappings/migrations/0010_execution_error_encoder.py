@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:46
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0009_execution_error_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mappingexecution',
+            name='error_details',
+            field=models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.AlterField(
+            model_name='mappingexecution',
+            name='error_summary',
+            field=models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_heartbeat(apps, schema_editor):
+    # Rows predating the field last showed life when they completed or started
+    MappingExecution = apps.get_model('mappings', 'MappingExecution')
+    MappingExecution.objects.update(heartbeat_at=Coalesce('completed_at', 'started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mappings', '0010_execution_error_encoder'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='mappingexecution',
+            name='mappings_ma_status_fd844d_idx',
+        ),
+        migrations.AddField(
+            model_name='mappingexecution',
+            name='heartbeat_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_heartbeat, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='mappingexecution',
+            index=models.Index(fields=['status', 'heartbeat_at'], name='mappings_ma_status_f5cad7_idx'),
+        ),
+    ]
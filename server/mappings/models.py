@@ -1,8 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from apis.models import APIEndpoint
 from databases.models import DatabaseConnection
+from datetime import timedelta
+from .utils.cron import parse_cron
 import json
+import random
 
 
 class DataMapping(models.Model):
@@ -12,6 +17,11 @@ class DataMapping(models.Model):
         ('inactive', 'Inactive'),
     ]
     
+    INVALID_VALUE_HANDLING = [
+        ('reject', 'Reject the record'),
+        ('coerce', 'Coerce to fit the column'),
+    ]
+    
     # Basic Information
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -21,6 +31,12 @@ class DataMapping(models.Model):
     database = models.ForeignKey(DatabaseConnection, on_delete=models.CASCADE, related_name='mappings')
     target_table = models.CharField(max_length=255)
     
+    # Where the records live in each API document, e.g. "payload.users" or
+    # "orders[*].lines[*]" (JSONPath starting with '$' also accepted). Parent
+    # fields of fanned-out arrays are available to field mappings as "_parent.*".
+    # Blank falls back to guessing data/results/items/records.
+    records_path = models.CharField(max_length=500, blank=True, default='')
+    
     # Mapping Configuration
     field_mappings = models.JSONField(default=list)  # List of field mapping objects
     """
@@ -40,6 +56,22 @@ class DataMapping(models.Model):
     update_on_conflict = models.BooleanField(default=False)
     conflict_columns = models.JSONField(default=list)  # Columns to check for conflicts
     batch_size = models.IntegerField(default=100)
+    # Load each batch with the database's bulk path (MySQL: LOAD DATA LOCAL INFILE,
+    # SQL Server: bulk copy; others: batched executemany) instead of one INSERT per record
+    use_bulk_load = models.BooleanField(default=False)
+    # Values checked against the target columns' type, length, precision and
+    # nullability before writing: 'reject' fails just that record, 'coerce'
+    # truncates/converts/rounds first and rejects only what still can't fit
+    on_invalid_value = models.CharField(max_length=10, choices=INVALID_VALUE_HANDLING, default='reject')
+    
+    # Schedule: a cron expression (evaluated in TIME_ZONE) or a fixed interval.
+    # run_scheduler starts active mappings once next_run_at has passed; each start
+    # is delayed by a random 0..schedule_jitter_seconds so mappings sharing a
+    # schedule don't all hit their APIs and databases in the same second.
+    schedule_cron = models.CharField(max_length=100, blank=True, default='')
+    schedule_interval_seconds = models.PositiveIntegerField(null=True, blank=True)
+    schedule_jitter_seconds = models.PositiveIntegerField(default=30)
+    next_run_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
     # Metadata
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='data_mappings')
@@ -54,6 +86,25 @@ class DataMapping(models.Model):
     
     def __str__(self):
         return f"{self.name} ({self.api_endpoint.name} → {self.database.name})"
+    
+    @property
+    def is_scheduled(self) -> bool:
+        return bool(self.schedule_cron or self.schedule_interval_seconds)
+    
+    def compute_next_run(self, after=None):
+        """Next scheduled start after `after` (default now), jitter included; None if not scheduled"""
+        if self.status != 'active' or not self.is_scheduled:
+            return None
+        after = timezone.localtime(after or timezone.now())
+        
+        if self.schedule_cron:
+            next_run = parse_cron(self.schedule_cron).next_after(after)
+        else:
+            next_run = after + timedelta(seconds=self.schedule_interval_seconds)
+        
+        if self.schedule_jitter_seconds:
+            next_run += timedelta(seconds=random.uniform(0, self.schedule_jitter_seconds))
+        return next_run
 
 
 class MappingExecution(models.Model):
@@ -68,6 +119,9 @@ class MappingExecution(models.Model):
     executed_by = models.ForeignKey(User, on_delete=models.CASCADE)
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Bumped by every save; the engines save after each batch, so a running
+    # execution whose heartbeat stops was abandoned by a dead worker
+    heartbeat_at = models.DateTimeField(auto_now=True)
     
     # Execution details
     status = models.CharField(max_length=20, choices=EXECUTION_STATUS, default='running')
@@ -77,11 +131,20 @@ class MappingExecution(models.Model):
     
     # Data
     api_response = models.JSONField(default=dict, blank=True)
-    error_details = models.JSONField(default=list, blank=True)
+    # The first and a random sample of the failed records' errors (bounded however
+    # many fail); DjangoJSONEncoder because coerced values may be Decimals
+    error_details = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    # Every error counted by stage/type/message, plus the dead-letter file if one was written
+    error_summary = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
     execution_time_ms = models.IntegerField(null=True, blank=True)
+    metrics = models.JSONField(default=dict, blank=True)  # Per-stage timings and batch latency histogram
+    # Ran the whole pipeline against the target but rolled every write back
+    is_dry_run = models.BooleanField(default=False)
     
     class Meta:
         ordering = ['-started_at']
+        # Running-execution counts for concurrency limits
+        indexes = [models.Index(fields=['status', 'heartbeat_at'])]
 
 
 class TransformationTemplate(models.Model):
@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from django.utils import timezone
 from .models import DataMapping, MappingExecution, TransformationTemplate
 from apis.models import APIEndpoint
 from databases.models import DatabaseConnection
 from apis.serializers import APIEndpointSerializer
 from databases.serializers import DatabaseConnectionSerializer
+from .utils.json_path import compile_records_path
+from .utils.cron import parse_cron
 
 
 class DataMappingSerializer(serializers.ModelSerializer):
@@ -15,17 +18,38 @@ class DataMappingSerializer(serializers.ModelSerializer):
         model = DataMapping
         fields = [
             'id', 'name', 'description', 'api_endpoint', 'api_endpoint_name',
-            'database', 'database_name', 'target_table', 'field_mappings',
-            'update_on_conflict', 'conflict_columns', 'batch_size',
-            'owner', 'owner_username', 'status', 'created_at', 'updated_at',
-            'last_run'
+            'database', 'database_name', 'target_table', 'records_path', 'field_mappings',
+            'update_on_conflict', 'conflict_columns', 'batch_size', 'use_bulk_load',
+            'on_invalid_value', 'owner', 'owner_username', 'status', 'created_at', 'updated_at',
+            'last_run', 'schedule_cron', 'schedule_interval_seconds',
+            'schedule_jitter_seconds', 'next_run_at'
         ]
-        read_only_fields = ['owner', 'created_at', 'updated_at', 'last_run']
+        read_only_fields = ['owner', 'created_at', 'updated_at', 'last_run', 'next_run_at']
     
     def create(self, validated_data):
         validated_data['owner'] = self.context['request'].user
         return super().create(validated_data)
     
+    def validate_records_path(self, value):
+        try:
+            compile_records_path(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+    
+    def validate_schedule_cron(self, value):
+        if value:
+            try:
+                parse_cron(value).next_after(timezone.now())
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+        return value
+    
+    def validate_schedule_interval_seconds(self, value):
+        if value is not None and value < 60:
+            raise serializers.ValidationError("Schedule interval must be at least 60 seconds")
+        return value
+    
     def validate(self, data):
         # Ensure API and DB belong to the same user
         user = self.context['request'].user
@@ -38,6 +62,11 @@ class DataMappingSerializer(serializers.ModelSerializer):
             if data['database'].owner != user:
                 raise serializers.ValidationError("You don't have access to this database")
         
+        cron = data.get('schedule_cron', getattr(self.instance, 'schedule_cron', ''))
+        interval = data.get('schedule_interval_seconds', getattr(self.instance, 'schedule_interval_seconds', None))
+        if cron and interval:
+            raise serializers.ValidationError("Set either schedule_cron or schedule_interval_seconds, not both")
+        
         return data
 
 
@@ -56,9 +85,9 @@ class MappingExecutionSerializer(serializers.ModelSerializer):
             'id', 'mapping', 'mapping_name', 'executed_by', 'executed_by_username',
             'started_at', 'completed_at', 'status', 'total_records',
             'processed_records', 'failed_records', 'api_response',
-            'error_details', 'execution_time_ms'
+            'error_details', 'error_summary', 'execution_time_ms', 'metrics', 'is_dry_run'
         ]
-        read_only_fields = ['executed_by', 'started_at']
+        read_only_fields = ['executed_by', 'started_at', 'is_dry_run']
 
 
 class TransformationTemplateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,272 @@
+from typing import Dict, List, Any
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import closing
+import asyncio
+import threading
+import time
+import logging
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from databases.db_adapters.factory import DatabaseAdapterFactory
+from monitoring.metrics import MAPPING_EXECUTIONS_IN_PROGRESS
+from .mapping_engine import MappingEngine
+
+logger = logging.getLogger(__name__)
+
+# Put on the queue by the producer thread after the last batch
+_DONE = object()
+
+
+class AsyncMappingEngine(MappingEngine):
+    """
+    MappingEngine variant that writes through an asyncio database adapter
+    
+    A worker thread runs the synchronous fetch, parse and transform steps and
+    hands transformed batches to the event loop through a bounded queue, so the
+    next batch is prepared while the current one is written. Awaiting execute()
+    from an async view, or gathering many executions in one worker, keeps many
+    network-bound writes in flight per process.
+    
+    The mapping must be loaded with select_related('api_endpoint', 'database'):
+    lazy relation lookups are not allowed on the event loop. Dry runs are not
+    supported; run them with MappingEngine.
+    """
+    
+    # Transformed batches buffered between the producer thread and the writer
+    QUEUE_BATCHES = 4
+    
+    async def execute(self) -> Dict[str, Any]:
+        """Execute the mapping and return results (same shape as MappingEngine.execute)"""
+        if self.dry_run:
+            # Writes are committed batch by batch; nothing here would roll them back
+            raise ValueError("AsyncMappingEngine does not support dry runs; use MappingEngine")
+        
+        start_time = time.time()
+        db_type = self.mapping.database.db_type
+        state = {}
+        total_records = 0
+        processed = 0
+        failed = 0
+        errors = self._error_collector()
+        
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.QUEUE_BATCHES)
+        stop = threading.Event()
+        producer = None
+        
+        MAPPING_EXECUTIONS_IN_PROGRESS.labels(db_type=db_type).inc()
+        db_adapter = None
+        try:
+            db_adapter = DatabaseAdapterFactory.create_async_adapter(db_type, self._get_db_config())
+            
+            # Fail fast on a missing table or column, before calling the API
+            with self.metrics.time_stage('schema'):
+                await sync_to_async(self._check_target_columns)(self._get_db_adapter())
+            with self.metrics.time_stage('connect'):
+                await db_adapter.connect()
+            
+            producer = loop.run_in_executor(None, self._produce_batches, loop, queue, stop, state)
+            
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                
+                batch, transformed_records, batch_errors = item
+                batch_size = len(batch)
+                total_records += batch_size
+                
+                batch_start = time.perf_counter()
+                result = await self._write_batch_with_retry(transformed_records, db_adapter, batch_errors)
+                self.metrics.observe_batch(batch_size, time.perf_counter() - batch_start)
+                
+                processed += result['success']
+                failed += batch_size - len(transformed_records) + result['failed']
+                errors.add_batch(batch_errors, batch, total_records - batch_size, result.get('rollback_cause'))
+                
+                if self.execution:
+                    self.execution.total_records = total_records
+                    self.execution.processed_records = processed
+                    self.execution.failed_records = failed
+                    await self.execution.asave()
+            
+            reader = state['reader']
+            self._attribute_read_time(reader)
+            status = 'success' if failed == 0 else 'partial' if processed > 0 else 'failed'
+            self._observe_execution(status, processed, failed, time.time() - start_time)
+            errors.close()
+            
+            if self.execution:
+                self.execution.api_response = self._summarize_response(reader)
+                self.execution.total_records = total_records
+                self.execution.status = status
+                self.execution.completed_at = timezone.now()
+                self.execution.execution_time_ms = int((time.time() - start_time) * 1000)
+                self.execution.error_details = errors.details()
+                self.execution.error_summary = errors.summary()
+                self.execution.metrics = self.metrics.as_dict()
+                await self.execution.asave()
+            
+            return {
+                'status': 'success' if failed == 0 else 'partial',
+                'total_records': total_records,
+                'processed_records': processed,
+                'failed_records': failed,
+                'execution_time_ms': int((time.time() - start_time) * 1000),
+                'errors': errors.details()[:10],
+                'error_summary': errors.summary(),
+                'metrics': self.metrics.as_dict()
+            }
+        
+        except Exception as e:
+            reader = state.get('reader')
+            if reader is not None:
+                self._attribute_read_time(reader)
+            self._observe_execution('failed', processed, failed, time.time() - start_time)
+            
+            if self.execution:
+                if reader is not None:
+                    self.execution.api_response = self._summarize_response(reader)
+                self.execution.metrics = self.metrics.as_dict()
+                self.execution.status = 'failed'
+                self.execution.completed_at = timezone.now()
+                self.execution.error_details = [{'general_error': str(e)}]
+                self.execution.error_summary = errors.summary()
+                await self.execution.asave()
+            raise
+        finally:
+            errors.close()
+            stop.set()
+            if producer is not None:
+                await producer
+            if db_adapter is not None:
+                await db_adapter.disconnect()
+            MAPPING_EXECUTIONS_IN_PROGRESS.labels(db_type=db_type).dec()
+    
+    def _produce_batches(self, loop, queue: asyncio.Queue, stop: threading.Event, state: Dict) -> None:
+        """Producer thread: fetch, parse and transform, queueing (batch, transformed, errors) per batch"""
+        try:
+            with self.metrics.time_stage('fetch'):
+                response = self._call_api()
+            reader = state['reader'] = self._get_record_reader()
+            records = reader.iter_records(response, self._extract_records)
+            
+            with closing(response):
+                for batch in self._iter_batches(records, self.mapping.batch_size):
+                    transformed_records, batch_errors = self._transform_batch(batch)
+                    if not self._hand_over(loop, queue, stop, (batch, transformed_records, batch_errors)):
+                        return
+            self._hand_over(loop, queue, stop, _DONE)
+        except Exception as e:
+            self._hand_over(loop, queue, stop, e)
+    
+    def _hand_over(self, loop, queue: asyncio.Queue, stop: threading.Event, item: Any) -> bool:
+        """Block until the event loop accepts item; False if the writer stopped first"""
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return True
+            except FutureTimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+    
+    async def _write_batch_with_retry(self, transformed_records: List[Dict], db_adapter, errors: List) -> Dict:
+        """Write one transformed batch, retrying transient errors like _process_batch_with_retry"""
+        if not transformed_records:
+            return {'success': 0, 'failed': 0}
+        
+        for attempt in range(self.retry_config['max_retries']):
+            try:
+                if self.mapping.database.db_type == 'mongodb':
+                    return await self._write_mongodb_batch(transformed_records, db_adapter, errors)
+                return await self._write_sql_batch(transformed_records, db_adapter, errors)
+            except Exception as e:
+                error_str = str(e)
+                is_retryable = any(
+                    retry_error in error_str
+                    for retry_error in self.retry_config['retry_errors']
+                )
+                if is_retryable and attempt < self.retry_config['max_retries'] - 1:
+                    wait_time = self.retry_config['backoff_factor'] ** attempt
+                    logger.warning(f"Retryable error on attempt {attempt + 1}, waiting {wait_time}s: {error_str}")
+                    self.metrics.retries += 1
+                    with self.metrics.time_stage('retry_wait'):
+                        await asyncio.sleep(wait_time)
+                    continue
+                raise
+        
+        return {'success': 0, 'failed': len(transformed_records)}
+    
+    async def _write_sql_batch(self, transformed_records: List[Dict], db_adapter, errors: List) -> Dict:
+        """One transaction per batch, one execute_many per distinct column set"""
+        upsert = self.mapping.update_on_conflict and self.mapping.conflict_columns
+        try:
+            async with db_adapter.transaction():
+                with self.metrics.time_stage('write'):
+                    for columns, records in self._group_by_columns(transformed_records).items():
+                        query = self.statements.upsert(columns) if upsert else self.statements.insert(columns)
+                        await db_adapter.execute_many(query, [list(record.values()) for record in records])
+                
+                # The rest of the block is the commit
+                commit_started = time.perf_counter()
+            self.metrics.add_stage_time('commit', time.perf_counter() - commit_started)
+        except Exception as batch_error:
+            if any(retry_error in str(batch_error) for retry_error in self.retry_config['retry_errors']):
+                raise
+            rolled_back = {
+                'batch_error': str(batch_error),
+                'error_type': type(batch_error).__name__,
+                'message': 'Entire batch rolled back due to error'
+            }
+            errors.append(rolled_back)
+            return {'success': 0, 'failed': len(transformed_records), 'rollback_cause': rolled_back}
+        
+        return {'success': len(transformed_records), 'failed': 0}
+    
+    async def _write_mongodb_batch(self, transformed_records: List[Dict], db_adapter, errors: List) -> Dict:
+        """Unordered insert_many, or bulk_write of upserts on the conflict columns"""
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+        
+        collection = db_adapter.connection[db_adapter.config['database']][self.mapping.target_table]
+        documents = [record_info['transformed'] for record_info in transformed_records]
+        upsert = self.mapping.update_on_conflict and self.mapping.conflict_columns
+        stage = 'mongodb_upsert' if upsert else 'mongodb_insert'
+        
+        with self.metrics.time_stage('write'):
+            try:
+                if upsert:
+                    await collection.bulk_write([
+                        UpdateOne(
+                            {col: document.get(col) for col in self.mapping.conflict_columns if col in document},
+                            {'$set': document},
+                            upsert=True
+                        )
+                        for document in documents
+                    ], ordered=False)
+                else:
+                    await collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                write_errors = e.details.get('writeErrors', [])
+                for error in write_errors:
+                    errors.append({
+                        'record_index': transformed_records[error['index']]['index'],
+                        'stage': stage,
+                        'error': error.get('errmsg'),
+                        'error_code': error.get('code')
+                    })
+                return {'success': len(documents) - len(write_errors), 'failed': len(write_errors)}
+            except Exception as e:
+                errors.append({
+                    'batch_error': str(e),
+                    'error_type': type(e).__name__
+                })
+                return {'success': 0, 'failed': len(documents)}
+        
+        return {'success': len(documents), 'failed': 0}
@@ -0,0 +1,249 @@
+from decimal import Context, Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import re
+
+
+class CoercionError(ValueError):
+    """A value the target column would reject"""
+    
+    def __init__(self, column: str, message: str):
+        super().__init__(f"{column}: {message}")
+        self.column = column
+
+
+# Returned by a coercer to leave the column out of the row, so its DEFAULT applies
+OMIT = object()
+
+STRING_TYPES = {
+    'char', 'character', 'varchar', 'character varying', 'nchar', 'nvarchar',
+    'text', 'ntext', 'tinytext', 'mediumtext', 'longtext', 'string'
+}
+INTEGER_RANGES = {
+    'smallint': (-2 ** 15, 2 ** 15 - 1),
+    'int2': (-2 ** 15, 2 ** 15 - 1),
+    'smallserial': (1, 2 ** 15 - 1),
+    'mediumint': (-2 ** 23, 2 ** 23 - 1),
+    'int': (-2 ** 31, 2 ** 31 - 1),
+    'integer': (-2 ** 31, 2 ** 31 - 1),
+    'int4': (-2 ** 31, 2 ** 31 - 1),
+    'serial': (1, 2 ** 31 - 1),
+    'bigint': (-2 ** 63, 2 ** 63 - 1),
+    'int8': (-2 ** 63, 2 ** 63 - 1),
+    'bigserial': (1, 2 ** 63 - 1),
+}
+# SQL Server's tinyint is unsigned; MySQL's is signed unless declared UNSIGNED
+TINYINT_RANGES = {'mssql': (0, 255), 'mysql': (-128, 127)}
+DECIMAL_TYPES = {'decimal', 'numeric', 'money'}
+FLOAT_TYPES = {'float', 'real', 'double', 'double precision', 'float4', 'float8'}
+BOOLEAN_TYPES = {'bool', 'boolean'}
+
+TRUE_STRINGS = {'true', 't', 'yes', 'y', '1'}
+FALSE_STRINGS = {'false', 'f', 'no', 'n', '0'}
+
+_TYPE_ARGS_RE = re.compile(r'\s*\((.*)\)\s*$')
+
+
+def compile_coercers(table_schema: Dict[str, Any], columns: List[str], db_type: str,
+                     mode: str = 'reject') -> List[Tuple[str, Callable[[Any], Any]]]:
+    """
+    Build one checking function per mapped column from the target table's schema
+    
+    mode 'reject' raises CoercionError only for values every supported database
+    refuses (too long, out of range, overflowing numeric(p, s), NULL in a NOT
+    NULL column); values whose fate depends on the server, like non-numeric
+    strings for numeric columns, are passed through. mode 'coerce' first tries
+    to make them fit: strings are truncated, numeric and boolean strings
+    parsed, excess decimal places rounded and NULLs for NOT NULL columns with a
+    default left out. Values that still can't fit are rejected.
+    Columns with nothing to check get no function.
+    """
+    by_name = {column['name'].lower(): column for column in table_schema.get('columns', [])}
+    coercers = []
+    for name in columns:
+        column_info = by_name.get(name.lower())
+        if column_info is None:
+            continue
+        coercer = _compile_column(name, column_info, db_type, mode == 'coerce')
+        if coercer is not None:
+            coercers.append((name, coercer))
+    return coercers
+
+
+def _compile_column(name: str, column_info: Dict[str, Any], db_type: str, coerce: bool) -> Optional[Callable[[Any], Any]]:
+    data_type, column_info = _split_type(column_info)
+    convert = _compile_type(name, data_type, column_info, db_type, coerce)
+    not_null = column_info.get('nullable') is False
+    has_default = column_info.get('default') is not None
+    
+    if convert is None and not not_null:
+        return None
+    
+    def check(value):
+        if value is None:
+            if not not_null:
+                return None
+            if coerce and has_default:
+                return OMIT
+            raise CoercionError(name, "NULL in a NOT NULL column")
+        return convert(value) if convert is not None else value
+    
+    return check
+
+
+def _split_type(column_info: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Base type name, with length/precision taken from a declared type like VARCHAR(20) if not reported"""
+    declared = column_info.get('type', '').lower().strip()
+    match = _TYPE_ARGS_RE.search(declared)
+    if not match:
+        return declared, column_info
+    
+    column_info = dict(column_info)
+    args = [arg.strip() for arg in match.group(1).split(',')]
+    if all(arg.isdigit() for arg in args) and not any(column_info.get(key) for key in ('length', 'precision')):
+        if len(args) == 2:
+            column_info['precision'], column_info['scale'] = int(args[0]), int(args[1])
+        else:
+            column_info['length'] = int(args[0])
+    return declared[:match.start()], column_info
+
+
+def _compile_type(name: str, data_type: str, column_info: Dict[str, Any], db_type: str,
+                  coerce: bool) -> Optional[Callable[[Any], Any]]:
+    if data_type in STRING_TYPES:
+        # SQL Server reports (max) types as length -1
+        length = column_info.get('length')
+        return _string(name, length if length and length > 0 else None, coerce)
+    if data_type in INTEGER_RANGES or data_type == 'tinyint':
+        low, high = INTEGER_RANGES.get(data_type) or TINYINT_RANGES.get(db_type, (-128, 255))
+        if db_type == 'mysql':
+            # The schema doesn't say whether a column is UNSIGNED; accept either range
+            high = high * 2 + 1
+        return _integer(name, low, high, coerce)
+    if data_type in DECIMAL_TYPES:
+        # Unconstrained numeric (PostgreSQL) reports neither precision nor scale
+        return _decimal(name, column_info.get('precision'), column_info.get('scale'), coerce)
+    if data_type in FLOAT_TYPES:
+        return _float(name, coerce)
+    if data_type in BOOLEAN_TYPES or (data_type == 'bit' and db_type == 'mssql'):
+        return _boolean(name, coerce)
+    return None
+
+
+def _string(name: str, max_length: Optional[int], coerce: bool) -> Optional[Callable[[Any], Any]]:
+    if not max_length and not coerce:
+        return None
+    
+    def check(value):
+        if coerce and not isinstance(value, str):
+            value = json.dumps(value, default=str) if isinstance(value, (dict, list)) else str(value)
+        if max_length and isinstance(value, str) and len(value) > max_length:
+            if coerce:
+                return value[:max_length]
+            raise CoercionError(name, f"{len(value)} characters exceed the column's {max_length}")
+        return value
+    
+    return check
+
+
+def _integer(name: str, low: int, high: int, coerce: bool) -> Callable[[Any], Any]:
+    def check(value):
+        if type(value) is int:
+            # The common case, without the Decimal round trip
+            if not low <= value <= high:
+                raise CoercionError(name, f"{value} is outside the column's range {low}..{high}")
+            return value
+        
+        number = _parse_number(value)
+        if number is None:
+            if coerce and isinstance(value, str) and value.strip().lower() in TRUE_STRINGS | FALSE_STRINGS:
+                return int(value.strip().lower() in TRUE_STRINGS)
+            if coerce:
+                raise CoercionError(name, f"{value!r} is not an integer")
+            # Not for us to judge: e.g. MySQL outside strict mode stores 'True' as 0
+            return value
+        
+        # Fractions are rounded by the database, so only the rounded value must fit
+        number = int(number.to_integral_value(ROUND_HALF_UP))
+        if not low <= number <= high:
+            raise CoercionError(name, f"{number} is outside the column's range {low}..{high}")
+        return number if coerce else value
+    
+    return check
+
+
+def _decimal(name: str, precision: Optional[int], scale: Optional[int], coerce: bool) -> Callable[[Any], Any]:
+    if precision:
+        scale = scale or 0
+        exponent = Decimal(1).scaleb(-scale)
+        # Enough digits to round any value that passes the overflow check exactly
+        context = Context(prec=precision + 1)
+    
+    def check(value):
+        number = _parse_number(value)
+        if number is None:
+            if coerce:
+                raise CoercionError(name, f"{value!r} is not a number")
+            return value
+        if not precision:
+            # Unconstrained numeric stores any value as given
+            return number if coerce else value
+        
+        # The database rounds excess decimal places itself; overflowing the integer digits is an error
+        if _integer_digits(number) > precision - scale:
+            raise CoercionError(name, f"{value} does not fit numeric({precision}, {scale})")
+        rounded = number.quantize(exponent, rounding=ROUND_HALF_UP, context=context)
+        if _integer_digits(rounded) > precision - scale:
+            raise CoercionError(name, f"{value} does not fit numeric({precision}, {scale})")
+        return rounded if coerce else value
+    
+    return check
+
+
+def _integer_digits(number: Decimal) -> int:
+    return max(number.adjusted() + 1, 0) if number else 0
+
+
+def _float(name: str, coerce: bool) -> Optional[Callable[[Any], Any]]:
+    if not coerce:
+        # Any float the driver can send fits; what a string means is up to the database
+        return None
+    
+    def check(value):
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            return value
+        number = _parse_number(value)
+        if number is None:
+            raise CoercionError(name, f"{value!r} is not a number")
+        return float(number)
+    
+    return check
+
+
+def _parse_number(value: Any) -> Optional[Decimal]:
+    """value as a finite Decimal (booleans as 0/1), or None if it isn't numeric"""
+    if isinstance(value, bool):
+        return Decimal(int(value))
+    if not isinstance(value, (int, float, Decimal, str)):
+        return None
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def _boolean(name: str, coerce: bool) -> Optional[Callable[[Any], Any]]:
+    if not coerce:
+        return None
+    
+    def check(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in TRUE_STRINGS | FALSE_STRINGS:
+            return value.strip().lower() in TRUE_STRINGS
+        raise CoercionError(name, f"{value!r} is not a boolean")
+    
+    return check
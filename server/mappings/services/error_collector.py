@@ -0,0 +1,160 @@
+from typing import Any, Dict, List, Optional
+import gzip
+import json
+import os
+import random
+import re
+
+# Literal values in messages ("value 'abc' ...", "Duplicate entry '42'") vary per record
+_QUOTED_RE = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NUMBER_RE = re.compile(r'\b\d+(\.\d+)?\b')
+MESSAGE_LENGTH = 300
+
+
+class ErrorCollector:
+    """
+    Bounded record of an execution's errors
+    
+    Every error is counted in a group keyed by stage, error type and message
+    (with quoted values and numbers masked, so one cause is one group). Only the
+    first FIRST_N errors and a uniform reservoir sample of SAMPLE_SIZE of the
+    rest are kept in full; a run with 100k failures stores the same handful of
+    examples as one with 100.
+    
+    With a dead_letter_path, every rejected source record is also appended to a
+    gzipped NDJSON file alongside its error, so nothing is lost for replay.
+    """
+    
+    FIRST_N = 20
+    SAMPLE_SIZE = 20
+    MAX_GROUPS = 100
+    
+    def __init__(self, dead_letter_path: Optional[str] = None, first_n: int = FIRST_N,
+                 sample_size: int = SAMPLE_SIZE, max_groups: int = MAX_GROUPS, seed: Optional[int] = None):
+        self.first_n = first_n
+        self.sample_size = sample_size
+        self.max_groups = max_groups
+        self.total = 0
+        self.first = []
+        self.sample = []
+        self.groups = {}
+        self.ungrouped = 0
+        self.dead_letter_path = dead_letter_path
+        self.dead_lettered = 0
+        self._dead_letter = None
+        self._rng = random.Random(seed)
+    
+    def add_batch(self, errors: List[Dict], batch: List[Dict], offset: int,
+                  rollback_cause: Optional[Dict] = None) -> None:
+        """
+        Collect one batch's errors; offset is the number of records before it.
+        
+        rollback_cause is the error that rolled back the batch's transaction, if
+        one did; records without an error of their own are dead-lettered with it.
+        """
+        failed_indexes = set()
+        for error in errors:
+            record = None
+            index = error.get('record_index')
+            if index is not None:
+                # Position of the record in the whole response, not just its batch
+                error['record_number'] = offset + index
+                if 0 <= index < len(batch):
+                    record = batch[index]
+                    failed_indexes.add(index)
+            self.add(error, record)
+        
+        if rollback_cause is not None and self.dead_letter_path:
+            for index, record in enumerate(batch):
+                if index not in failed_indexes:
+                    self._write_dead_letter({
+                        'record_number': offset + index,
+                        'stage': 'batch_rollback',
+                        'error': self._message(rollback_cause)
+                    }, record)
+    
+    def add(self, error: Dict, record: Optional[Dict] = None) -> None:
+        """Count one error, keep it if it is among the first or sampled, and dead-letter its record"""
+        self.total += 1
+        self._count(error)
+        
+        if len(self.first) < self.first_n:
+            self.first.append(error)
+        else:
+            # Reservoir sampling (algorithm R) over the errors after the first N
+            seen = self.total - self.first_n
+            if len(self.sample) < self.sample_size:
+                self.sample.append(error)
+            else:
+                slot = self._rng.randrange(seen)
+                if slot < self.sample_size:
+                    self.sample[slot] = error
+        
+        if record is not None and self.dead_letter_path:
+            self._write_dead_letter(error, record)
+    
+    def details(self) -> List[Dict]:
+        """Kept errors for MappingExecution.error_details: the first N, then the sample in record order"""
+        sampled = sorted(self.sample, key=lambda error: error.get('record_number', 0))
+        return self.first + [dict(error, sampled=True) for error in sampled]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Error counts by group, most frequent first, and where the dead letters went"""
+        summary = {
+            'total': self.total,
+            'kept': len(self.first) + len(self.sample),
+            'groups': sorted(self.groups.values(), key=lambda group: group['count'], reverse=True)
+        }
+        if self.ungrouped:
+            summary['ungrouped'] = self.ungrouped
+        if self.dead_lettered:
+            summary['dead_letter'] = {
+                'file': os.path.basename(self.dead_letter_path),
+                'records': self.dead_lettered
+            }
+        return summary
+    
+    def close(self) -> None:
+        if self._dead_letter is not None:
+            self._dead_letter.close()
+            self._dead_letter = None
+    
+    def _count(self, error: Dict) -> None:
+        message = self._message(error)
+        key = (error.get('stage', 'batch'), error.get('error_type', ''), self._normalize(message))
+        group = self.groups.get(key)
+        if group is None:
+            if len(self.groups) >= self.max_groups:
+                self.ungrouped += 1
+                return
+            group = self.groups[key] = {
+                'stage': key[0],
+                'error_type': key[1],
+                'message': key[2],
+                'example': message[:MESSAGE_LENGTH],
+                'first_record_number': error.get('record_number'),
+                'count': 0
+            }
+        group['count'] += 1
+    
+    @staticmethod
+    def _message(error: Dict) -> str:
+        return str(error.get('error') or error.get('batch_error') or error.get('general_error') or '')
+    
+    @staticmethod
+    def _normalize(message: str) -> str:
+        return _NUMBER_RE.sub('N', _QUOTED_RE.sub('?', message[:MESSAGE_LENGTH]))
+    
+    def _write_dead_letter(self, error: Dict, record: Dict) -> None:
+        if self._dead_letter is None:
+            os.makedirs(os.path.dirname(self.dead_letter_path) or '.', exist_ok=True)
+            self._dead_letter = gzip.open(self.dead_letter_path, 'wt', encoding='utf-8', compresslevel=6)
+        
+        entry = {
+            'record_number': error.get('record_number'),
+            'stage': error.get('stage', 'batch'),
+            'error': self._message(error),
+            'record': record
+        }
+        self._dead_letter.write(json.dumps(entry, default=str) + '\n')
+        self.dead_lettered += 1
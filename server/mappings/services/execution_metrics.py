@@ -0,0 +1,71 @@
+from typing import Dict, List, Any
+from contextlib import contextmanager
+from bisect import bisect_left
+import time
+
+
+class ExecutionMetrics:
+    """Per-stage timers and batch latency histogram for one mapping execution"""
+
+    STAGES = ['schema', 'fetch', 'parse', 'transform', 'connect', 'write', 'commit', 'retry_wait']
+
+    # Upper bounds (ms) of the batch latency histogram buckets; last bucket is +Inf
+    BATCH_LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+    def __init__(self):
+        self.stage_seconds = {stage: 0.0 for stage in self.STAGES}
+        self.batch_latencies_ms: List[float] = []
+        self.batch_sizes: List[int] = []
+        self.retries = 0
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Add the wall time of the enclosed block to a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(stage, time.perf_counter() - start)
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def observe_batch(self, size: int, seconds: float) -> None:
+        """Record end-to-end processing latency of one batch"""
+        self.batch_sizes.append(size)
+        self.batch_latencies_ms.append(seconds * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary stored on MappingExecution.metrics"""
+        latencies = sorted(self.batch_latencies_ms)
+
+        histogram = [0] * (len(self.BATCH_LATENCY_BUCKETS_MS) + 1)
+        for latency in latencies:
+            histogram[bisect_left(self.BATCH_LATENCY_BUCKETS_MS, latency)] += 1
+
+        return {
+            'stages_ms': {stage: round(seconds * 1000, 2) for stage, seconds in self.stage_seconds.items()},
+            'retries': self.retries,
+            'batches': {
+                'count': len(latencies),
+                'records': sum(self.batch_sizes),
+                'latency_ms': {
+                    'min': round(latencies[0], 2) if latencies else None,
+                    'max': round(latencies[-1], 2) if latencies else None,
+                    'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+                    'p50': self._percentile(latencies, 50),
+                    'p95': self._percentile(latencies, 95),
+                    'p99': self._percentile(latencies, 99),
+                },
+                'histogram': {
+                    'buckets_ms': self.BATCH_LATENCY_BUCKETS_MS + ['+Inf'],
+                    'counts': histogram,
+                },
+            },
+        }
+
+    def _percentile(self, sorted_values: List[float], percentile: int):
+        if not sorted_values:
+            return None
+        index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+        return round(sorted_values[index], 2)
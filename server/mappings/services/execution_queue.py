@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Callable, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apis.models import APIEndpoint
+from databases.models import DatabaseConnection
+from monitoring.metrics import MAPPING_EXECUTIONS_THROTTLED_TOTAL
+from mappings.models import DataMapping, MappingExecution
+
+
+class ExecutionLimitReached(Exception):
+    """The mapping's database or API endpoint already runs its maximum number of executions"""
+    
+    def __init__(self, message: str, limit: str, retry_after: int):
+        super().__init__(message)
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class ExecutionQueue:
+    """
+    Admission control for mapping executions, shared by every process
+    
+    An execution may only start while fewer than max_concurrent_executions
+    executions run against its DatabaseConnection and its APIEndpoint. Counts
+    come from MappingExecution rows with status 'running', so the web tier,
+    run_scheduler and run_mappings all see each other; admissions lock the
+    database and endpoint rows (in that order) while counting and creating the
+    execution, so two processes can't both take the last slot.
+    
+    fair_order() interleaves waiting mappings round-robin by owner, owners with
+    the fewest running executions first, so one user's backlog can't starve
+    everyone else's.
+    """
+    
+    # A 'running' execution with no heartbeat for this long was abandoned by a dead worker
+    STALE_RUNNING_SECONDS = 30 * 60
+    # Suggested wait for callers turned away (HTTP Retry-After)
+    RETRY_AFTER_SECONDS = 30
+    
+    def running(self):
+        """Executions currently holding a slot"""
+        return MappingExecution.objects.filter(
+            status='running',
+            heartbeat_at__gte=timezone.now() - timedelta(seconds=self.STALE_RUNNING_SECONDS)
+        )
+    
+    def admit(self, mapping: DataMapping, executed_by, claim: Callable[[], bool] = None,
+              dry_run: bool = False) -> Optional[MappingExecution]:
+        """
+        Create a running MappingExecution if both targets have a free slot
+        Raises ExecutionLimitReached otherwise. `claim` runs inside the same
+        transaction once a slot is free; returning False abandons the admission
+        (returns None). Dry runs take a slot too: they load the target just the same.
+        """
+        with transaction.atomic():
+            database = DatabaseConnection.objects.select_for_update().only(
+                'name', 'max_concurrent_executions'
+            ).get(pk=mapping.database_id)
+            api_endpoint = APIEndpoint.objects.select_for_update().only(
+                'name', 'max_concurrent_executions'
+            ).get(pk=mapping.api_endpoint_id)
+            
+            running = self.running()
+            self._check(
+                'database', f"database {database.name}", database.max_concurrent_executions,
+                running.filter(mapping__database_id=database.pk)
+            )
+            self._check(
+                'api_endpoint', f"API endpoint {api_endpoint.name}", api_endpoint.max_concurrent_executions,
+                running.filter(mapping__api_endpoint_id=api_endpoint.pk)
+            )
+            
+            if claim is not None and not claim():
+                return None
+            return MappingExecution.objects.create(mapping=mapping, executed_by=executed_by, is_dry_run=dry_run)
+    
+    def _check(self, limit: str, target: str, max_running: Optional[int], running) -> None:
+        if max_running is None:
+            return
+        count = running.count()
+        if count >= max_running:
+            MAPPING_EXECUTIONS_THROTTLED_TOTAL.labels(limit=limit).inc()
+            raise ExecutionLimitReached(
+                f"{count} executions already running against {target} (limit {max_running})",
+                limit=limit,
+                retry_after=self.RETRY_AFTER_SECONDS
+            )
+    
+    def fair_order(self, items: Iterable[Any], owner_of: Callable[[Any], int]) -> List[Any]:
+        """
+        Round-robin items across owners, keeping each owner's items in their given order
+        Owners with fewer running executions go first; ties keep first-seen order.
+        """
+        by_owner = OrderedDict()
+        for item in items:
+            by_owner.setdefault(owner_of(item), []).append(item)
+        if not by_owner:
+            return []
+        
+        running_by_owner = dict(
+            self.running()
+            .filter(mapping__owner_id__in=list(by_owner))
+            .values_list('mapping__owner_id')
+            .annotate(count=Count('id'))
+        )
+        queues = [by_owner[owner] for owner in sorted(by_owner, key=lambda owner: running_by_owner.get(owner, 0))]
+        
+        ordered = []
+        for position in range(max(len(queue) for queue in queues)):
+            ordered.extend(queue[position] for queue in queues if position < len(queue))
+        return ordered
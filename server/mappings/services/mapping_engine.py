@@ -1,25 +1,53 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+from contextlib import closing
+from itertools import islice
 import json
+import os
 import requests
 import time
+import uuid
+from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
 from jsonpath_ng import parse as jsonpath_parse
 import logging
 
-from databases.db_adapters.factory import DatabaseAdapterFactory
+from apis.http_client import send_request
+from databases.services.schema_cache import SchemaCache
+from monitoring.metrics import (
+    MAPPING_EXECUTIONS_TOTAL,
+    MAPPING_EXECUTIONS_IN_PROGRESS,
+    MAPPING_EXECUTION_SECONDS,
+    MAPPING_RECORDS_TOTAL,
+    MAPPING_STAGE_SECONDS_TOTAL
+)
 from .transformers import DataTransformer
 from .type_validator import TypeValidator
+from .record_readers import RecordReader, RecordReaderFactory
+from .execution_metrics import ExecutionMetrics
+from .statement_builder import StatementBuilder
+from .column_coercers import CoercionError, OMIT, compile_coercers
+from .error_collector import ErrorCollector
+from mappings.utils.json_path import compile_records_path
 
 logger = logging.getLogger(__name__)
 
 
 class MappingEngine:
-    def __init__(self, mapping, execution=None):
+    def __init__(self, mapping, execution=None, dry_run: bool = None):
         self.mapping = mapping
         self.execution = execution
+        # Run the whole pipeline but keep no writes: SQL batches are rolled back,
+        # MongoDB writes go to a scratch collection that is dropped afterwards
+        self.dry_run = bool(execution and execution.is_dry_run) if dry_run is None else dry_run
+        self._dry_run_collection = None
         self.transformer = DataTransformer()
         self.validator = TypeValidator()
+        self.records_extractor = compile_records_path(mapping.records_path)
+        self.statements = StatementBuilder(mapping.database.db_type, mapping.target_table, mapping.conflict_columns)
+        self.metrics = ExecutionMetrics()
+        # (target column, check) pairs compiled from the target schema by _check_target_columns
+        self.coercers = []
         self.retry_config = {
             'max_retries': 3,
             'backoff_factor': 2,
@@ -29,73 +57,204 @@ class MappingEngine:
     def execute(self) -> Dict[str, Any]:
         """Execute the mapping and return results"""
         start_time = time.time()
+        db_type = self.mapping.database.db_type
+        reader = None
+        total_records = 0
+        processed = 0
+        failed = 0
+        errors = self._error_collector()
         
+        MAPPING_EXECUTIONS_IN_PROGRESS.labels(db_type=db_type).inc()
         try:
-            # 1. Call API
-            api_data = self._call_api()
+            # Get database adapter
+            db_adapter = self._get_db_adapter()
             
-            if self.execution:
-                self.execution.api_response = api_data
-                self.execution.save()
+            # Fail fast on a missing table or column, before calling the API
+            with self.metrics.time_stage('schema'):
+                self._check_target_columns(db_adapter)
             
-            # 2. Extract records from API response
-            records = self._extract_records(api_data)
-            total_records = len(records)
+            # 1. Call API (body is streamed, not loaded up front)
+            with self.metrics.time_stage('fetch'):
+                response = self._call_api()
             
-            if self.execution:
-                self.execution.total_records = total_records
-                self.execution.save()
+            # 2. Read records lazily in the endpoint's response format
+            reader = self._get_record_reader()
+            records = reader.iter_records(response, self._extract_records)
             
             # 3. Process records with transaction support
-            processed = 0
-            failed = 0
-            errors = []
+            # Process in batches with transactions
+            with closing(response):
+                for batch in self._iter_batches(records, self.mapping.batch_size):
+                    total_records += len(batch)
+                    
+                    # Process batch with retry logic
+                    batch_start = time.perf_counter()
+                    batch_results = self._process_batch_with_retry(batch, db_adapter)
+                    self.metrics.observe_batch(len(batch), time.perf_counter() - batch_start)
+                    
+                    processed += batch_results['success']
+                    failed += batch_results['failed']
+                    errors.add_batch(batch_results['errors'], batch, total_records - len(batch), batch_results.get('rollback_cause'))
+                    
+                    if self.execution:
+                        self.execution.total_records = total_records
+                        self.execution.processed_records = processed
+                        self.execution.failed_records = failed
+                        self.execution.save()
             
-            # Get database adapter
-            db_adapter = self._get_db_adapter()
+            self._attribute_read_time(reader)
+            status = 'success' if failed == 0 else 'partial' if processed > 0 else 'failed'
+            self._observe_execution(status, processed, failed, time.time() - start_time)
             
-            # Process in batches with transactions
-            batch_size = self.mapping.batch_size
-            for i in range(0, total_records, batch_size):
-                batch = records[i:i + batch_size]
-                
-                # Process batch with retry logic
-                batch_results = self._process_batch_with_retry(batch, db_adapter)
-                
-                processed += batch_results['success']
-                failed += batch_results['failed']
-                errors.extend(batch_results['errors'])
-                
-                if self.execution:
-                    self.execution.processed_records = processed
-                    self.execution.failed_records = failed
-                    self.execution.save()
+            metrics = self._metrics_summary(total_records, time.time() - start_time)
+            errors.close()
             
             # 4. Update execution status
             if self.execution:
                 execution_time = int((time.time() - start_time) * 1000)
-                self.execution.status = 'success' if failed == 0 else 'partial' if processed > 0 else 'failed'
+                self.execution.api_response = self._summarize_response(reader)
+                self.execution.total_records = total_records
+                self.execution.status = status
                 self.execution.completed_at = timezone.now()
                 self.execution.execution_time_ms = execution_time
-                self.execution.error_details = errors
+                self.execution.error_details = errors.details()
+                self.execution.error_summary = errors.summary()
+                self.execution.metrics = metrics
                 self.execution.save()
             
             return {
                 'status': 'success' if failed == 0 else 'partial',
+                'dry_run': self.dry_run,
                 'total_records': total_records,
                 'processed_records': processed,
                 'failed_records': failed,
                 'execution_time_ms': int((time.time() - start_time) * 1000),
-                'errors': errors[:10]  # Return first 10 errors
+                'errors': errors.details()[:10],  # Return first 10 errors
+                'error_summary': errors.summary(),
+                'metrics': metrics
             }
-            
+        
         except Exception as e:
+            if reader is not None:
+                self._attribute_read_time(reader)
+            self._observe_execution('failed', processed, failed, time.time() - start_time)
+            
             if self.execution:
+                if reader is not None:
+                    self.execution.api_response = self._summarize_response(reader)
+                self.execution.metrics = self.metrics.as_dict()
                 self.execution.status = 'failed'
                 self.execution.completed_at = timezone.now()
                 self.execution.error_details = [{'general_error': str(e)}]
+                self.execution.error_summary = errors.summary()
                 self.execution.save()
             raise
+        finally:
+            errors.close()
+            if self._dry_run_collection is not None:
+                self._drop_dry_run_collection(db_adapter)
+            MAPPING_EXECUTIONS_IN_PROGRESS.labels(db_type=db_type).dec()
+    
+    def _error_collector(self) -> ErrorCollector:
+        """Collector for this run's errors, dead-lettering to MAPPING_DEAD_LETTER_DIR when it is set"""
+        dead_letter_dir = getattr(settings, 'MAPPING_DEAD_LETTER_DIR', None)
+        if not dead_letter_dir:
+            return ErrorCollector()
+        
+        name = f"execution-{self.execution.pk}" if self.execution else f"mapping-{self.mapping.pk}-{uuid.uuid4().hex[:8]}"
+        return ErrorCollector(dead_letter_path=os.path.join(dead_letter_dir, f"{name}.ndjson.gz"))
+    
+    def _check_target_columns(self, db_adapter) -> None:
+        """Verify the target table exists and has every mapped column, and compile the column checks"""
+        if self.mapping.database.db_type == 'mongodb':
+            return  # Collections are created on first insert and have no fixed columns
+        
+        table = self.mapping.target_table
+        schema_cache = SchemaCache(self.mapping.database, db_adapter)
+        try:
+            table_schema, from_cache = schema_cache.get_table_schema(table)
+            if from_cache and not self._has_mapped_columns(table_schema):
+                # The cache may predate a recent ALTER; confirm against the database
+                table_schema, _ = schema_cache.get_table_schema(table, refresh=True)
+        except Exception as e:
+            logger.warning(f"Skipping column check for {table}: {str(e)}")
+            return
+        
+        if table_schema is None:
+            if '.' in table:
+                # Schema-qualified names may live outside the connection's schema
+                logger.warning(f"Skipping column check for {table}: not found in the connection schema")
+                return
+            raise ValueError(f"Target table '{table}' does not exist")
+        
+        missing = self._missing_columns(table_schema)
+        if missing:
+            raise ValueError(f"Target table '{table}' has no column(s): {', '.join(missing)}")
+        
+        # Compiled once here so the transform stage catches predictable rejections
+        # (too long, out of range, NULL in NOT NULL) without a round trip per row
+        self.coercers = compile_coercers(
+            table_schema,
+            [mapping['target_column'] for mapping in self.mapping.field_mappings],
+            self.mapping.database.db_type,
+            self.mapping.on_invalid_value
+        )
+    
+    def _has_mapped_columns(self, table_schema: Dict) -> bool:
+        return table_schema is not None and not self._missing_columns(table_schema)
+    
+    def _missing_columns(self, table_schema: Dict) -> List[str]:
+        existing = {column['name'].lower() for column in table_schema.get('columns', [])}
+        return [
+            mapping['target_column'] for mapping in self.mapping.field_mappings
+            if mapping['target_column'].lower() not in existing
+        ]
+    
+    def _metrics_summary(self, total_records: int, seconds: float) -> Dict[str, Any]:
+        """ExecutionMetrics.as_dict() plus end-to-end throughput"""
+        metrics = self.metrics.as_dict()
+        metrics['records_per_second'] = round(total_records / seconds, 2) if seconds > 0 else None
+        return metrics
+    
+    def _observe_execution(self, status: str, processed: int, failed: int, seconds: float) -> None:
+        """Publish the outcome of this execution to the process metrics registry"""
+        if self.dry_run:
+            # Nothing was written; keep dry runs out of the load dashboards
+            return
+        db_type = self.mapping.database.db_type
+        MAPPING_EXECUTIONS_TOTAL.labels(db_type=db_type, status=status).inc()
+        MAPPING_EXECUTION_SECONDS.labels(db_type=db_type).observe(seconds)
+        MAPPING_RECORDS_TOTAL.labels(db_type=db_type, result='processed').inc(processed)
+        MAPPING_RECORDS_TOTAL.labels(db_type=db_type, result='failed').inc(failed)
+        for stage, stage_seconds in self.metrics.stage_seconds.items():
+            MAPPING_STAGE_SECONDS_TOTAL.labels(stage=stage).inc(max(stage_seconds, 0))
+    
+    def _iter_batches(self, records: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+        """Group a record stream into lists of at most batch_size records"""
+        records = iter(records)
+        while True:
+            # Pulling from the reader covers both network reads and parsing;
+            # network time is moved to 'fetch' by _attribute_read_time
+            with self.metrics.time_stage('parse'):
+                batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def _attribute_read_time(self, reader: RecordReader) -> None:
+        """Move time spent waiting on the response body from 'parse' to 'fetch'"""
+        self.metrics.add_stage_time('parse', -reader.read_seconds)
+        self.metrics.add_stage_time('fetch', reader.read_seconds)
+        reader.read_seconds = 0.0
+    
+    def _summarize_response(self, reader) -> Any:
+        """API response to store on the execution; streamed formats are not kept in full"""
+        if reader.document is not None:
+            return reader.document
+        return {
+            'format': self.mapping.api_endpoint.expected_response_format,
+            'streamed': True
+        }
     
     def _process_batch_with_retry(self, batch: List[Dict], db_adapter) -> Dict:
         """Process batch with retry logic"""
@@ -115,7 +274,9 @@ class MappingEngine:
                     # Exponential backoff
                     wait_time = self.retry_config['backoff_factor'] ** attempt
                     logger.warning(f"Retryable error on attempt {attempt + 1}, waiting {wait_time}s: {error_str}")
-                    time.sleep(wait_time)
+                    self.metrics.retries += 1
+                    with self.metrics.time_stage('retry_wait'):
+                        time.sleep(wait_time)
                     continue
                 else:
                     # Not retryable or max retries reached
@@ -126,28 +287,10 @@ class MappingEngine:
     def _process_batch_with_transaction(self, records: List[Dict], db_adapter) -> Dict:
         """Process a batch of records with transaction support"""
         success = 0
-        failed = 0
-        errors = []
-        transformed_records = []
         
         # First, transform all records and validate
-        for idx, record in enumerate(records):
-            try:
-                transformed = self._transform_record(record)
-                transformed_records.append({
-                    'index': idx,
-                    'original': record,
-                    'transformed': transformed
-                })
-            except Exception as e:
-                failed += 1
-                errors.append({
-                    'record_index': idx,
-                    'stage': 'transformation',
-                    'error': str(e),
-                    'error_type': type(e).__name__,
-                    'field_values': self._extract_key_fields(record)
-                })
+        transformed_records, errors = self._transform_batch(records)
+        failed = len(errors)
         
         # If all transformations failed, return early
         if not transformed_records:
@@ -158,94 +301,217 @@ class MappingEngine:
             # MongoDB doesn't have traditional transactions for single replica sets
             # Process individually with better error handling
             result = self._process_mongodb_batch(transformed_records, db_adapter, errors)
+        elif self.dry_run:
+            result = self._dry_run_sql_batch(transformed_records, db_adapter, errors)
         else:
             # SQL databases - use transaction
             result = self._process_sql_batch_transactional(transformed_records, db_adapter, errors)
         
         success += result['success']
         failed += result['failed']
+        errors.extend(result.get('errors', []))
         
         return {
             'success': success,
             'failed': failed,
-            'errors': errors
+            'errors': errors,
+            'rollback_cause': result.get('rollback_cause')
         }
     
+    def _transform_batch(self, records: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Transform a batch; returns (transformed record infos, transformation errors)"""
+        transformed_records = []
+        errors = []
+        with self.metrics.time_stage('transform'):
+            for idx, record in enumerate(records):
+                try:
+                    transformed = self._coerce_record(self._transform_record(record))
+                    transformed_records.append({
+                        'index': idx,
+                        'original': record,
+                        'transformed': transformed
+                    })
+                except CoercionError as e:
+                    errors.append({
+                        'record_index': idx,
+                        'stage': 'validation',
+                        'column': e.column,
+                        'error': str(e),
+                        'error_type': type(e).__name__,
+                        'field_values': self._extract_key_fields(record)
+                    })
+                except Exception as e:
+                    errors.append({
+                        'record_index': idx,
+                        'stage': 'transformation',
+                        'error': str(e),
+                        'error_type': type(e).__name__,
+                        'field_values': self._extract_key_fields(record)
+                    })
+        return transformed_records, errors
+    
+    def _coerce_record(self, transformed: Dict) -> Dict:
+        """Run the compiled column checks; raises CoercionError for a value the column can't take"""
+        for column, check in self.coercers:
+            if column in transformed:
+                value = check(transformed[column])
+                if value is OMIT:
+                    del transformed[column]
+                else:
+                    transformed[column] = value
+        return transformed
+    
     def _process_sql_batch_transactional(self, transformed_records: List[Dict], db_adapter, errors: List) -> Dict:
         """Process SQL batch with transaction support"""
         success = 0
         failed = 0
+        record_errors = len(errors)
         
-        db_adapter.connect()
+        with self.metrics.time_stage('connect'):
+            db_adapter.connect()
         
         try:
-            # Start transaction
-            if hasattr(db_adapter.connection, 'begin'):
-                db_adapter.connection.begin()
-            elif hasattr(db_adapter.connection, 'autocommit'):
-                db_adapter.connection.autocommit = False
-            
-            try:
-                for record_info in transformed_records:
-                    idx = record_info['index']
-                    transformed = record_info['transformed']
-                    original = record_info['original']
-                    
-                    try:
-                        if self.mapping.update_on_conflict and self.mapping.conflict_columns:
-                            self._upsert_record(transformed, db_adapter)
-                        else:
-                            self._insert_record(transformed, db_adapter)
-                        success += 1
-                    except Exception as e:
-                        # Record individual error but continue within transaction
-                        failed += 1
-                        errors.append({
-                            'record_index': idx,
-                            'stage': 'database_insert',
-                            'error': str(e),
-                            'error_type': type(e).__name__,
-                            'field_values': self._extract_key_fields(original),
-                            'transformed_values': transformed
-                        })
-                        # For SQL, we'll rollback the entire batch on any error
-                        raise
+            # One transaction per batch: committed when the block exits, rolled back if it raises
+            with db_adapter.transaction():
+                with self.metrics.time_stage('write'):
+                    if self.mapping.use_bulk_load:
+                        success += self._bulk_load_records(transformed_records, db_adapter)
+                    else:
+                        for record_info in transformed_records:
+                            idx = record_info['index']
+                            transformed = record_info['transformed']
+                            original = record_info['original']
+                            try:
+                                if self.mapping.update_on_conflict and self.mapping.conflict_columns:
+                                    self._upsert_record(transformed, db_adapter)
+                                else:
+                                    self._insert_record(transformed, db_adapter)
+                                success += 1
+                            except Exception as e:
+                                # Record individual error but continue within transaction
+                                failed += 1
+                                errors.append({
+                                    'record_index': idx,
+                                    'stage': 'database_insert',
+                                    'error': str(e),
+                                    'error_type': type(e).__name__,
+                                    'field_values': self._extract_key_fields(original),
+                                    'transformed_values': transformed
+                                })
+                                # For SQL, we'll rollback the entire batch on any error
+                                raise
                 
-                # Commit transaction if all successful
-                if hasattr(db_adapter.connection, 'commit'):
-                    db_adapter.connection.commit()
+                # The rest of the block is the commit
+                commit_started = time.perf_counter()
+            self.metrics.add_stage_time('commit', time.perf_counter() - commit_started)
+        
+        except Exception as batch_error:
+            # Mark all as failed if transaction failed; a record's own error
+            # already explains it, otherwise (e.g. the bulk path) report the batch's
+            rolled_back = [] if len(errors) > record_errors else [{
+                'batch_error': str(batch_error),
+                'error_type': type(batch_error).__name__,
+                'message': 'Entire batch rolled back due to error'
+            }]
+            return {
+                'success': 0,
+                'failed': len(transformed_records),
+                'errors': rolled_back,
+                'rollback_cause': (rolled_back or errors)[-1]
+            }
+        
+        finally:
+            db_adapter.disconnect()
+        
+        return {'success': success, 'failed': failed}
+    
+    def _dry_run_sql_batch(self, transformed_records: List[Dict], db_adapter, errors: List) -> Dict:
+        """
+        Write a batch inside a transaction that is always rolled back
+        
+        The batch is first tried in one go (execute_many per column set). If the
+        database rejects it, every record is retried under its own savepoint so
+        each failing row is reported, not just the first.
+        """
+        success = 0
+        failed = 0
+        
+        with self.metrics.time_stage('connect'):
+            db_adapter.connect()
+        
+        try:
+            with db_adapter.transaction(rollback=True):
+                with self.metrics.time_stage('write'):
+                    try:
+                        with db_adapter.savepoint('dry_run_batch'):
+                            return {'success': self._bulk_load_records(transformed_records, db_adapter, bulk_path=False), 'failed': 0}
+                    except Exception as batch_error:
+                        if any(retry_error in str(batch_error) for retry_error in self.retry_config['retry_errors']):
+                            raise
                     
-            except Exception as batch_error:
-                # Rollback on any error
-                if hasattr(db_adapter.connection, 'rollback'):
-                    db_adapter.connection.rollback()
-                
-                # Mark all as failed if transaction failed
-                return {
-                    'success': 0,
-                    'failed': len(transformed_records),
-                    'errors': errors if errors else [{
-                        'batch_error': str(batch_error),
-                        'error_type': type(batch_error).__name__,
-                        'message': 'Entire batch rolled back due to error'
-                    }]
-                }
-                
+                    for record_info in transformed_records:
+                        transformed = record_info['transformed']
+                        try:
+                            with db_adapter.savepoint('dry_run_row'):
+                                if self.mapping.update_on_conflict and self.mapping.conflict_columns:
+                                    self._upsert_record(transformed, db_adapter)
+                                else:
+                                    self._insert_record(transformed, db_adapter)
+                            success += 1
+                        except Exception as e:
+                            failed += 1
+                            errors.append({
+                                'record_index': record_info['index'],
+                                'stage': 'database_insert',
+                                'error': str(e),
+                                'error_type': type(e).__name__,
+                                'field_values': self._extract_key_fields(record_info['original']),
+                                'transformed_values': transformed
+                            })
         finally:
             db_adapter.disconnect()
         
         return {'success': success, 'failed': failed}
     
+    def _bulk_load_records(self, transformed_records: List[Dict], db_adapter, bulk_path: bool = True) -> int:
+        """
+        Write a batch with one call per distinct column set: the adapter's bulk
+        path where it has one (and bulk_path is set), otherwise one execute_many
+        of the usual statement
+        """
+        groups = self._group_by_columns(transformed_records)
+        conflict_columns = self.mapping.conflict_columns if self.mapping.update_on_conflict else None
+        loaded = 0
+        for columns, records in groups.items():
+            rows = (list(record.values()) for record in records)
+            if bulk_path and db_adapter.supports_bulk_load:
+                loaded += db_adapter.bulk_load(self.mapping.target_table, list(columns), rows, conflict_columns or None)
+            elif conflict_columns:
+                loaded += db_adapter.execute_many(self.statements.upsert(columns), rows)
+            else:
+                loaded += db_adapter.execute_many(self.statements.insert(columns), rows)
+        return loaded
+    
+    @staticmethod
+    def _group_by_columns(transformed_records: List[Dict]) -> Dict[Tuple[str, ...], List[Dict]]:
+        """Transformed records keyed by their column tuple, so each group shares one statement"""
+        groups = {}
+        for record_info in transformed_records:
+            transformed = record_info['transformed']
+            groups.setdefault(tuple(transformed), []).append(transformed)
+        return groups
+    
     def _process_mongodb_batch(self, transformed_records: List[Dict], db_adapter, errors: List) -> Dict:
         """Process MongoDB batch with better error handling"""
         success = 0
         failed = 0
         
-        db_adapter.connect()
+        with self.metrics.time_stage('connect'):
+            db_adapter.connect()
         
         try:
             db = db_adapter.connection[db_adapter.config['database']]
-            collection = db[self.mapping.target_table]
+            collection = self._mongodb_collection(db)
             
             # Use bulk operations for better performance
             bulk_operations = []
@@ -269,55 +535,87 @@ class MappingEngine:
                     bulk_operations.append(transformed)
             
             # Execute bulk operation
-            if self.mapping.update_on_conflict and bulk_operations:
-                # Bulk upsert
-                for op in bulk_operations:
+            with self.metrics.time_stage('write'):
+                if self.mapping.update_on_conflict and bulk_operations:
+                    # Bulk upsert
+                    for position, op in enumerate(bulk_operations):
+                        try:
+                            collection.update_one(
+                                op['filter'],
+                                op['update'],
+                                upsert=op.get('upsert', False)
+                            )
+                            success += 1
+                        except Exception as e:
+                            failed += 1
+                            errors.append({
+                                'record_index': transformed_records[position]['index'],
+                                'stage': 'mongodb_upsert',
+                                'error': str(e),
+                                'error_type': type(e).__name__
+                            })
+                else:
+                    # Bulk insert
                     try:
-                        collection.update_one(
-                            op['filter'],
-                            op['update'],
-                            upsert=op.get('upsert', False)
-                        )
-                        success += 1
+                        result = collection.insert_many(bulk_operations, ordered=False)
+                        success = len(result.inserted_ids)
                     except Exception as e:
-                        failed += 1
-                        errors.append({
-                            'record_index': bulk_operations.index(op),
-                            'stage': 'mongodb_upsert',
-                            'error': str(e),
-                            'error_type': type(e).__name__
-                        })
-            else:
-                # Bulk insert
-                try:
-                    result = collection.insert_many(bulk_operations, ordered=False)
-                    success = len(result.inserted_ids)
-                except Exception as e:
-                    # Handle partial success in bulk insert
-                    if hasattr(e, 'details'):
-                        write_errors = e.details.get('writeErrors', [])
-                        success = len(bulk_operations) - len(write_errors)
-                        failed = len(write_errors)
-                        
-                        for error in write_errors:
+                        # Handle partial success in bulk insert
+                        if hasattr(e, 'details'):
+                            write_errors = e.details.get('writeErrors', [])
+                            success = len(bulk_operations) - len(write_errors)
+                            failed = len(write_errors)
+                            
+                            for error in write_errors:
+                                errors.append({
+                                    'record_index': transformed_records[error['index']]['index'] if 'index' in error else None,
+                                    'stage': 'mongodb_insert',
+                                    'error': error.get('errmsg'),
+                                    'error_code': error.get('code')
+                                })
+                        else:
+                            failed = len(bulk_operations)
                             errors.append({
-                                'record_index': error.get('index'),
-                                'stage': 'mongodb_insert',
-                                'error': error.get('errmsg'),
-                                'error_code': error.get('code')
+                                'batch_error': str(e),
+                                'error_type': type(e).__name__
                             })
-                    else:
-                        failed = len(bulk_operations)
-                        errors.append({
-                            'batch_error': str(e),
-                            'error_type': type(e).__name__
-                        })
-                        
+        
         finally:
             db_adapter.disconnect()
         
         return {'success': success, 'failed': failed}
     
+    def _mongodb_collection(self, db):
+        """
+        Collection to write to: the target, or in a dry run a scratch collection
+        carrying the target's indexes (so unique violations still surface).
+        Documents already in the target are not copied, so conflicts with them
+        are not detected.
+        """
+        if not self.dry_run:
+            return db[self.mapping.target_table]
+        
+        if self._dry_run_collection is None:
+            name = f"{self.mapping.target_table}__dry_run_{uuid.uuid4().hex[:8]}"
+            scratch = db[name]
+            for index_name, info in db[self.mapping.target_table].index_information().items():
+                if index_name == '_id_':
+                    continue
+                options = {key: info[key] for key in ('unique', 'sparse', 'partialFilterExpression') if key in info}
+                scratch.create_index(info['key'], name=index_name, **options)
+            self._dry_run_collection = name
+        return db[self._dry_run_collection]
+    
+    def _drop_dry_run_collection(self, db_adapter) -> None:
+        try:
+            db_adapter.connect()
+            db_adapter.connection[db_adapter.config['database']].drop_collection(self._dry_run_collection)
+        except Exception as e:
+            logger.error(f"Could not drop dry-run collection {self._dry_run_collection}: {str(e)}")
+        finally:
+            db_adapter.disconnect()
+            self._dry_run_collection = None
+    
     def _extract_key_fields(self, record: Dict) -> Dict:
         """Extract key fields from record for error reporting"""
         key_fields = {}
@@ -342,13 +640,14 @@ class MappingEngine:
                     key_fields[k] = v
         
         return key_fields
-
+    
     # Keep all other existing methods unchanged
     def test_mapping(self, sample_size: int = 5) -> Dict[str, Any]:
         """Test mapping with sample data without executing"""
-        # 1. Get sample API data
-        api_data = self._call_api()
-        records = self._extract_records(api_data)[:sample_size]
+        # 1. Get sample API data, reading only as far as the sample needs
+        with closing(self._call_api()) as response:
+            reader = self._get_record_reader()
+            records = list(islice(reader.iter_records(response, self._extract_records), sample_size))
         
         # 2. Transform sample records
         transformed = []
@@ -372,8 +671,8 @@ class MappingEngine:
             'target_table': self.mapping.target_table
         }
     
-    def _call_api(self) -> Dict[str, Any]:
-        """Call the API endpoint and return response data"""
+    def _call_api(self) -> requests.Response:
+        """Call the API endpoint and return the streamed response"""
         api = self.mapping.api_endpoint
         
         # Build request parameters
@@ -392,48 +691,46 @@ class MappingEngine:
                 headers[key_name] = api_key
             else:
                 params[key_name] = api_key
-                
+        
         elif api.auth_type == 'bearer':
             token = api.auth_credentials.get('token')
             headers['Authorization'] = f'Bearer {token}'
         
         # Make request
         if api.http_method in ['POST', 'PUT', 'PATCH']:
-            response = requests.request(
+            response = send_request(
                 method=api.http_method,
                 url=url,
                 headers=headers,
                 params=params,
                 json=body,
-                timeout=30
+                timeout=30,
+                stream=True
             )
         else:
-            response = requests.request(
+            response = send_request(
                 method=api.http_method,
                 url=url,
                 headers=headers,
                 params=params,
-                timeout=30
+                timeout=30,
+                stream=True
             )
         
-        response.raise_for_status()
-        return response.json()
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
     
-    def _extract_records(self, api_data: Any) -> List[Dict]:
-        """Extract records from API response"""
-        # If api_data is already a list, return it
-        if isinstance(api_data, list):
-            return api_data
-        
-        # If it's a dict, try common patterns
-        if isinstance(api_data, dict):
-            # Check for common data keys
-            for key in ['data', 'results', 'items', 'records']:
-                if key in api_data and isinstance(api_data[key], list):
-                    return api_data[key]
-        
-        # If single object, wrap in list
-        return [api_data]
+    def _get_record_reader(self) -> RecordReader:
+        """Get a record reader for the endpoint's expected response format"""
+        return RecordReaderFactory.create_reader(self.mapping.api_endpoint.expected_response_format)
+    
+    def _extract_records(self, api_data: Any) -> Iterable[Dict]:
+        """Extract records from API response using the mapping's compiled records path"""
+        return self.records_extractor(api_data)
     
     def _transform_record(self, record: Dict) -> Dict:
         """Transform a single record based on field mappings"""
@@ -488,78 +785,40 @@ class MappingEngine:
             return None
     
     def _get_db_adapter(self):
-        """Get database adapter for target database"""
-        db = self.mapping.database
-        config = {
-            'host': db.host,
-            'port': db.port,
-            'database': db.database,
-            'schema': db.schema,
-            'username': db.username,
-            'password': db.password,
-            'ssl_enabled': db.ssl_enabled,
-            'options': db.connection_options
-        }
-        
-        if db.db_type == 'mongodb':
-            config['mongodb_connection_type'] = db.mongodb_connection_type
-        
-        return DatabaseAdapterFactory.create_adapter(db.db_type, config)
+        """Get database adapter for target database, bound to its shared connection pool"""
+        return self.mapping.database.get_adapter(**self._config_overrides())
+    
+    def _get_db_config(self) -> Dict[str, Any]:
+        """Adapter connection config for the target database"""
+        return {**self.mapping.database.get_adapter_config(), **self._config_overrides()}
+    
+    def _config_overrides(self) -> Dict[str, Any]:
+        # LOAD DATA LOCAL is only allowed on connections opened for bulk loads
+        return {'local_infile': True} if self.mapping.use_bulk_load else {}
     
     def _insert_record(self, record: Dict, db_adapter):
         """Insert a record into the database"""
         table = self.mapping.target_table
-        columns = list(record.keys())
-        values = list(record.values())
         
         if self.mapping.database.db_type == 'mongodb':
             # MongoDB insert
             db_adapter.connection[db_adapter.config['database']][table].insert_one(record)
         else:
-            # SQL insert
-            placeholders = ', '.join(['%s'] * len(columns))
-            columns_str = ', '.join([f'"{col}"' for col in columns])
-            
-            query = f'INSERT INTO {table} ({columns_str}) VALUES ({placeholders})'
-            db_adapter.execute_query(query, values)
+            # SQL insert; statement text is shared by every record with these columns
+            query = self.statements.insert(tuple(record))
+            db_adapter.execute_statement(query, list(record.values()))
     
     def _upsert_record(self, record: Dict, db_adapter):
         """Upsert (insert or update) a record"""
         table = self.mapping.target_table
+        db_type = self.mapping.database.db_type
         
-        if self.mapping.database.db_type == 'postgresql':
-            # PostgreSQL UPSERT
-            columns = list(record.keys())
-            values = list(record.values())
-            columns_str = ', '.join([f'"{col}"' for col in columns])
-            placeholders = ', '.join(['%s'] * len(columns))
-            conflict_cols = ', '.join([f'"{col}"' for col in self.mapping.conflict_columns])
-            update_str = ', '.join([f'"{col}" = EXCLUDED."{col}"' for col in columns if col not in self.mapping.conflict_columns])
-            
-            query = f"""
-                INSERT INTO {table} ({columns_str}) 
-                VALUES ({placeholders})
-                ON CONFLICT ({conflict_cols}) 
-                DO UPDATE SET {update_str}
-            """
-            db_adapter.execute_query(query, values)
-            
-        elif self.mapping.database.db_type == 'mysql':
-            # MySQL UPSERT
-            columns = list(record.keys())
-            values = list(record.values())
-            columns_str = ', '.join([f'`{col}`' for col in columns])
-            placeholders = ', '.join(['%s'] * len(columns))
-            update_str = ', '.join([f'`{col}` = VALUES(`{col}`)' for col in columns if col not in self.mapping.conflict_columns])
-            
-            query = f"""
-                INSERT INTO {table} ({columns_str}) 
-                VALUES ({placeholders})
-                ON DUPLICATE KEY UPDATE {update_str}
-            """
-            db_adapter.execute_query(query, values)
-            
-        elif self.mapping.database.db_type == 'mongodb':
+        if db_type in ('postgresql', 'mysql', 'mssql'):
+            # ON CONFLICT / ON DUPLICATE KEY UPDATE / MERGE
+            query = self.statements.upsert(tuple(record))
+            db_adapter.execute_statement(query, list(record.values()))
+        
+        elif db_type == 'mongodb':
             # MongoDB upsert
             filter_doc = {col: record.get(col) for col in self.mapping.conflict_columns if col in record}
             db_adapter.connection[db_adapter.config['database']][table].update_one(
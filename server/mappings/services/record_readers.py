@@ -0,0 +1,145 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import csv
+import gzip
+import io
+import json
+import time
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable file object over response.iter_content() chunks"""
+
+    def __init__(self, chunks: Iterator[bytes], reader: 'RecordReader'):
+        self._chunks = chunks
+        self._reader = reader
+        self._buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            start = time.perf_counter()
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+            finally:
+                self._reader.read_seconds += time.perf_counter() - start
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class RecordReader:
+    """Base class for streaming records out of an API response body"""
+
+    def __init__(self, compressed: bool = False):
+        self.compressed = compressed
+        self.document = None  # Set by readers that parse one whole document
+        self.read_seconds = 0.0  # Time spent waiting on the network while reading
+
+    def iter_records(self, response, extract: Callable[[Any], Iterable[Dict]]) -> Iterator[Dict]:
+        """
+        Yield records from a streamed `requests` response
+
+        Args:
+            response: Response opened with stream=True
+            extract: Callable turning one parsed JSON document into records
+        """
+        raise NotImplementedError
+
+    def _open_binary(self, response) -> io.BufferedIOBase:
+        """Binary stream over the body, transparently gunzipped for .gz formats"""
+        # iter_content undoes any transport-level Content-Encoding for us
+        stream = io.BufferedReader(_ChunkStream(response.iter_content(CHUNK_SIZE), self), CHUNK_SIZE)
+        if self.compressed:
+            return gzip.GzipFile(fileobj=stream)
+        return stream
+
+    def _open_text(self, response) -> io.TextIOWrapper:
+        """Text stream over the body, decoded line by line"""
+        return io.TextIOWrapper(
+            self._open_binary(response),
+            encoding=self._text_encoding(response),
+            newline=''
+        )
+
+    def _text_encoding(self, response) -> str:
+        # requests falls back to ISO-8859-1 for text/* without a charset,
+        # which mangles UTF-8 exports, so only trust an explicit charset
+        if 'charset=' in response.headers.get('Content-Type', '').lower() and response.encoding:
+            return response.encoding
+        return 'utf-8-sig'
+
+
+class JSONRecordReader(RecordReader):
+    """Single JSON document containing the records"""
+
+    def iter_records(self, response, extract: Callable[[Any], Iterable[Dict]]) -> Iterator[Dict]:
+        self.document = json.load(self._open_text(response))
+        yield from extract(self.document)
+
+
+class NDJSONRecordReader(RecordReader):
+    """Newline-delimited JSON (JSON Lines), one document per line"""
+
+    def iter_records(self, response, extract: Callable[[Any], Iterable[Dict]]) -> Iterator[Dict]:
+        for line_number, line in enumerate(self._open_text(response), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                document = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}")
+            yield from extract(document)
+
+
+class CSVRecordReader(RecordReader):
+    """CSV with a header row; each row becomes a record keyed by column name"""
+
+    def iter_records(self, response, extract: Callable[[Any], Iterable[Dict]]) -> Iterator[Dict]:
+        for row in csv.DictReader(self._open_text(response)):
+            yield row
+
+
+class RecordReaderFactory:
+    """Factory to create record readers based on APIEndpoint.expected_response_format"""
+
+    _readers = {
+        'json': JSONRecordReader,
+        'ndjson': NDJSONRecordReader,
+        'csv': CSVRecordReader,
+    }
+
+    @classmethod
+    def create_reader(cls, response_format: Optional[str]) -> RecordReader:
+        """
+        Create a record reader instance
+
+        Args:
+            response_format: Format name such as 'json', 'ndjson' or 'csv',
+                optionally suffixed with '.gz' for gzip-compressed bodies
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        response_format = (response_format or 'json').lower()
+        compressed = response_format.endswith('.gz')
+        base_format = response_format[:-3] if compressed else response_format
+
+        if base_format not in cls._readers:
+            raise ValueError(f"Unsupported response format: {response_format}")
+
+        return cls._readers[base_format](compressed=compressed)
+
+    @classmethod
+    def get_supported_formats(cls) -> List[str]:
+        """Get list of supported response formats"""
+        formats = list(cls._readers.keys())
+        return formats + [f'{fmt}.gz' for fmt in formats]
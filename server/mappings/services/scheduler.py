@@ -0,0 +1,191 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict
+import logging
+import threading
+
+from django.db import connection
+from django.utils import timezone
+
+from databases.models import ConnectionHealth
+from mappings.models import DataMapping, MappingExecution
+from .execution_queue import ExecutionQueue, ExecutionLimitReached
+from .mapping_engine import MappingEngine
+
+logger = logging.getLogger(__name__)
+
+
+class MappingScheduler:
+    """
+    Runs scheduled DataMappings whose next_run_at has passed, used by run_scheduler
+    
+    Only the process holding a PostgreSQL advisory lock schedules; others stand
+    by and take over when its session ends. Each due run is also claimed with a
+    conditional UPDATE of next_run_at, so a run is never started twice even if
+    two schedulers briefly overlap. A due run is skipped (moved to its next
+    occurrence) while an execution of the mapping is still running, and delayed
+    while the monitor reports its database as failing.
+    
+    Due mappings are taken in ExecutionQueue.fair_order(); one whose database or
+    API endpoint is at its concurrency limit stays due and is retried next tick.
+    """
+    
+    # Arbitrary, but fixed: every run_scheduler process contends for the same lock
+    ADVISORY_LOCK_KEY = 7_306_082_471
+    # Due mappings handled per tick
+    BATCH_SIZE = 100
+    # Retry interval for runs whose target database is failing health checks
+    FAILING_TARGET_RETRY_SECONDS = 300
+    
+    def __init__(self, concurrency: int = 4):
+        self.concurrency = max(concurrency, 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='mapping-scheduler')
+        self.queue = ExecutionQueue()
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        self._lock_connection = None
+    
+    def acquire_leadership(self) -> bool:
+        """True while this process holds the scheduler lock (always True off PostgreSQL)"""
+        if connection.vendor != 'postgresql':
+            # No advisory locks; run a single scheduler process
+            return True
+        
+        if self._lock_connection is not None:
+            try:
+                with self._lock_connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                return True
+            except Exception as e:
+                logger.warning(f"Lost the scheduler lock connection: {str(e)}")
+                self._close_lock_connection()
+        
+        # A session of its own, so closing Django's connection between ticks keeps the lock
+        lock_connection = connection.get_new_connection(connection.get_connection_params())
+        lock_connection.autocommit = True
+        with lock_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [self.ADVISORY_LOCK_KEY])
+            acquired = cursor.fetchone()[0]
+        if acquired:
+            self._lock_connection = lock_connection
+        else:
+            lock_connection.close()
+        return acquired
+    
+    def release_leadership(self) -> None:
+        """Give the lock up (closing its session releases it)"""
+        self._close_lock_connection()
+    
+    def _close_lock_connection(self) -> None:
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.close()
+            except Exception:
+                pass
+            self._lock_connection = None
+    
+    def tick(self, now=None) -> Dict[str, int]:
+        """Start due mappings; returns counts of started, skipped, delayed and queued runs"""
+        now = now or timezone.now()
+        counts = {'started': 0, 'skipped': 0, 'delayed': 0, 'queued': 0}
+        
+        # Order every due mapping fairly before taking a batch, so one owner's backlog can't fill it
+        due_ids = self.queue.fair_order(
+            DataMapping.objects
+            .filter(status='active', next_run_at__lte=now)
+            .order_by('next_run_at')
+            .values_list('pk', 'owner_id'),
+            owner_of=lambda row: row[1]
+        )[:self.BATCH_SIZE]
+        if not due_ids:
+            return counts
+        
+        mappings = DataMapping.objects.select_related('api_endpoint', 'database', 'owner').in_bulk(
+            [pk for pk, _ in due_ids]
+        )
+        due = [mappings[pk] for pk, _ in due_ids if pk in mappings]
+        
+        failing = ConnectionHealth.failing_database_ids()
+        running = set(self.queue.running().filter(mapping__in=due).values_list('mapping_id', flat=True))
+        with self._in_flight_lock:
+            running |= self._in_flight
+        
+        for mapping in due:
+            try:
+                next_run = mapping.compute_next_run(now)
+            except ValueError as e:
+                logger.error(f"Unscheduling mapping {mapping.name}: {str(e)}")
+                next_run = None
+            if next_run is None:
+                # Schedule removed (or unusable) since next_run_at was set
+                self._claim(mapping, None)
+                continue
+            
+            if mapping.pk in running:
+                outcome = 'skipped'
+            elif mapping.database_id in failing:
+                outcome = 'delayed'
+                next_run = min(next_run, now + timedelta(seconds=self.FAILING_TARGET_RETRY_SECONDS))
+            else:
+                if not self._has_free_worker():
+                    # Still due; picked up again next tick
+                    counts['queued'] += 1
+                    continue
+                try:
+                    execution = self.queue.admit(mapping, mapping.owner, claim=lambda: self._claim(mapping, next_run))
+                except ExecutionLimitReached as e:
+                    logger.info(f"Mapping {mapping.name} queued: {str(e)}")
+                    counts['queued'] += 1
+                    continue
+                if execution is not None:
+                    counts['started'] += 1
+                    self._submit(mapping, execution)
+                continue
+            
+            if self._claim(mapping, next_run):
+                counts[outcome] += 1
+                logger.info(f"Mapping {mapping.name} {outcome}; next run at {next_run}")
+        
+        return counts
+    
+    def _claim(self, mapping: DataMapping, next_run) -> bool:
+        """Move next_run_at on; only the scheduler whose UPDATE matched acts on this run"""
+        return DataMapping.objects.filter(
+            pk=mapping.pk, next_run_at=mapping.next_run_at
+        ).update(next_run_at=next_run) == 1
+    
+    def _has_free_worker(self) -> bool:
+        with self._in_flight_lock:
+            return len(self._in_flight) < self.concurrency
+    
+    def _submit(self, mapping: DataMapping, execution: MappingExecution) -> None:
+        with self._in_flight_lock:
+            self._in_flight.add(mapping.pk)
+        future = self.executor.submit(self._run, mapping, execution)
+        future.add_done_callback(lambda _: self._done(mapping.pk))
+    
+    def _done(self, mapping_id: int) -> None:
+        with self._in_flight_lock:
+            self._in_flight.discard(mapping_id)
+    
+    def _run(self, mapping: DataMapping, execution: MappingExecution) -> None:
+        """Worker thread: one execution, recorded like the execute endpoint does"""
+        try:
+            try:
+                MappingEngine(mapping, execution).execute()
+            except Exception as e:
+                # The engine has already marked the execution failed
+                logger.error(f"Scheduled run of mapping {mapping.name} failed: {str(e)}")
+            
+            mapping.last_run = timezone.now()
+            mapping.save(update_fields=['last_run'])
+        except Exception as e:
+            logger.error(f"Could not record scheduled run of mapping {mapping.name}: {str(e)}")
+        finally:
+            # Worker threads are reused; don't leave this thread's connection open
+            connection.close()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop taking work, optionally wait for running executions, and release the lock"""
+        self.executor.shutdown(wait=wait)
+        self.release_leadership()
@@ -0,0 +1,89 @@
+from typing import Dict, List, Tuple
+
+
+class StatementBuilder:
+    """
+    INSERT/UPSERT statement text for one mapping's target table
+
+    Statements are built once per distinct column set and reused, so identical
+    record shapes always produce the identical string (which adapters can
+    prepare once and execute many times).
+    """
+
+    IDENTIFIER_QUOTES = {
+        'mysql': ('`', '`'),
+        'mssql': ('[', ']'),
+    }
+    DEFAULT_QUOTES = ('"', '"')
+
+    def __init__(self, db_type: str, table: str, conflict_columns: List[str] = None):
+        self.db_type = db_type
+        self.table = table
+        self.conflict_columns = list(conflict_columns or [])
+        self._cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+    def quote(self, identifier: str) -> str:
+        opening, closing = self.IDENTIFIER_QUOTES.get(self.db_type, self.DEFAULT_QUOTES)
+        return f'{opening}{identifier}{closing}'
+
+    def insert(self, columns: Tuple[str, ...]) -> str:
+        """INSERT for the given columns, with one %s placeholder per column"""
+        key = ('insert', columns)
+        if key not in self._cache:
+            self._cache[key] = (
+                f"INSERT INTO {self.table} ({self._column_list(columns)}) "
+                f"VALUES ({self._placeholders(columns)})"
+            )
+        return self._cache[key]
+
+    def upsert(self, columns: Tuple[str, ...]) -> str:
+        """Dialect-specific insert-or-update on the mapping's conflict columns"""
+        key = ('upsert', columns)
+        if key not in self._cache:
+            self._cache[key] = self._build_upsert(columns)
+        return self._cache[key]
+
+    def _build_upsert(self, columns: Tuple[str, ...]) -> str:
+        insert = self.insert(columns)
+        update_columns = [col for col in columns if col not in self.conflict_columns]
+
+        if self.db_type == 'postgresql':
+            conflict_cols = ', '.join(self.quote(col) for col in self.conflict_columns)
+            if not update_columns:
+                return f"{insert} ON CONFLICT ({conflict_cols}) DO NOTHING"
+            update_str = ', '.join(f'{self.quote(col)} = EXCLUDED.{self.quote(col)}' for col in update_columns)
+            return f"{insert} ON CONFLICT ({conflict_cols}) DO UPDATE SET {update_str}"
+
+        if self.db_type == 'mysql':
+            # Assigning a key column to itself turns a duplicate into a no-op
+            update_columns = update_columns or columns[:1]
+            update_str = ', '.join(f'{self.quote(col)} = VALUES({self.quote(col)})' for col in update_columns)
+            return f"{insert} ON DUPLICATE KEY UPDATE {update_str}"
+
+        if self.db_type == 'mssql':
+            return self._build_merge(columns, update_columns)
+
+        raise ValueError(f"Upsert is not supported for database type: {self.db_type}")
+
+    def _build_merge(self, columns: Tuple[str, ...], update_columns: List[str]) -> str:
+        """Single-row MERGE; HOLDLOCK keeps concurrent upserts of one key from both inserting"""
+        column_list = self._column_list(columns)
+        match = ' AND '.join(f'target.{self.quote(col)} = source.{self.quote(col)}' for col in self.conflict_columns)
+        statement = (
+            f"MERGE INTO {self.table} WITH (HOLDLOCK) AS target "
+            f"USING (VALUES ({self._placeholders(columns)})) AS source ({column_list}) "
+            f"ON {match} "
+        )
+        if update_columns:
+            update_str = ', '.join(f'target.{self.quote(col)} = source.{self.quote(col)}' for col in update_columns)
+            statement += f"WHEN MATCHED THEN UPDATE SET {update_str} "
+        source_list = ', '.join(f'source.{self.quote(col)}' for col in columns)
+        # MERGE is the one statement SQL Server requires to be terminated
+        return statement + f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({source_list});"
+
+    def _column_list(self, columns: Tuple[str, ...]) -> str:
+        return ', '.join(self.quote(col) for col in columns)
+
+    @staticmethod
+    def _placeholders(columns: Tuple[str, ...]) -> str:
+        return ', '.join(['%s'] * len(columns))
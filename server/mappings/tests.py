@@ -1,3 +1,96 @@
-from django.test import TestCase
+from decimal import Decimal
+import gzip
+import json
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from mappings.services.column_coercers import CoercionError, compile_coercers
+from mappings.services.error_collector import ErrorCollector
+
+
+def coercer(column, mode='reject', db_type='postgresql'):
+    """The check compile_coercers builds for a single column"""
+    column = dict({'name': 'value', 'nullable': True}, **column)
+    [(_, check)] = compile_coercers({'columns': [column]}, ['value'], db_type, mode)
+    return check
+
+
+class DecimalCoercerTests(SimpleTestCase):
+    def test_rounds_excess_decimal_places(self):
+        check = coercer({'type': 'numeric', 'precision': 8, 'scale': 2}, mode='coerce')
+        self.assertEqual(check('3.456'), Decimal('3.46'))
+        self.assertEqual(check(-2.005), Decimal('-2.01'))
+
+    def test_declared_type_supplies_precision_and_scale(self):
+        check = coercer({'type': 'DECIMAL(5,2)'}, mode='coerce')
+        self.assertEqual(check('999.99'), Decimal('999.99'))
+        with self.assertRaises(CoercionError):
+            check('999.995')
+
+    def test_reject_mode_passes_fitting_values_through(self):
+        check = coercer({'type': 'numeric', 'precision': 5, 'scale': 2})
+        self.assertEqual(check('1.234'), '1.234')
+        self.assertEqual(check('abc'), 'abc')
+
+    def test_unconstrained_numeric_keeps_every_digit(self):
+        check = coercer({'type': 'numeric', 'precision': None, 'scale': None}, mode='coerce')
+        self.assertEqual(check(3.14159), Decimal('3.14159'))
+        self.assertEqual(check('2.5'), Decimal('2.5'))
+        self.assertEqual(check(10 ** 30), Decimal(10 ** 30))
+
+    def test_values_wider_than_the_default_context(self):
+        check = coercer({'type': 'decimal', 'precision': 38, 'scale': 0}, mode='coerce')
+        self.assertEqual(check(10 ** 30), Decimal(10 ** 30))
+        self.assertEqual(check('1' * 38), Decimal('1' * 38))
+        with self.assertRaises(CoercionError):
+            check('1' * 39)
+
+    def test_overflow_is_a_coercion_error(self):
+        for mode in ('reject', 'coerce'):
+            check = coercer({'type': 'numeric', 'precision': 5, 'scale': 2}, mode=mode)
+            with self.assertRaises(CoercionError):
+                check(1e300)
+            with self.assertRaises(CoercionError):
+                check('1000')
+
+    def test_only_fractions_for_zero_integer_digits(self):
+        check = coercer({'type': 'numeric', 'precision': 2, 'scale': 2}, mode='coerce')
+        self.assertEqual(check('0.5'), Decimal('0.50'))
+        self.assertEqual(check(0), Decimal('0.00'))
+        with self.assertRaises(CoercionError):
+            check('0.999')
+
+
+class ErrorCollectorTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.collector = ErrorCollector(dead_letter_path=os.path.join(self.directory, 'dead.ndjson.gz'))
+
+    def dead_letters(self):
+        self.collector.close()
+        with gzip.open(self.collector.dead_letter_path, 'rt') as dead_letter:
+            return [json.loads(line) for line in dead_letter]
+
+    def test_rolled_back_records_get_the_rollback_cause(self):
+        batch = [{'id': 1}, {'id': 2}, {'id': 3}]
+        invalid = {'record_index': 0, 'stage': 'validation', 'error': 'id: not a number'}
+        insert = {'record_index': 2, 'stage': 'database_insert', 'error': 'duplicate key'}
+        self.collector.add_batch([invalid, insert], batch, 10, rollback_cause=insert)
+
+        entries = self.dead_letters()
+        self.assertEqual([entry['record_number'] for entry in entries], [10, 12, 11])
+        self.assertEqual(entries[2], {
+            'record_number': 11, 'stage': 'batch_rollback', 'error': 'duplicate key', 'record': {'id': 2}
+        })
+
+    def test_records_written_around_failures_are_not_dead_lettered(self):
+        batch = [{'id': 1}, {'id': 2}]
+        invalid = {'record_index': 1, 'stage': 'validation', 'error': 'id: not a number'}
+        self.collector.add_batch([invalid], batch, 0)
+
+        self.assertEqual([entry['record'] for entry in self.dead_letters()], [{'id': 2}])
+        self.assertEqual(self.collector.summary()['total'], 1)
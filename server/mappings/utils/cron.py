@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import FrozenSet
+
+# Standard five-field cron: minute hour day-of-month month day-of-week
+_FIELDS = [
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7),
+]
+
+_MONTH_NAMES = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+)}
+_DAY_NAMES = {name: number for number, name in enumerate(['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'])}
+
+_MACROS = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+# A match is always found within a few years (Feb 29 on a given weekday is the worst case)
+_MAX_YEARS = 8
+
+
+class CronExpression:
+    """
+    Parsed five-field cron expression (minute hour day-of-month month day-of-week)
+    
+    Supports *, numbers, ranges (1-5), steps (*/15, 0-30/10), lists (1,15),
+    month and weekday names (jan, mon) and the @hourly/@daily/... macros. As in
+    Vixie cron, when both day fields are restricted a day matching either one
+    matches. Times are evaluated as naive wall-clock datetimes.
+    """
+    
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = _MACROS.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields, got {len(fields)}: '{expression}'")
+        
+        parsed = [_parse_field(value, *spec) for value, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 7 is another name for Sunday
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2].startswith('*')
+        self._any_weekday = fields[4].startswith('*')
+    
+    def __repr__(self):
+        return f"CronExpression('{self.expression}')"
+    
+    def matches_day(self, moment: datetime) -> bool:
+        if moment.month not in self.months:
+            return False
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+    
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after` (tzinfo is carried through untouched)"""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * _MAX_YEARS)
+        
+        # Skip whole days, then hours, then minutes that can't match
+        while moment < limit:
+            if not self.matches_day(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+        
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+@lru_cache(maxsize=256)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse (and cache) a cron expression; raises ValueError if it is invalid"""
+    return CronExpression(expression)
+
+
+def _parse_field(value: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    names = _MONTH_NAMES if name == 'month' else _DAY_NAMES if name == 'day of week' else {}
+    allowed = set()
+    
+    for part in value.lower().split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid step '{step_text}' in cron {name} field")
+            step = int(step_text)
+        
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (_parse_value(bound, name, names) for bound in part.split('-', 1))
+        else:
+            start = _parse_value(part, name, names)
+            # "5/15" means 5 through the end of the range, every 15
+            end = high if step > 1 else start
+        
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValueError(f"Cron {name} field '{value}' is outside {low}-{high}")
+        allowed.update(range(start, end + 1, step))
+    
+    return frozenset(allowed)
+
+
+def _parse_value(text: str, name: str, names: dict) -> int:
+    if text in names:
+        return names[text]
+    if not text.isdigit():
+        raise ValueError(f"Invalid value '{text}' in cron {name} field")
+    return int(text)
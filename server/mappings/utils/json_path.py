@@ -1,5 +1,15 @@
-from typing import Any, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from functools import lru_cache
 import json
+import re
+
+from jsonpath_ng import parse as jsonpath_parse
+from jsonpath_ng.jsonpath import Index
+
+
+PARENT_KEY = '_parent'
+
+_SEGMENT_RE = re.compile(r'^([^\[\]]*)((?:\[(?:\*|\d+)\])*)$')
 
 
 def extract_sample_paths(data: Any, max_depth: int = 5, current_depth: int = 0) -> List[dict]:
@@ -51,4 +61,136 @@ def _get_sample_value(value: Any) -> Any:
     elif isinstance(value, str) and len(value) > 50:
         return value[:50] + "..."
     else:
-        return value
\ No newline at end of file
+        return value
+
+
+def extract_records(data: Any) -> List[Dict]:
+    """Extract the list of records from a parsed API response document"""
+    # If data is already a list, return it
+    if isinstance(data, list):
+        return data
+    
+    # If it's a dict, try common patterns
+    if isinstance(data, dict):
+        # Check for common data keys
+        for key in ['data', 'results', 'items', 'records']:
+            if key in data and isinstance(data[key], list):
+                return data[key]
+    
+    # If single object, wrap in list
+    return [data]
+
+
+
+@lru_cache(maxsize=256)
+def compile_records_path(path: str) -> Callable[[Any], Iterator[Dict]]:
+    """
+    Compile a records path into an extractor yielding records from a document.
+
+    Accepts dot notation with [*] fan-out and [n] indexing, e.g. "payload.users"
+    or "orders[*].lines[*]", or a JSONPath expression starting with '$'. A path
+    ending on an array yields its items. When records come from inside a
+    fanned-out parent, the parent's non-array fields are carried down under
+    "_parent" (nested again for grandparents), so "_parent.id" is mappable.
+
+    Raises:
+        ValueError: If the path cannot be parsed
+    """
+    path = (path or '').strip()
+    if not path:
+        return extract_records
+
+    if path.startswith('$'):
+        try:
+            expression = jsonpath_parse(path)
+        except Exception as e:
+            raise ValueError(f"Invalid JSONPath '{path}': {e}")
+        return lambda document: _find_jsonpath_records(expression, document)
+
+    steps = _parse_dot_path(path)
+    return lambda document: _walk_records(document, steps, 0, None)
+
+
+def _parse_dot_path(path: str) -> List[tuple]:
+    """Parse "a.b[*].c[0]" into [('key', 'a'), ('key', 'b'), ('each',), ('key', 'c'), ('index', 0)]"""
+    steps = []
+    for segment in path.split('.'):
+        match = _SEGMENT_RE.match(segment)
+        if not match or (not match.group(1) and not match.group(2)):
+            raise ValueError(f"Invalid records path '{path}' near '{segment}'")
+        
+        key, selectors = match.groups()
+        if key:
+            steps.append(('key', key))
+        for selector in re.findall(r'\[(\*|\d+)\]', selectors):
+            steps.append(('each',) if selector == '*' else ('index', int(selector)))
+    return steps
+
+
+def _walk_records(node: Any, steps: List[tuple], position: int, parent: Optional[Dict]) -> Iterator[Dict]:
+    """Follow compiled steps through a document, fanning out on [*]"""
+    while position < len(steps):
+        step = steps[position]
+        position += 1
+        
+        if step[0] == 'key':
+            if not isinstance(node, dict) or step[1] not in node:
+                return
+            node = node[step[1]]
+        elif step[0] == 'index':
+            if not isinstance(node, list) or step[1] >= len(node):
+                return
+            node = node[step[1]]
+        else:
+            if not isinstance(node, list):
+                return
+            for item in node:
+                if position < len(steps):
+                    yield from _walk_records(item, steps, position, _parent_fields(item, parent))
+                else:
+                    yield _with_parent(item, parent)
+            return
+    
+    # Path ends on an array: its items are the records
+    if isinstance(node, list):
+        for item in node:
+            yield _with_parent(item, parent)
+    elif node is not None:
+        yield _with_parent(node, parent)
+
+
+def _find_jsonpath_records(expression, document: Any) -> Iterator[Dict]:
+    """Yield records matched by a compiled JSONPath expression"""
+    for match in expression.find(document):
+        parent = None
+        # Collect fanned-out ancestors (dicts reached through an array index), outermost first
+        ancestors = []
+        context = match.context
+        while context is not None:
+            if isinstance(context.path, Index) and isinstance(context.value, dict):
+                ancestors.append(context.value)
+            context = context.context
+        for ancestor in reversed(ancestors):
+            parent = _parent_fields(ancestor, parent)
+        
+        if isinstance(match.value, list):
+            for item in match.value:
+                yield _with_parent(item, parent)
+        else:
+            yield _with_parent(match.value, parent)
+
+
+def _parent_fields(item: Any, parent: Optional[Dict]) -> Optional[Dict]:
+    """Fields of a fanned-out parent that are carried down to its children"""
+    if not isinstance(item, dict):
+        return parent
+    fields = {key: value for key, value in item.items() if not isinstance(value, list) and key != PARENT_KEY}
+    if parent is not None:
+        fields[PARENT_KEY] = parent
+    return fields
+
+
+def _with_parent(record: Any, parent: Optional[Dict]) -> Any:
+    if parent is None or not isinstance(record, dict):
+        return record
+    return {**record, PARENT_KEY: parent}
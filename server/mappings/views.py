@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from django.utils import timezone
+from contextlib import closing
+from itertools import islice
 import time
 
 from .models import DataMapping, MappingExecution, TransformationTemplate
@@ -16,9 +18,13 @@ from .serializers import (
     MappingPreviewSerializer
 )
 from .services.mapping_engine import MappingEngine
+from .services.execution_queue import ExecutionQueue, ExecutionLimitReached
 from .services.field_matcher import FieldMatcher
 from .services.type_validator import TypeValidator
+from .services.record_readers import RecordReaderFactory
+from .utils.json_path import extract_records
 from activities.utils import log_activity
+from apis.http_client import send_request
 
 
 class DataMappingViewSet(viewsets.ModelViewSet):
@@ -61,21 +67,32 @@ class DataMappingViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def execute(self, request, pk=None):
         """Execute a data mapping"""
-        mapping = self.get_object()
-        
-        # Create execution record
-        execution = MappingExecution.objects.create(
-            mapping=mapping,
-            executed_by=request.user
-        )
+        return self._execute(self.get_object(), dry_run=False)
+    
+    @action(detail=True, methods=['post'])
+    def dry_run(self, request, pk=None):
+        """Run the full pipeline against the target on every record, rolling all writes back"""
+        return self._execute(self.get_object(), dry_run=True)
+    
+    def _execute(self, mapping, dry_run: bool):
+        # Create execution record, if the database and API have a free slot
+        try:
+            execution = ExecutionQueue().admit(mapping, self.request.user, dry_run=dry_run)
+        except ExecutionLimitReached as e:
+            return Response(
+                {'error': str(e), 'limit': e.limit, 'retry_after': e.retry_after},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(e.retry_after)}
+            )
         
         try:
             engine = MappingEngine(mapping, execution)
             result = engine.execute()
             
-            # Update mapping last run
-            mapping.last_run = timezone.now()
-            mapping.save()
+            # Update mapping last run (only: the scheduler may have moved next_run_at meanwhile)
+            if not dry_run:
+                mapping.last_run = timezone.now()
+                mapping.save(update_fields=['last_run'])
             
             return Response(MappingExecutionSerializer(execution).data)
         except Exception as e:
@@ -131,7 +148,6 @@ class DataMappingViewSet(viewsets.ModelViewSet):
             # Get API and DB
             from apis.models import APIEndpoint
             from databases.models import DatabaseConnection
-            import requests
             
             try:
                 api_endpoint = APIEndpoint.objects.get(id=api_id, owner=request.user)
@@ -174,23 +190,29 @@ class DataMappingViewSet(viewsets.ModelViewSet):
                 
                 # Make request
                 if api_endpoint.http_method == 'GET':
-                    response = requests.get(url, headers=headers, params=params, timeout=10)
+                    response = send_request('GET', url, headers=headers, params=params, timeout=10, stream=True)
                 else:
                     body = api_endpoint.body_template if api_endpoint.http_method in ['POST', 'PUT', 'PATCH'] else None
-                    response = requests.request(
+                    response = send_request(
                         method=api_endpoint.http_method,
                         url=url,
                         headers=headers,
                         params=params,
                         json=body,
-                        timeout=10
+                        timeout=10,
+                        stream=True
                     )
                 
-                if response.status_code < 300:
-                    try:
-                        api_sample = response.json()
-                    except:
-                        api_sample = {"text_response": response.text[:1000]}
+                with closing(response):
+                    if response.status_code < 300 and api_endpoint.expected_response_format != 'json':
+                        # Streamed formats: sample the first records instead of the whole body
+                        reader = RecordReaderFactory.create_reader(api_endpoint.expected_response_format)
+                        api_sample = list(islice(reader.iter_records(response, extract_records), 20))
+                    elif response.status_code < 300:
+                        try:
+                            api_sample = response.json()
+                        except:
+                            api_sample = {"text_response": response.text[:1000]}
                         
             except Exception as e:
                 print(f"Error calling API: {str(e)}")
@@ -198,33 +220,13 @@ class DataMappingViewSet(viewsets.ModelViewSet):
                 if api_endpoint.body_template:
                     api_sample = {"sample_from_template": api_endpoint.body_template}
             
-            # Get DB schema directly
+            # Get the target table's schema, cached until its DDL changes
             db_schema = {}
             try:
-                from databases.db_adapters.factory import DatabaseAdapterFactory
-                
-                config = {
-                    'host': database.host,
-                    'port': database.port,
-                    'database': database.database,
-                    'schema': database.schema,
-                    'username': database.username,
-                    'password': database.password,
-                    'ssl_enabled': database.ssl_enabled,
-                    'options': database.connection_options
-                }
+                from databases.services.schema_cache import SchemaCache
                 
-                if database.db_type == 'mongodb':
-                    config['mongodb_connection_type'] = database.mongodb_connection_type
-                
-                adapter = DatabaseAdapterFactory.create_adapter(database.db_type, config)
-                full_schema = adapter.get_schema()
-                
-                # Extract the specific table/collection
-                if 'tables' in full_schema and table_name in full_schema['tables']:
-                    db_schema = full_schema['tables'][table_name]
-                elif 'collections' in full_schema and table_name in full_schema['collections']:
-                    db_schema = full_schema['collections'][table_name]
+                table_schema, _ = SchemaCache(database).get_table_schema(table_name)
+                db_schema = table_schema or {}
                     
             except Exception as e:
                 print(f"Error getting schema: {str(e)}")
@@ -263,6 +265,61 @@ class DataMappingViewSet(viewsets.ModelViewSet):
         serializer = MappingExecutionSerializer(executions, many=True)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'])
+    def metrics(self, request, pk=None):
+        """Get per-stage timing breakdown for recent executions of a mapping"""
+        mapping = self.get_object()
+        executions = mapping.executions.exclude(metrics={})
+        
+        execution_id = request.query_params.get('execution', None)
+        if execution_id:
+            try:
+                executions = executions.filter(id=int(execution_id))
+            except ValueError:
+                return Response(
+                    {'error': 'execution must be an integer id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            limit = 20
+        executions = list(executions[:limit])
+        
+        # Average each stage across the returned executions
+        stage_totals = {}
+        total_records = 0
+        total_time_ms = 0
+        for execution in executions:
+            for stage, ms in execution.metrics.get('stages_ms', {}).items():
+                stage_totals[stage] = stage_totals.get(stage, 0) + ms
+            total_records += execution.total_records
+            total_time_ms += execution.execution_time_ms or 0
+        
+        return Response({
+            'mapping': mapping.id,
+            'batch_size': mapping.batch_size,
+            'summary': {
+                'executions': len(executions),
+                'avg_stages_ms': {
+                    stage: round(total / len(executions), 2) for stage, total in stage_totals.items()
+                },
+                'records_per_second': round(total_records / (total_time_ms / 1000), 2) if total_time_ms else None,
+            },
+            'executions': [
+                {
+                    'id': execution.id,
+                    'started_at': execution.started_at,
+                    'status': execution.status,
+                    'total_records': execution.total_records,
+                    'execution_time_ms': execution.execution_time_ms,
+                    'metrics': execution.metrics,
+                }
+                for execution in executions
+            ]
+        })
+    
     @action(detail=False, methods=['get'])
     def available_transformations(self, request):
         """Get available transformation templates"""
@@ -276,8 +333,16 @@ class DataMappingViewSet(viewsets.ModelViewSet):
         from .services.validation_rules import export_validation_rules
         return Response(export_validation_rules())
 
+    # Changing any of these recomputes next_run_at
+    SCHEDULE_FIELDS = {'status', 'schedule_cron', 'schedule_interval_seconds', 'schedule_jitter_seconds'}
+    
+    def _reschedule(self, mapping):
+        mapping.next_run_at = mapping.compute_next_run()
+        mapping.save(update_fields=['next_run_at'])
+    
     def perform_create(self, serializer):
         mapping = serializer.save(owner=self.request.user)
+        self._reschedule(mapping)
         log_activity(
             activity_type='mapping_execution',
             status='success',
@@ -287,6 +352,8 @@ class DataMappingViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         mapping = serializer.save()
+        if self.SCHEDULE_FIELDS & set(serializer.validated_data):
+            self._reschedule(mapping)
         log_activity(
             activity_type='mapping_execution',
             status='success',
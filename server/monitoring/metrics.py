@@ -0,0 +1,98 @@
+from .registry import Counter, Gauge, Histogram
+
+
+# Mapping executions
+MAPPING_EXECUTIONS_TOTAL = Counter(
+    'mapping_executions_total',
+    'Mapping executions finished, by outcome',
+    ['db_type', 'status']
+)
+MAPPING_EXECUTIONS_IN_PROGRESS = Gauge(
+    'mapping_executions_in_progress',
+    'Mapping executions currently running',
+    ['db_type']
+)
+MAPPING_EXECUTION_SECONDS = Histogram(
+    'mapping_execution_duration_seconds',
+    'Wall time of mapping executions',
+    ['db_type'],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+)
+MAPPING_RECORDS_TOTAL = Counter(
+    'mapping_records_total',
+    'Records handled by mapping executions (use rate() for records/sec)',
+    ['db_type', 'result']
+)
+MAPPING_STAGE_SECONDS_TOTAL = Counter(
+    'mapping_stage_seconds_total',
+    'Time spent per mapping pipeline stage',
+    ['stage']
+)
+MAPPING_EXECUTIONS_THROTTLED_TOTAL = Counter(
+    'mapping_executions_throttled_total',
+    'Execution starts refused because a target was at its concurrency limit',
+    ['limit']
+)
+
+# Outbound API calls
+API_REQUEST_SECONDS = Histogram(
+    'api_request_duration_seconds',
+    'Latency of outbound API requests until response headers',
+    ['method', 'status_class']
+)
+API_REQUEST_ERRORS_TOTAL = Counter(
+    'api_request_errors_total',
+    'Outbound API requests that failed without a response',
+    ['method', 'error_type']
+)
+
+# Target databases
+DB_CONNECT_SECONDS = Histogram(
+    'db_connect_duration_seconds',
+    'Time to open a connection to a target database',
+    ['db_type']
+)
+DB_CONNECT_ERRORS_TOTAL = Counter(
+    'db_connect_errors_total',
+    'Failed connection attempts to target databases',
+    ['db_type']
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'db_pool_connections',
+    'Pooled target database connections, by state (idle or in_use)',
+    ['db_type', 'state']
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent waiting to check a connection out of a pool',
+    ['db_type'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+)
+DB_POOL_TIMEOUTS_TOTAL = Counter(
+    'db_pool_timeouts_total',
+    'Checkouts that gave up after pool_timeout with the pool exhausted',
+    ['db_type']
+)
+DB_HEALTH_PROBE_SECONDS = Histogram(
+    'db_health_probe_duration_seconds',
+    'Background health probes of target databases, by outcome (ok, failed or timeout)',
+    ['db_type', 'outcome']
+)
+DB_FAILING_CONNECTIONS = Gauge(
+    'db_failing_connections',
+    'Target database connections the health monitor currently counts as failing',
+    ['db_type'],
+    multiprocess_mode='max'
+)
+
+# Django views
+HTTP_REQUESTS_TOTAL = Counter(
+    'http_requests_total',
+    'Requests served by the backend',
+    ['view', 'method', 'status']
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Latency of requests served by the backend',
+    ['view', 'method']
+)
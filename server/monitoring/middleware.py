@@ -0,0 +1,24 @@
+from django.utils.deprecation import MiddlewareMixin
+import time
+
+from .metrics import HTTP_REQUESTS_TOTAL, HTTP_REQUEST_SECONDS
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """Count requests and their latency per resolved view (e.g. data-mapping-execute)"""
+
+    def process_request(self, request):
+        request._metrics_start = time.perf_counter()
+
+    def process_response(self, request, response):
+        start = getattr(request, '_metrics_start', None)
+        if start is None:
+            return response
+
+        # Label by view name rather than path to keep label cardinality bounded
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+
+        HTTP_REQUEST_SECONDS.labels(view=view, method=request.method).observe(time.perf_counter() - start)
+        HTTP_REQUESTS_TOTAL.labels(view=view, method=request.method, status=response.status_code).inc()
+        return response
@@ -0,0 +1,299 @@
+from typing import Dict, List, Any, Tuple, Optional
+from bisect import bisect_left
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+FLUSH_INTERVAL_SECONDS = 1.0
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Metric:
+    """Base class for registry metrics; values are keyed by label values"""
+
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._registry = registry or REGISTRY
+        self._registry.register(self)
+
+    def labels(self, **labels) -> '_LabeledMetric':
+        """Return the child metric for one combination of label values"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return _LabeledMetric(self, tuple(str(labels[name]) for name in self.labelnames))
+
+    def _update(self, key: Tuple[str, ...], update) -> None:
+        with self._registry.lock:
+            self._values[key] = update(self._values.get(key))
+        self._registry.maybe_flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': [[list(key), value] for key, value in self._values.items()],
+        }
+
+
+class _LabeledMetric:
+    """A metric bound to a fixed set of label values"""
+
+    def __init__(self, metric: Metric, key: Tuple[str, ...]):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1) -> None:
+        self._metric._inc(self._key, amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._metric._dec(self._key, amount)
+
+    def set(self, value: float) -> None:
+        self._metric._set(self._key, value)
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._key, value)
+
+
+class Counter(Metric):
+    """Monotonically increasing value; name should end in _total"""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1) -> None:
+        self._inc((), amount)
+
+    def _inc(self, key, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        self._update(key, lambda value: (value or 0) + amount)
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down
+
+    multiprocess_mode decides how values from several worker processes are
+    combined: 'sum', 'max', 'min', or 'livesum' (sum over live workers only).
+    """
+
+    type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 multiprocess_mode: str = 'livesum', registry=None):
+        self.multiprocess_mode = multiprocess_mode
+        super().__init__(name, documentation, labelnames, registry)
+
+    def set(self, value: float) -> None:
+        self._set((), value)
+
+    def inc(self, amount: float = 1) -> None:
+        self._inc((), amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._inc((), -amount)
+
+    def _set(self, key, value: float) -> None:
+        self._update(key, lambda _: value)
+
+    def _inc(self, key, amount: float = 1) -> None:
+        self._update(key, lambda value: (value or 0) + amount)
+
+    def _dec(self, key, amount: float = 1) -> None:
+        self._inc(key, -amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**super().snapshot(), 'multiprocess_mode': self.multiprocess_mode}
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS, registry=None):
+        self.buckets = sorted(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float) -> None:
+        self._observe((), value)
+
+    def _observe(self, key, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+
+        def update(current):
+            current = current or {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            current['counts'][index] += 1
+            current['sum'] += value
+            return current
+
+        self._update(key, update)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**super().snapshot(), 'buckets': self.buckets}
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics rendered in Prometheus text format
+
+    When PROMETHEUS_MULTIPROC_DIR is set (e.g. under gunicorn), every process
+    periodically writes a snapshot to <dir>/<pid>.json and rendering merges
+    the snapshots of all workers, so any worker can serve /api/metrics.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._metrics: Dict[str, Metric] = {}
+        self._last_flush = 0.0
+
+    def register(self, metric: Metric) -> None:
+        with self.lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return json.loads(json.dumps({name: metric.snapshot() for name, metric in self._metrics.items()}))
+
+    @property
+    def multiproc_dir(self) -> Optional[str]:
+        return os.environ.get(MULTIPROC_DIR_ENV) or None
+
+    def maybe_flush(self) -> None:
+        """Write this process's snapshot if multiprocess mode is on and it is due"""
+        if self.multiproc_dir and time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        directory = self.multiproc_dir
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self) -> Dict[str, Any]:
+        """Snapshot of all metrics, merged across worker processes when enabled"""
+        directory = self.multiproc_dir
+        if not directory:
+            return self.snapshot()
+
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            stem = os.path.basename(path)[:-len('.json')]
+            if not stem.isdigit():
+                # Not one of our <pid>.json snapshots
+                continue
+            pid = int(stem)
+            try:
+                with open(path) as f:
+                    snapshots.append((pid, json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return self._merge(snapshots)
+
+    def _merge(self, snapshots: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {}
+        for pid, snapshot in snapshots:
+            alive = _pid_alive(pid)
+            for name, metric in snapshot.items():
+                target = merged.setdefault(name, {**metric, 'samples': {}})
+                mode = metric.get('multiprocess_mode')
+                if metric['type'] == 'gauge' and mode == 'livesum' and not alive:
+                    continue
+
+                for labels, value in metric['samples']:
+                    key = tuple(labels)
+                    current = target['samples'].get(key)
+                    if current is None:
+                        target['samples'][key] = value
+                    elif metric['type'] == 'histogram':
+                        current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+                        current['sum'] += value['sum']
+                    elif metric['type'] == 'gauge' and mode == 'max':
+                        target['samples'][key] = max(current, value)
+                    elif metric['type'] == 'gauge' and mode == 'min':
+                        target['samples'][key] = min(current, value)
+                    else:
+                        target['samples'][key] = current + value
+
+        for metric in merged.values():
+            metric['samples'] = [[list(key), value] for key, value in metric['samples'].items()]
+        return merged
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for name, metric in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {_escape_help(metric['help'])}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric['labelnames']
+
+            for labels, value in metric['samples']:
+                pairs = list(zip(labelnames, labels))
+                if metric['type'] == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(metric['buckets'] + ['+Inf'], value['counts']):
+                        cumulative += count
+                        le = bound if bound == '+Inf' else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(pairs + [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(pairs)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+REGISTRY = MetricsRegistry()
+atexit.register(REGISTRY.flush)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.http import HttpResponse
+
+from .registry import REGISTRY
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request):
+    """Expose all process metrics in Prometheus text format"""
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', None)
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)